@@ -139,7 +139,7 @@ if __name__ == "__main__":
         uptime_monitor.update_status("UP", "Successful deployment")
 
     if rl_trainer:
-        rl_trainer.save_q_table()
+        rl_trainer.checkpoint()
         if args.train:
             rl_trainer.show_learning_progress()
     
@@ -6,6 +6,7 @@ Stateless | Deterministic | Safety-Caged
 from typing import Dict, Any, Optional
 from enum import Enum
 import time
+from core.action_policy import get_action_policy, SOURCE_RL_BRAIN
 
 class Environment(Enum):
     DEV = "dev"
@@ -26,12 +27,7 @@ class RLDecisionBrain:
     - Safety-caged: Environment-scoped action filtering
     """
     
-    # Environment action scope (LOCKED)
-    ACTION_SCOPE = {
-        Environment.DEV: {Action.NOOP, Action.SCALE_UP, Action.SCALE_DOWN, Action.RESTART},
-        Environment.STAGE: {Action.NOOP, Action.SCALE_UP, Action.SCALE_DOWN},
-        Environment.PROD: {Action.NOOP, Action.RESTART}
-    }
+    # Environment action scope (LOCKED): core/action_policy.json, source "rl_brain"
     
     # Frozen decision logic (LOCKED)
     DECISION_MAP = {
@@ -93,8 +89,7 @@ class RLDecisionBrain:
         proposed_action = self.DECISION_MAP.get(decision_key, Action.NOOP)
         
         # Safety filter: enforce action scope
-        allowed_actions = self.ACTION_SCOPE[environment]
-        if proposed_action not in allowed_actions:
+        if not get_action_policy().is_allowed(proposed_action.value, environment.value, SOURCE_RL_BRAIN):
             return {
                 "action": Action.NOOP.value,
                 "reason": f"Action {proposed_action.value} not allowed in {env_str}, downgraded to NOOP",
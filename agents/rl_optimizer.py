@@ -1,11 +1,14 @@
 import json
 import os
+import time
+import atexit
 import numpy as np
 from collections import defaultdict
 import csv
 import datetime
 from core.stage_determinism import StageDeterminismLock, log_determinism_status
 from core.rl_decision_layer import RLDecisionLayer as OriginalRLDecisionLayer
+from rl.replay_store import ReplayStore
 
 class RLDecisionLayer(OriginalRLDecisionLayer):
     """Ritesh's original RL Decision Layer with Q-learning."""
@@ -14,7 +17,8 @@ class RLDecisionLayer(OriginalRLDecisionLayer):
 class RLOptimizer:
     """Compatibility wrapper for existing system using Ritesh's RL Decision Layer."""
     
-    def __init__(self, q_table_file, performance_log_file, env='dev'):
+    def __init__(self, q_table_file, performance_log_file, env='dev',
+                 performance_flush_rows=1000, performance_flush_interval=30.0):
         self.env = env
         self.q_table_file = q_table_file
         self.performance_log_file = performance_log_file
@@ -33,7 +37,18 @@ class RLOptimizer:
         from core.rl_wiring import get_rl_wiring
         self.rl_wiring = get_rl_wiring(env)
         
+        # Experience goes to the persistent replay store; performance rows are
+        # appended in batches of performance_flush_rows, every
+        # performance_flush_interval seconds, at save time and at exit
+        self.replay = ReplayStore(os.path.join(os.path.dirname(performance_log_file), "replay"),
+                                  actions=self.actions)
+        self.performance_flush_rows = performance_flush_rows
+        self.performance_flush_interval = performance_flush_interval
+        self._pending_performance = []
+        self._performance_flushed_at = time.monotonic()
+        
         self._init_performance_log()
+        atexit.register(self.flush_performance_log)
         print("Initialized RL Optimizer with Ritesh's Decision Layer.")
 
     def _init_performance_log(self):
@@ -83,14 +98,33 @@ class RLOptimizer:
         
         reward_change = self.rl_wiring.record_outcome(normalized_event, rl_index, reward, next_event)
         
-        # Log performance
+        # Record experience; the performance row is written with the next batch
+        self.replay.append(state, action, reward, 'resolved')
         timestamp = datetime.datetime.now().isoformat()
-        with open(self.performance_log_file, 'a', newline='') as f:
-            csv.writer(f).writerow([timestamp, state, action, reward])
+        self._pending_performance.append([timestamp, state, action, reward])
+        if (len(self._pending_performance) >= self.performance_flush_rows
+                or time.monotonic() - self._performance_flushed_at >= self.performance_flush_interval):
+            self.flush_performance_log()
         
         print(f"RL Update: {state}/{action}: reward={reward}, change={reward_change:.3f}")
 
+    def flush_performance_log(self):
+        """Append buffered performance rows to the performance log."""
+        self._performance_flushed_at = time.monotonic()
+        if not self._pending_performance:
+            return
+        with open(self.performance_log_file, 'a', newline='') as f:
+            csv.writer(f).writerows(self._pending_performance)
+        self._pending_performance = []
+
     def save_q_table(self):
         """Save Q-table using safe RL wiring layer."""
+        self.flush_performance_log()
+        self.replay.flush()
         self.rl_wiring.rl_layer.save_summary()
-        print(f"Q-table saved to {self.rl_wiring.rl_layer.summary_file}")
\ No newline at end of file
+        print(f"Q-table saved to {self.rl_wiring.rl_layer.summary_file}")
+
+    def close(self):
+        """Write buffered performance rows and release the replay store."""
+        self.flush_performance_log()
+        self.replay.close()
@@ -241,6 +241,44 @@ async def decide(request: Request):
         level="INFO"
     )
     
+    return validate_and_decide(data)
+
+@app.post("/decide/batch")
+async def decide_batch(request: Request):
+    """
+    Make decisions for several runtime events in one call
+    
+    Body: {"states": [event, ...]} -> {"results": [decision, ...]}, in order.
+    Each event gets the same validation and NOOP guarantees as /decide.
+    """
+    try:
+        data = await request.json()
+    except JSONDecodeError as e:
+        log_structured(
+            "malformed_json",
+            error=str(e),
+            level="WARNING"
+        )
+        return create_noop_response("malformed_json")
+    
+    states = data.get("states") if isinstance(data, dict) else None
+    if not isinstance(states, list):
+        return create_noop_response(
+            "invalid_input",
+            {"validation_errors": ["states must be a list"]}
+        )
+    
+    log_structured("batch_decision_request_received", size=len(states), level="INFO")
+    return {"results": [validate_and_decide(state) for state in states]}
+
+def validate_and_decide(data: Any) -> Dict[str, Any]:
+    """Validate one event and decide on it; NOOP on invalid input"""
+    if not isinstance(data, dict):
+        return create_noop_response(
+            "invalid_input",
+            {"validation_errors": ["payload must be an object"]}
+        )
+    
     # Validate input
     validation_error = validate_decision_input(data)
     if validation_error:
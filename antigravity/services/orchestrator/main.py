@@ -11,6 +11,7 @@ import logging
 import json
 from datetime import datetime
 import os
+import sys
 import uuid
 
 # Configure JSON logging
@@ -25,11 +26,22 @@ app = FastAPI(title="Orchestrator Service", version="1.0.0")
 # Demo mode configuration
 DEMO_MODE = os.getenv("DEMO_MODE", "false").lower() == "true"
 
-# Action allowlist per environment
+# Action allowlist per environment comes from core/action_policy.json
+# (source "orchestrator_service"). The standalone image ships only this file,
+# so it falls back to the copy below, which tests keep in sync with the policy.
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+try:
+    from core.action_policy import get_action_policy, SOURCE_ORCHESTRATOR_SERVICE
+    _action_policy = get_action_policy()
+except ImportError:
+    _action_policy = None
+
 ALLOWED_ACTIONS = {
-    "dev": ["restart", "scale_up", "scale_down", "deploy", "rollback", "noop"],
-    "stage": ["restart", "scale_up", "scale_down", "noop"],
-    "prod": ["restart", "noop"]
+    "dev": ["noop", "restart", "scale_up", "scale_down", "rollback", "deploy"],
+    "stage": ["noop", "restart", "scale_up", "scale_down"],
+    "prod": ["noop", "restart"]
 }
 
 # Models
@@ -137,8 +149,15 @@ def validate_execution_request(data: Dict[str, Any]) -> Optional[Dict[str, Any]]
 
 def is_action_allowed(action: str, env: str) -> bool:
     """Check if action is in allowlist for environment"""
-    allowed = ALLOWED_ACTIONS.get(env, [])
-    return action in allowed
+    if _action_policy is not None:
+        return _action_policy.is_allowed(action, env, SOURCE_ORCHESTRATOR_SERVICE)
+    return action in ALLOWED_ACTIONS.get(env, [])
+
+def get_allowed_actions(env: str) -> List[str]:
+    """Allowlist for environment"""
+    if _action_policy is not None:
+        return _action_policy.allowed_actions(env, SOURCE_ORCHESTRATOR_SERVICE)
+    return ALLOWED_ACTIONS.get(env, [])
 
 def execute_real_action(action: str, app: str, env: str) -> Dict[str, Any]:
     """
@@ -244,7 +263,7 @@ async def execute_action(request: Request):
     
     # Check action allowlist
     if not is_action_allowed(data["action"], data["env"]):
-        allowed = ALLOWED_ACTIONS.get(data["env"], [])
+        allowed = get_allowed_actions(data["env"])
         
         log_structured(
             "action_rejected",
@@ -450,7 +450,11 @@ def get_rl_info():
             'url': client.url,
             'timeout': client.timeout,
             'max_failures': client._max_failures,
-            'consecutive_failures': client._consecutive_failures
+            'consecutive_failures': client._consecutive_failures,
+            'hedge_delay': client.hedge_delay,
+            'client_metrics': client.get_metrics(),
+            'decision_cache': agent.rl_pipe.decision_cache.get_stats(),
+            'reward_attribution': agent.rl_pipe.reward_engine.get_stats() if agent.rl_pipe.reward_engine else None
         }), 200
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
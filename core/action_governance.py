@@ -10,9 +10,12 @@ The agent uses this module to determine when NOT to act, enforcing:
 
 import time
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from collections import deque
 from enum import Enum
+from core.governance_backend import LocalGovernanceBackend, REASON_COOLDOWN, REASON_REPETITION
+from core.action_policy import get_action_policy, SOURCE_GOVERNANCE
+from core.batch_result import BatchResult
 
 
 class GovernanceReason(Enum):
@@ -54,6 +57,16 @@ class ActionGovernance:
     - Cooldowns: Minimum time between repeated actions
     - Repetition: Prevent action loops
     - Eligibility: Action prerequisites and allowlists
+    
+    Cooldown and repetition state is kept per (app_name, action), so acting
+    on one app never throttles another. Repetition uses time-bucketed
+    sliding-window counters, and keys idle for longer than the window and
+    every cooldown are evicted, keeping evaluation constant-time.
+    
+    The state lives in a backend: LocalGovernanceBackend by default, or
+    RedisGovernanceBackend to enforce limits across agent processes. Keys
+    known to be blocked until some time are answered from a local cache
+    without contacting the backend.
     """
     
     # Default cooldown periods (in seconds) for each action
@@ -65,42 +78,57 @@ class ActionGovernance:
         'noop': 0,          # No cooldown for noop
     }
     
+    # Actions that require an app_name in context
+    APP_SCOPED_ACTIONS = ('restart', 'scale_up', 'scale_down')
+    
     # Repetition limits: max occurrences within time window
     DEFAULT_REPETITION_LIMIT = 3
     DEFAULT_REPETITION_WINDOW = 300  # 5 minutes
+    DEFAULT_REPETITION_BUCKETS = 30  # 10s buckets for the default window
     
     def __init__(
         self,
         env: str = 'dev',
         cooldown_periods: Optional[Dict[str, int]] = None,
         repetition_limit: int = DEFAULT_REPETITION_LIMIT,
-        repetition_window: int = DEFAULT_REPETITION_WINDOW
+        repetition_window: int = DEFAULT_REPETITION_WINDOW,
+        repetition_buckets: int = DEFAULT_REPETITION_BUCKETS,
+        backend=None,
+        policy=None
     ):
         """Initialize action governance.
         
         Args:
             env: Environment name (dev, stage, prod)
             cooldown_periods: Custom cooldown periods per action
-            repetition_limit: Max identical actions within window
+            repetition_limit: Max identical actions per app within window
             repetition_window: Time window for repetition check (seconds)
+            repetition_buckets: Buckets per window; the window can over-count
+                by at most one bucket width, never under-count
+            backend: Governance state backend (default: in-process)
+            policy: ActionPolicy for eligibility (default: shared policy file)
         """
         self.env = env
         self.cooldown_periods = cooldown_periods or self.DEFAULT_COOLDOWNS
         self.repetition_limit = repetition_limit
         self.repetition_window = repetition_window
+        self.repetition_buckets = max(1, repetition_buckets)
+        self._bucket_width = repetition_window / self.repetition_buckets if repetition_window > 0 else 1.0
+        # Keys idle this long can no longer block anything
+        self._idle_after = max([repetition_window] + list(self.cooldown_periods.values()))
+        
+        # Per (app_name, action) cooldown and repetition state
+        self.backend = backend if backend is not None else LocalGovernanceBackend()
         
-        # Track last execution time for each action
-        self._last_execution: Dict[str, float] = {}
+        # (app_name, action) -> backend result for keys blocked until a known time
+        self._blocked_until: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        self.blocked_cache_hits = 0
         
-        # Track action history (sliding window)
+        # Recent executions for reporting; not read during evaluation
         self._action_history: deque = deque(maxlen=100)
         
-        # Environment-specific eligibility rules
-        self._eligibility_rules = {
-            'prod': ['noop'],  # Production: only noop allowed
-            'stage': ['restart', 'noop', 'scale_up', 'scale_down'],  # Stage: safe actions
-            'dev': ['restart', 'scale_up', 'noop', 'scale_down', 'rollback']  # Dev: all actions
-        }
+        # Environment-specific eligibility rules (core/action_policy.json)
+        self.policy = policy or get_action_policy()
     
     def evaluate_action(
         self,
@@ -130,20 +158,122 @@ class ActionGovernance:
         if decision.should_block:
             return decision
         
-        # Rule 2: Check cooldown
-        decision = self._check_cooldown(action, current_time)
-        if decision.should_block:
-            return decision
+        # Rules 2 and 3: cooldown, then repetition; the backend records the
+        # execution in the same atomic step when both pass
+        key = self._state_key(action, context)
+        result = self._check_state(action, current_time, key)
         
-        # Rule 3: Check repetition
-        decision = self._check_repetition(action, current_time)
-        if decision.should_block:
-            return decision
+        if result['reason'] == REASON_COOLDOWN:
+            return self._cooldown_decision(action, current_time, key, result)
+        if result['reason'] == REASON_REPETITION:
+            return self._repetition_decision(action, key, result)
         
-        # All checks passed - record action and allow
+        # All checks passed - add to history and allow
         self._record_action(action, current_time, context)
         return GovernanceDecision(should_block=False)
     
+    def evaluate_many(self, candidates: Sequence[Tuple]) -> BatchResult:
+        """Evaluate many candidates without recording anything.
+        
+        Each candidate is an (app_name, action[, confidence]) tuple and is
+        checked independently against the current state, in the same rule
+        order as evaluate_action. Commit the candidates actually chosen
+        through evaluate_action, which re-checks atomically and records.
+        
+        Args:
+            candidates: (app_name, action[, confidence]) tuples
+            
+        Returns:
+            BatchResult with per-candidate blocked flags and reasons
+        """
+        current_time = time.time()
+        count = len(candidates)
+        blocked = [False] * count
+        reasons: List[Optional[str]] = [None] * count
+        eligible: Dict[str, bool] = {}
+        state_results: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        
+        for i, candidate in enumerate(candidates):
+            app_name, action = candidate[0], candidate[1]
+            
+            is_eligible = eligible.get(action)
+            if is_eligible is None:
+                is_eligible = eligible[action] = self.policy.is_allowed(action, self.env, SOURCE_GOVERNANCE)
+            if not is_eligible:
+                blocked[i] = True
+                reasons[i] = GovernanceReason.ACTION_NOT_ELIGIBLE.value
+                continue
+            if not app_name and action in self.APP_SCOPED_ACTIONS:
+                blocked[i] = True
+                reasons[i] = GovernanceReason.PREREQUISITE_NOT_MET.value
+                continue
+            
+            key = (app_name, action)
+            result = state_results.get(key)
+            if result is None:
+                result = state_results[key] = self._check_state(action, current_time, key, record=False)
+            if not result['allowed']:
+                blocked[i] = True
+                reasons[i] = result['reason']
+        
+        def explain(i: int) -> Dict[str, Any]:
+            app_name, action = candidates[i][0], candidates[i][1]
+            key = (app_name, action)
+            if reasons[i] == REASON_COOLDOWN:
+                return self._cooldown_decision(action, current_time, key, state_results[key]).details
+            if reasons[i] == REASON_REPETITION:
+                return self._repetition_decision(action, key, state_results[key]).details
+            return self._check_eligibility(action, {'app_name': app_name}).details
+        
+        return BatchResult(blocked, reasons, explain, GovernanceDecision)
+    
+    @staticmethod
+    def _state_key(action: str, context: Dict[str, Any]) -> Tuple[Optional[str], str]:
+        """Governance state key: (app_name, action)."""
+        return (context.get('app_name'), action)
+    
+    def _check_state(
+        self,
+        action: str,
+        current_time: float,
+        key: Tuple[Optional[str], str],
+        record: bool = True
+    ) -> Dict[str, Any]:
+        """Check cooldown and repetition state, using the blocked-until cache.
+        
+        Args:
+            action: Action name
+            current_time: Current timestamp
+            key: (app_name, action) state key
+            record: Record an execution if neither rule blocks
+            
+        Returns:
+            Backend result dict
+        """
+        blocked = self._blocked_until.get(key)
+        if blocked is not None:
+            if current_time < blocked['blocked_until']:
+                self.blocked_cache_hits += 1
+                return blocked
+            del self._blocked_until[key]
+        
+        result = self.backend.check(
+            key, current_time,
+            cooldown=self.cooldown_periods.get(action, 0),
+            window=self.repetition_window,
+            limit=self.repetition_limit,
+            bucket_width=self._bucket_width,
+            idle_after=self._idle_after,
+            record=record
+        )
+        if not result['allowed'] and result['blocked_until'] > current_time:
+            if len(self._blocked_until) >= 4096:
+                self._blocked_until = {
+                    k: v for k, v in self._blocked_until.items() if v['blocked_until'] > current_time
+                }
+            self._blocked_until[key] = result
+        return result
+    
     def _check_eligibility(
         self,
         action: str,
@@ -158,9 +288,8 @@ class ActionGovernance:
         Returns:
             GovernanceDecision
         """
-        allowed_actions = self._eligibility_rules.get(self.env, ['noop'])
-        
-        if action not in allowed_actions:
+        if not self.policy.is_allowed(action, self.env, SOURCE_GOVERNANCE):
+            allowed_actions = self.policy.allowed_actions(self.env, SOURCE_GOVERNANCE)
             return GovernanceDecision(
                 should_block=True,
                 reason=GovernanceReason.ACTION_NOT_ELIGIBLE.value,
@@ -194,7 +323,7 @@ class ActionGovernance:
             GovernanceDecision
         """
         # For restart/scale actions, app should exist
-        if action in ['restart', 'scale_up', 'scale_down']:
+        if action in self.APP_SCOPED_ACTIONS:
             app_name = context.get('app_name')
             if not app_name:
                 return GovernanceDecision(
@@ -223,82 +352,72 @@ class ActionGovernance:
         
         return GovernanceDecision(should_block=False)
     
-    def _check_cooldown(
+    def _cooldown_decision(
         self,
         action: str,
-        current_time: float
+        current_time: float,
+        key: Tuple[Optional[str], str],
+        result: Dict[str, Any]
     ) -> GovernanceDecision:
-        """Check if action is on cooldown.
+        """Build the block decision for an action on cooldown for this app.
         
         Args:
             action: Action name
             current_time: Current timestamp
+            key: (app_name, action) state key
+            result: Backend result
             
         Returns:
             GovernanceDecision
         """
         cooldown_period = self.cooldown_periods.get(action, 0)
-        
-        if cooldown_period == 0:
-            return GovernanceDecision(should_block=False)
-        
-        last_execution = self._last_execution.get(action)
-        
-        if last_execution:
-            time_since_last = current_time - last_execution
-            if time_since_last < cooldown_period:
-                time_remaining = cooldown_period - time_since_last
-                return GovernanceDecision(
-                    should_block=True,
-                    reason=GovernanceReason.COOLDOWN_ACTIVE.value,
-                    details={
-                        'action': action,
-                        'last_execution': last_execution,
-                        'cooldown_period': f'{cooldown_period}s',
-                        'time_since_last': f'{time_since_last:.1f}s',
-                        'time_remaining': f'{time_remaining:.1f}s',
-                        'message': f'Action {action} on cooldown for {time_remaining:.1f}s'
-                    }
-                )
-        
-        return GovernanceDecision(should_block=False)
+        last_execution = result['last_execution']
+        time_since_last = current_time - last_execution
+        time_remaining = cooldown_period - time_since_last
+        return GovernanceDecision(
+            should_block=True,
+            reason=GovernanceReason.COOLDOWN_ACTIVE.value,
+            details={
+                'action': action,
+                'app_name': key[0],
+                'last_execution': last_execution,
+                'cooldown_period': f'{cooldown_period}s',
+                'time_since_last': f'{time_since_last:.1f}s',
+                'time_remaining': f'{time_remaining:.1f}s',
+                'message': f'Action {action} on cooldown for {time_remaining:.1f}s'
+            }
+        )
     
-    def _check_repetition(
+    def _repetition_decision(
         self,
         action: str,
-        current_time: float
+        key: Tuple[Optional[str], str],
+        result: Dict[str, Any]
     ) -> GovernanceDecision:
-        """Check if action is being repeated too frequently.
+        """Build the block decision for an action repeated too often for this app.
         
         Args:
             action: Action name
-            current_time: Current timestamp
+            key: (app_name, action) state key
+            result: Backend result
             
         Returns:
             GovernanceDecision
         """
-        # Get recent actions within the repetition window
-        cutoff_time = current_time - self.repetition_window
-        recent_actions = [
-            record for record in self._action_history
-            if record.timestamp > cutoff_time and record.action == action
-        ]
-        
-        if len(recent_actions) >= self.repetition_limit:
-            return GovernanceDecision(
-                should_block=True,
-                reason=GovernanceReason.REPETITION_LIMIT_EXCEEDED.value,
-                details={
-                    'action': action,
-                    'action_history': [r.action for r in recent_actions],
-                    'window': f'{self.repetition_window}s',
-                    'limit': self.repetition_limit,
-                    'actual': len(recent_actions),
-                    'message': f'Action {action} repeated {len(recent_actions)} times in {self.repetition_window}s (limit: {self.repetition_limit})'
-                }
-            )
-        
-        return GovernanceDecision(should_block=False)
+        recent_count = result['count']
+        return GovernanceDecision(
+            should_block=True,
+            reason=GovernanceReason.REPETITION_LIMIT_EXCEEDED.value,
+            details={
+                'action': action,
+                'app_name': key[0],
+                'action_history': [action] * recent_count,
+                'window': f'{self.repetition_window}s',
+                'limit': self.repetition_limit,
+                'actual': recent_count,
+                'message': f'Action {action} repeated {recent_count} times in {self.repetition_window}s (limit: {self.repetition_limit})'
+            }
+        )
     
     def _record_action(
         self,
@@ -306,16 +425,13 @@ class ActionGovernance:
         timestamp: float,
         context: Dict[str, Any]
     ):
-        """Record action execution.
+        """Record action execution in the reporting history.
         
         Args:
             action: Action name
             timestamp: Execution timestamp
             context: Action context
         """
-        # Update last execution time
-        self._last_execution[action] = timestamp
-        
         # Add to history
         record = ActionRecord(
             action=action,
@@ -327,13 +443,15 @@ class ActionGovernance:
     def get_action_history(
         self,
         action: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        app_name: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get recent action history.
         
         Args:
             action: Filter by action name (None for all)
             limit: Max number of records
+            app_name: Filter by app name (None for all)
             
         Returns:
             List of action records
@@ -342,6 +460,8 @@ class ActionGovernance:
         
         if action:
             history = [r for r in history if r.action == action]
+        if app_name:
+            history = [r for r in history if r.context.get('app_name') == app_name]
         
         # Return most recent first
         history.reverse()
@@ -358,7 +478,8 @@ class ActionGovernance:
     
     def reset(self):
         """Reset governance state (useful for testing)."""
-        self._last_execution.clear()
+        self.backend.reset()
+        self._blocked_until.clear()
         self._action_history.clear()
     
     def get_config(self) -> Dict[str, Any]:
@@ -372,7 +493,10 @@ class ActionGovernance:
             'cooldown_periods': self.cooldown_periods,
             'repetition_limit': self.repetition_limit,
             'repetition_window': self.repetition_window,
-            'eligibility_rules': self._eligibility_rules.get(self.env, [])
+            'repetition_buckets': self.repetition_buckets,
+            'backend': type(self.backend).__name__,
+            'tracked_keys': self.backend.tracked_keys(),
+            'eligibility_rules': self.policy.allowed_actions(self.env, SOURCE_GOVERNANCE)
         }
 
 
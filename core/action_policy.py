@@ -0,0 +1,140 @@
+"""
+Action Policy
+Compiles the declarative allowlist in action_policy.json into bitmask
+tables shared by every enforcement layer (governance, orchestrators, RL
+brains), so an allow/deny check is a dict lookup and a bit test.
+
+Each environment declares a ceiling of allowed actions; a source (the
+enforcement layer asking) may be narrowed to a subset but never widened,
+which the compiler checks. The file is reloaded when it changes on disk.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_POLICY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'action_policy.json')
+FALLBACK_ENV = '*'
+
+# Enforcement layers consulting the policy
+SOURCE_GOVERNANCE = 'action_governance'
+SOURCE_SAFE_ORCHESTRATOR = 'safe_orchestrator'
+SOURCE_RL_BRAIN = 'rl_brain'
+SOURCE_ORCHESTRATOR_SERVICE = 'orchestrator_service'
+
+# action -> bit, env -> {source or None (ceiling) -> mask}
+_Tables = Tuple[Dict[str, int], Dict[str, Dict[Optional[str], int]]]
+
+
+def compile_policy(document: Dict[str, Any]) -> _Tables:
+    """Compile a policy document into lookup tables.
+
+    Raises:
+        ValueError: Unknown actions, a missing fallback environment, or a
+            source allowed more than its environment's ceiling
+    """
+    actions = document.get('actions') or []
+    if len(set(actions)) != len(actions):
+        raise ValueError("Duplicate actions in policy")
+    bits = {action: 1 << index for index, action in enumerate(actions)}
+
+    def mask_of(names: List[str], where: str) -> int:
+        mask = 0
+        for name in names:
+            if name not in bits:
+                raise ValueError(f"Unknown action {name!r} in {where}")
+            mask |= bits[name]
+        return mask
+
+    environments = document.get('environments') or {}
+    if FALLBACK_ENV not in environments:
+        raise ValueError(f"Policy must define the {FALLBACK_ENV!r} fallback environment")
+
+    masks: Dict[str, Dict[Optional[str], int]] = {}
+    for env, rules in environments.items():
+        ceiling = mask_of(rules.get('allowed', []), f"{env}.allowed")
+        env_masks: Dict[Optional[str], int] = {None: ceiling}
+        for source, names in (rules.get('sources') or {}).items():
+            mask = mask_of(names, f"{env}.sources.{source}")
+            if mask & ~ceiling:
+                raise ValueError(f"Source {source!r} exceeds the {env!r} ceiling")
+            env_masks[source] = mask
+        masks[env] = env_masks
+    return bits, masks
+
+
+class ActionPolicy:
+    """Compiled action policy with change-driven hot reload."""
+
+    def __init__(self, path: str = None, check_interval: float = 1.0):
+        self.path = path or os.getenv('ACTION_POLICY_FILE', DEFAULT_POLICY_FILE)
+        self.check_interval = check_interval
+        self.version = None
+        self._tables: _Tables = ({}, {})
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Compile the policy file and swap in the new tables."""
+        with open(self.path, 'r') as f:
+            document = json.load(f)
+        tables = compile_policy(document)
+        with self._lock:
+            self._tables = tables
+            self.version = document.get('version')
+            self._mtime = os.path.getmtime(self.path)
+
+    def reload_if_changed(self) -> bool:
+        """Reload when the file changed; a bad edit keeps the current tables."""
+        try:
+            if os.path.getmtime(self.path) == self._mtime:
+                return False
+            self.load()
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Action policy reload failed, keeping previous policy: {e}")
+            return False
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.reload_if_changed()
+
+    def _mask(self, env: str, source: Optional[str]) -> Tuple[Dict[str, int], int]:
+        if self.check_interval >= 0:
+            self._maybe_reload()
+        bits, masks = self._tables
+        env_masks = masks.get(env) or masks[FALLBACK_ENV]
+        return bits, env_masks.get(source, env_masks[None])
+
+    def is_allowed(self, action: str, env: str, source: Optional[str] = None) -> bool:
+        """Check whether source may run action in env."""
+        bits, mask = self._mask(env, source)
+        return bool(mask & bits.get(action, 0))
+
+    def allowed_actions(self, env: str, source: Optional[str] = None) -> List[str]:
+        """Actions source may run in env, in policy order."""
+        bits, mask = self._mask(env, source)
+        return [action for action, bit in bits.items() if mask & bit]
+
+    def allowlists(self, source: Optional[str] = None) -> Dict[str, List[str]]:
+        """Allowed actions per named environment for source."""
+        return {env: self.allowed_actions(env, source)
+                for env in self._tables[1] if env != FALLBACK_ENV}
+
+
+# Global policy instance
+_policy = None
+
+
+def get_action_policy() -> ActionPolicy:
+    """Get or create the global action policy."""
+    global _policy
+    if _policy is None:
+        _policy = ActionPolicy()
+    return _policy
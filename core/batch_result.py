@@ -0,0 +1,50 @@
+"""
+Batch Result
+Compact result arrays for evaluating many candidates at once, shared by
+ActionGovernance.evaluate_many and SelfRestraint.check_many.
+"""
+
+from typing import Callable, Dict, Any, List, Optional
+
+
+class BatchResult:
+    """Per-candidate block flags and reasons; details are built on demand.
+
+    ``blocked[i]`` and ``reasons[i]`` are plain lists aligned with the
+    candidates. Detail dicts are only produced for blocked candidates, and
+    only when asked for.
+    """
+
+    __slots__ = ('blocked', 'reasons', '_explain', '_decision_cls', '_details')
+
+    def __init__(self, blocked: List[bool], reasons: List[Optional[str]],
+                 explain: Callable[[int], Dict[str, Any]], decision_cls):
+        self.blocked = blocked
+        self.reasons = reasons
+        self._explain = explain
+        self._decision_cls = decision_cls
+        self._details: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.blocked)
+
+    def allowed_indices(self) -> List[int]:
+        """Indexes of candidates that passed every check."""
+        return [i for i, blocked in enumerate(self.blocked) if not blocked]
+
+    def details(self, index: int) -> Optional[Dict[str, Any]]:
+        """Block details for candidate index (None when allowed)."""
+        if not self.blocked[index]:
+            return None
+        details = self._details.get(index)
+        if details is None:
+            details = self._details[index] = self._explain(index)
+        return details
+
+    def decision(self, index: int):
+        """Full decision object for candidate index."""
+        return self._decision_cls(
+            should_block=self.blocked[index],
+            reason=self.reasons[index],
+            details=self.details(index)
+        )
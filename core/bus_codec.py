@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Bus Codec Layer
+Pluggable message encodings for the event buses. JSON goes on the wire
+as plain, untagged JSON, as it always has; binary codecs prefix a one-byte
+codec tag (which JSON text never starts with), so producers and consumers
+using different codecs interoperate. JSON tagged with TAG_JSON is still
+read.
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple, Union
+
+from security.signing import get_signer, is_envelope, open_envelope, seal_envelope, verify_payload
+
+try:
+    import msgpack as _msgpack
+except ImportError:
+    _msgpack = None
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+TAG_JSON = 0x01
+TAG_MSGPACK = 0x02
+
+_SIGNATURE_HEX_LEN = 64
+
+
+class CodecError(ValueError):
+    """Raised when data cannot be encoded or decoded."""
+    pass
+
+
+class JsonCodec:
+    """Stdlib JSON encoding."""
+
+    name = 'json'
+    tag = TAG_JSON
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def decode(self, data: Union[bytes, memoryview]) -> Any:
+        return json.loads(bytes(data))
+
+
+class FastJsonCodec(JsonCodec):
+    """JSON through orjson when installed; output stays plain JSON."""
+
+    name = 'fast_json'
+
+    def encode(self, obj: Any) -> bytes:
+        return _orjson.dumps(obj)
+
+    def decode(self, data: Union[bytes, memoryview]) -> Any:
+        return _orjson.loads(data)
+
+
+class MsgpackCodec:
+    """Compact MessagePack binary encoding (requires the msgpack package)."""
+
+    name = 'msgpack'
+    tag = TAG_MSGPACK
+
+    def encode(self, obj: Any) -> bytes:
+        if _msgpack is None:
+            raise CodecError("msgpack codec requires the msgpack package")
+        return _msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data: Union[bytes, memoryview]) -> Any:
+        if _msgpack is None:
+            raise CodecError("Received msgpack data but the msgpack package is not installed")
+        return _msgpack.unpackb(data, raw=False)
+
+
+_CODECS = {
+    'json': JsonCodec()
+}
+if _msgpack is not None:
+    _CODECS['msgpack'] = MsgpackCodec()
+if _orjson is not None:
+    _CODECS['fast_json'] = FastJsonCodec()
+else:
+    # Same wire format; fall back to the stdlib encoder
+    _CODECS['fast_json'] = _CODECS['json']
+
+# Decoders by tag; JSON is decoded by the fastest JSON backend
+_DECODERS = {TAG_JSON: _CODECS['fast_json'], TAG_MSGPACK: MsgpackCodec()}
+
+
+def codec_backends() -> Dict[str, str]:
+    """Implementation backing each codec in this environment."""
+    return {
+        'json': 'stdlib',
+        'fast_json': 'orjson' if _orjson is not None else 'stdlib',
+        'msgpack': 'msgpack' if _msgpack is not None else 'unavailable'
+    }
+
+
+def get_codec(name: str = 'json'):
+    """Get codec by name: json, fast_json or msgpack (if installed)."""
+    if name == 'msgpack' and _msgpack is None:
+        raise CodecError("msgpack codec requires the msgpack package (pip install msgpack)")
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown codec: {name}")
+
+
+def encode_message(obj: Any, codec=None) -> bytes:
+    """Encode obj: plain JSON, or tag byte + body for binary codecs."""
+    codec = codec or _CODECS['json']
+    if codec.tag == TAG_JSON:
+        return codec.encode(obj)
+    return bytes((codec.tag,)) + codec.encode(obj)
+
+
+def decode_message(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode tagged data with the matching codec, or untagged JSON."""
+    if isinstance(data, str):
+        return json.loads(data)
+    if not data:
+        raise CodecError("Empty message")
+    decoder = _DECODERS.get(data[0])
+    if decoder is None:
+        return _DECODERS[TAG_JSON].decode(data)
+    return decoder.decode(data[1:])
+
+
+def seal_message(message: Dict[str, Any], codec=None) -> Tuple[bytes, str]:
+    """Encode and sign message in one pass.
+
+    JSON keeps the canonical signed envelope; other codecs produce
+    ``tag + signature hex + body`` with the signature over the body bytes.
+
+    Returns:
+        (wire bytes, signature)
+    """
+    codec = codec or _CODECS['json']
+    if codec.tag == TAG_JSON:
+        return seal_envelope(message)
+    body = codec.encode(message)
+    signature = get_signer().sign_bytes(body)
+    return b''.join((bytes((codec.tag,)), signature.encode(), body)), signature
+
+
+def open_message(data: Union[bytes, str], allow_unsigned: bool = False) -> Optional[Dict[str, Any]]:
+    """Verify and decode a sealed message.
+
+    Args:
+        allow_unsigned: Accept legacy JSON without a signature field
+            (migration only; stripping the signature otherwise bypasses
+            verification)
+
+    Returns:
+        Message dict, or None when the signature does not match or is
+        missing. Untagged JSON without an envelope is verified by
+        re-canonicalizing.
+    """
+    if is_envelope(data):
+        return open_envelope(data)
+    if isinstance(data, str) or not data or data[0] not in _DECODERS:
+        message = decode_message(data)
+        if 'signature' not in message:
+            return message if allow_unsigned else None
+        if not verify_payload(message):
+            return None
+        return message
+
+    signature = bytes(data[1:1 + _SIGNATURE_HEX_LEN]).decode('ascii', 'replace')
+    body = data[1 + _SIGNATURE_HEX_LEN:]
+    if not get_signer().verify_bytes(bytes(body), signature):
+        return None
+    return _DECODERS[data[0]].decode(body)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Dispatch Table - Compiled Subscription Matching
+Resolves an event type to its subscriber callbacks without scanning every
+subscribed pattern.
+"""
+
+from typing import Dict, List, Callable, Tuple
+
+_CALLBACKS = ''  # Trie node key holding callbacks of prefixes ending here
+
+
+class DispatchTable:
+    """Compiled pattern -> callbacks lookup.
+
+    Patterns are split into three structures when compiled:
+    exact event types in a hash map, ``prefix*`` patterns in a character
+    trie, and ``*`` in a wildcard list. Resolved callback tuples are cached
+    per event type until the next compile.
+    """
+
+    MAX_CACHE_SIZE = 4096
+
+    def __init__(self):
+        self._exact: Dict[str, Tuple[Callable, ...]] = {}
+        self._trie: Dict[str, dict] = {}
+        self._wildcard: Tuple[Callable, ...] = ()
+        self._cache: Dict[str, Tuple[Callable, ...]] = {}
+
+    def compile(self, subscribers: Dict[str, List[Callable]]):
+        """Rebuild lookup structures from a pattern -> callbacks mapping.
+
+        Call on every subscribe/unsubscribe; matching never rebuilds.
+        """
+        exact: Dict[str, Tuple[Callable, ...]] = {}
+        trie: Dict[str, dict] = {}
+        wildcard: List[Callable] = []
+
+        for pattern, callbacks in subscribers.items():
+            if not callbacks:
+                continue
+            if pattern == '*':
+                wildcard.extend(callbacks)
+            elif pattern.endswith('*'):
+                node = trie
+                for char in pattern[:-1]:
+                    node = node.setdefault(char, {})
+                node[_CALLBACKS] = node.get(_CALLBACKS, ()) + tuple(callbacks)
+            else:
+                exact[pattern] = tuple(callbacks)
+
+        # Swap in fresh structures so a concurrent match never sees a half-built table
+        self._exact, self._trie, self._wildcard = exact, trie, tuple(wildcard)
+        self._cache = {}
+
+    def match(self, event_type: str) -> Tuple[Callable, ...]:
+        """Get callbacks subscribed to event_type."""
+        cache = self._cache
+        callbacks = cache.get(event_type)
+        if callbacks is not None:
+            return callbacks
+
+        matched = list(self._wildcard)
+        node = self._trie
+        if _CALLBACKS in node:
+            matched.extend(node[_CALLBACKS])
+        for char in event_type:
+            node = node.get(char)
+            if node is None:
+                break
+            if _CALLBACKS in node:
+                matched.extend(node[_CALLBACKS])
+        matched.extend(self._exact.get(event_type, ()))
+
+        callbacks = tuple(matched)
+        if len(cache) >= self.MAX_CACHE_SIZE:
+            cache.clear()
+        cache[event_type] = callbacks
+        return callbacks
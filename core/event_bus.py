@@ -7,12 +7,15 @@ import time
 import csv
 import os
 from datetime import datetime
+from core.bus_codec import get_codec, encode_message, decode_message
 
 class EventBus:
-    def __init__(self, redis_host='localhost', redis_port=6379):
+    def __init__(self, redis_host='localhost', redis_port=6379, codec='json'):
         """Initialize Redis event bus"""
+        self.codec = get_codec(codec)
         try:
-            self.redis_client = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
+            # Raw bytes: messages may use a binary codec
+            self.redis_client = redis.Redis(host=redis_host, port=redis_port, decode_responses=False)
             self.redis_client.ping()
             self.use_redis = True
         except:
@@ -37,7 +40,7 @@ class EventBus:
         start_time = time.time()
         
         if isinstance(message, dict):
-            message = json.dumps(message)
+            message = encode_message(message, self.codec)
         
         if self.use_redis:
             self.redis_client.publish(channel, message)
@@ -60,10 +63,7 @@ class EventBus:
                 for message in pubsub.listen():
                     if message['type'] == 'message':
                         start_time = time.time()
-                        try:
-                            data = json.loads(message['data'])
-                        except:
-                            data = message['data']
+                        data = self._decode(message['data'])
                         callback(data)
                         latency = (time.time() - start_time) * 1000
                         self._log_performance('subscribe', channel, latency, len(str(data)))
@@ -82,10 +82,7 @@ class EventBus:
                     for i, (msg_channel, message) in enumerate(self._messages):
                         if msg_channel == channel:
                             start_time = time.time()
-                            try:
-                                data = json.loads(message)
-                            except:
-                                data = message
+                            data = self._decode(message)
                             callback(data)
                             latency = (time.time() - start_time) * 1000
                             self._log_performance('subscribe', channel, latency, len(str(data)))
@@ -96,6 +93,13 @@ class EventBus:
             thread = threading.Thread(target=process_messages, daemon=True)
             thread.start()
     
+    def _decode(self, raw):
+        """Decode a message from any codec; non-structured payloads are returned as text."""
+        try:
+            return decode_message(raw)
+        except (ValueError, TypeError):
+            return raw.decode(errors='replace') if isinstance(raw, bytes) else raw
+    
     def emit(self, event_type, data):
         """Emit event (alias for publish)"""
         self.publish(event_type, data)
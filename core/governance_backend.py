@@ -0,0 +1,206 @@
+"""
+Governance State Backends
+Cooldown and repetition-window state for ActionGovernance, keyed by
+(app_name, action).
+
+LocalGovernanceBackend keeps state in process for a single node and tests.
+RedisGovernanceBackend shares it across agent processes: each check runs as
+one atomic Lua script, so a decision costs a single round trip.
+"""
+
+from collections import deque, OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+StateKey = Tuple[Optional[str], str]
+
+REASON_COOLDOWN = 'cooldown_active'
+REASON_REPETITION = 'repetition_limit_exceeded'
+
+
+def _result(reason: Optional[str], last_execution: Optional[float], count: int,
+            blocked_until: float = 0.0) -> Dict[str, Any]:
+    return {
+        'allowed': reason is None,
+        'reason': reason,
+        'last_execution': last_execution,
+        'count': count,
+        'blocked_until': blocked_until
+    }
+
+
+class _KeyState:
+    """Cooldown and repetition state for one (app_name, action) key."""
+
+    __slots__ = ('last_execution', 'buckets')
+
+    def __init__(self):
+        self.last_execution = 0.0
+        # [bucket_index, count] pairs, oldest first; at most one per bucket in the window
+        self.buckets: deque = deque()
+
+    def count_since(self, oldest_bucket: int) -> int:
+        """Executions in buckets from oldest_bucket on, dropping older buckets."""
+        buckets = self.buckets
+        while buckets and buckets[0][0] < oldest_bucket:
+            buckets.popleft()
+        return sum(count for _, count in buckets)
+
+    def add(self, bucket: int):
+        if self.buckets and self.buckets[-1][0] == bucket:
+            self.buckets[-1][1] += 1
+        else:
+            self.buckets.append([bucket, 1])
+
+
+class LocalGovernanceBackend:
+    """In-process governance state for a single node."""
+
+    def __init__(self):
+        # Least recently executed first, so idle keys are evicted from the front
+        self._states: 'OrderedDict[StateKey, _KeyState]' = OrderedDict()
+
+    def check(self, key: StateKey, now: float, cooldown: float, window: float, limit: int,
+              bucket_width: float, idle_after: float, record: bool = True) -> Dict[str, Any]:
+        """Check cooldown then repetition for key; record an execution if allowed.
+
+        Returns:
+            Dict with allowed, reason, last_execution, count and blocked_until
+            (a time before which the key is certainly still blocked)
+        """
+        self._evict_idle(now, idle_after)
+        state = self._states.get(key)
+        last_execution = state.last_execution if state else None
+
+        if state is not None and cooldown > 0 and now - state.last_execution < cooldown:
+            return _result(REASON_COOLDOWN, last_execution, 0, state.last_execution + cooldown)
+
+        count = 0
+        if state is not None:
+            count = state.count_since(int((now - window) // bucket_width))
+        if count >= limit:
+            # The oldest counted bucket leaves the window at this time; with
+            # nothing counted (limit <= 0) there is no such time to cache
+            blocked_until = 0.0
+            if state is not None and state.buckets:
+                blocked_until = (state.buckets[0][0] + 1) * bucket_width + window
+            return _result(REASON_REPETITION, last_execution, count, blocked_until)
+
+        if record:
+            if state is None:
+                state = self._states[key] = _KeyState()
+            else:
+                self._states.move_to_end(key)
+            state.last_execution = now
+            state.add(int(now // bucket_width))
+        return _result(None, last_execution, count)
+
+    def _evict_idle(self, now: float, idle_after: float):
+        """Drop keys whose cooldown and repetition window have both expired."""
+        states = self._states
+        while states:
+            key, state = next(iter(states.items()))
+            if now - state.last_execution < idle_after:
+                break
+            del states[key]
+
+    def tracked_keys(self) -> int:
+        return len(self._states)
+
+    def reset(self):
+        self._states.clear()
+
+
+# KEYS[1]: state hash. ARGV: now, cooldown, window, limit, bucket_width, idle_after, record.
+# Hash fields: "last" = last execution time, "b<index>" = executions in that bucket.
+# Times are returned as strings since Lua numbers are truncated to integers in replies.
+_CHECK_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cooldown = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local limit = tonumber(ARGV[4])
+local width = tonumber(ARGV[5])
+local idle_after = tonumber(ARGV[6])
+local record = ARGV[7] == '1'
+
+local last = redis.call('HGET', KEYS[1], 'last')
+if last and cooldown > 0 and now - tonumber(last) < cooldown then
+    return {'cooldown', last, 0, tostring(tonumber(last) + cooldown)}
+end
+
+local oldest = math.floor((now - window) / width)
+local fields = redis.call('HGETALL', KEYS[1])
+local count = 0
+local first = nil
+for i = 1, #fields, 2 do
+    local field = fields[i]
+    if string.sub(field, 1, 1) == 'b' then
+        local index = tonumber(string.sub(field, 2))
+        if index < oldest then
+            redis.call('HDEL', KEYS[1], field)
+        else
+            count = count + tonumber(fields[i + 1])
+            if first == nil or index < first then
+                first = index
+            end
+        end
+    end
+end
+if count >= limit then
+    -- Nothing counted (limit <= 0): no bucket expiry to report
+    local blocked_until = 0
+    if first ~= nil then
+        blocked_until = (first + 1) * width + window
+    end
+    return {'repetition', last or '', count, tostring(blocked_until)}
+end
+
+if record then
+    redis.call('HSET', KEYS[1], 'last', ARGV[1])
+    redis.call('HINCRBY', KEYS[1], 'b' .. math.floor(now / width), 1)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(idle_after * 1000))
+end
+return {'ok', last or '', count, '0'}
+"""
+
+_SCRIPT_REASONS = {b'cooldown': REASON_COOLDOWN, b'repetition': REASON_REPETITION, b'ok': None}
+
+
+class RedisGovernanceBackend:
+    """Governance state shared across agent processes through Redis.
+
+    Idle keys expire through Redis TTLs. Check times come from the calling
+    process, so agent hosts are expected to keep their clocks in sync.
+    """
+
+    def __init__(self, client, prefix: str = 'governance:'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_CHECK_SCRIPT)
+
+    def _redis_key(self, key: StateKey) -> str:
+        app_name, action = key
+        return f"{self.prefix}{app_name or ''}|{action}"
+
+    def check(self, key: StateKey, now: float, cooldown: float, window: float, limit: int,
+              bucket_width: float, idle_after: float, record: bool = True) -> Dict[str, Any]:
+        """Same contract as LocalGovernanceBackend.check, in one round trip."""
+        status, last, count, blocked_until = self._script(
+            keys=[self._redis_key(key)],
+            args=[repr(now), cooldown, window, limit, repr(bucket_width), idle_after, '1' if record else '0']
+        )
+        if isinstance(status, str):
+            status = status.encode()
+        if isinstance(last, bytes):
+            last = last.decode()
+        if isinstance(blocked_until, bytes):
+            blocked_until = blocked_until.decode()
+        return _result(_SCRIPT_REASONS[status], float(last) if last else None, int(count),
+                       float(blocked_until))
+
+    def tracked_keys(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}*"))
+
+    def reset(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
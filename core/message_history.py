@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Message History - Indexed Ring Buffer
+Bounded bus message history with O(1) append and secondary indexes by
+event type and publish time.
+"""
+
+import sys
+import time
+import datetime
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque, Union
+
+
+class MessageHistory:
+    """Fixed-capacity ring buffer of bus messages.
+
+    Each slot holds a compact (publish_time, event_type, message) tuple.
+    Every message gets a monotonically increasing sequence number; the slot
+    for sequence ``seq`` is ``seq % capacity``. A per-event-type deque of
+    sequence numbers serves type queries, and the time-ordered ring serves
+    "since T" queries by binary search.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._slots: List[Optional[tuple]] = [None] * capacity
+        self._next_seq = 0
+        self._type_index: Dict[str, Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    def __iter__(self):
+        return iter(self.query(limit=self.capacity))
+
+    def append(self, message: Dict[str, Any], published_at: Optional[float] = None):
+        """Append message, evicting the oldest one when full."""
+        event_type = sys.intern(str(message.get('event_type', '')))
+        published_at = time.time() if published_at is None else published_at
+
+        with self._lock:
+            seq = self._next_seq
+            slot = seq % self.capacity
+            evicted = self._slots[slot]
+            if evicted is not None:
+                evicted_index = self._type_index[evicted[1]]
+                evicted_index.popleft()
+                if not evicted_index:
+                    del self._type_index[evicted[1]]
+
+            self._slots[slot] = (published_at, event_type, message)
+            self._type_index.setdefault(event_type, deque()).append(seq)
+            self._next_seq = seq + 1
+
+    def clear(self):
+        """Drop all messages."""
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._next_seq = 0
+            self._type_index.clear()
+
+    def event_types(self) -> List[str]:
+        """Get event types currently held in history."""
+        with self._lock:
+            return list(self._type_index)
+
+    def query(self, limit: int = 100, event_type: Optional[str] = None,
+              since: Union[float, str, datetime.datetime, None] = None) -> List[Dict[str, Any]]:
+        """Get the most recent messages, oldest first.
+
+        Args:
+            limit: Maximum number of messages to return
+            event_type: Exact event type, or a ``prefix*`` pattern ("*" for all)
+            since: Only messages published at or after this time (epoch
+                seconds, ISO-8601 string or datetime)
+        """
+        if limit <= 0:
+            return []
+        since_ts = self._to_epoch(since)
+
+        with self._lock:
+            if event_type is None or event_type == '*':
+                seqs = self._tail_seqs(limit, since_ts)
+            else:
+                seqs = self._indexed_seqs(event_type, limit, since_ts)
+            return [self._slots[seq % self.capacity][2] for seq in seqs]
+
+    def _tail_seqs(self, limit: int, since_ts: Optional[float]) -> List[int]:
+        """Sequence numbers of the newest messages across all types."""
+        first = self._next_seq - len(self)
+        start = max(first, self._next_seq - limit)
+        if since_ts is not None:
+            start = max(start, self._bisect_time(first, since_ts))
+        return list(range(start, self._next_seq))
+
+    def _indexed_seqs(self, event_type: str, limit: int, since_ts: Optional[float]) -> List[int]:
+        """Sequence numbers of the newest messages for a type or prefix."""
+        if event_type.endswith('*'):
+            prefix = event_type[:-1]
+            indexes = [index for name, index in self._type_index.items() if name.startswith(prefix)]
+        else:
+            index = self._type_index.get(event_type)
+            indexes = [index] if index else []
+
+        seqs = []
+        for index in indexes:
+            # Walk each type's index backwards; it is already in publish order
+            for taken, seq in enumerate(reversed(index)):
+                if taken >= limit:
+                    break
+                if since_ts is not None and self._slots[seq % self.capacity][0] < since_ts:
+                    break
+                seqs.append(seq)
+
+        seqs.sort()
+        return seqs[-limit:]
+
+    def _bisect_time(self, first: int, since_ts: float) -> int:
+        """First sequence number published at or after since_ts."""
+        lo, hi = first, self._next_seq
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._slots[mid % self.capacity][0] < since_ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    @staticmethod
+    def _to_epoch(value: Union[float, str, datetime.datetime, None]) -> Optional[float]:
+        """Normalize a time bound to epoch seconds."""
+        if value is None or isinstance(value, (int, float)):
+            return value
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        return value.timestamp()
@@ -1,98 +1,190 @@
-import queue
 import threading
 import time
-import json
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Optional, Tuple
 import csv
 import os
+from core.subscriber_dispatcher import OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST
+
+class _Topic:
+    """Bounded ring buffer and counters for one topic."""
+
+    __slots__ = ('buffer', 'capacity', 'overflow', 'published', 'dropped', 'drained')
+
+    def __init__(self, capacity: int, overflow: str):
+        # drop_oldest is handled natively by deque(maxlen)
+        self.buffer = deque(maxlen=capacity if overflow == OVERFLOW_DROP_OLDEST else None)
+        self.capacity = capacity
+        self.overflow = overflow
+        self.published = 0
+        self.dropped = 0
+        self.drained = 0
 
 class RealtimeBus:
-    def __init__(self):
-        self.queues: Dict[str, queue.Queue] = {}
-        self.subscribers: Dict[str, List[Callable]] = {}
+    """In-process topic bus with sharded locks and bounded per-topic buffers.
+
+    Topics hash onto a fixed set of lock shards, so publishers on different
+    topics rarely contend. Each topic keeps at most ``queue_size`` undrained
+    messages; when full, ``drop_oldest`` evicts the oldest message and
+    ``drop_newest`` discards the incoming one. Throughput is sampled to the
+    performance log every ``sample_interval`` seconds rather than per message.
+    """
+
+    OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+    def __init__(self, num_shards: int = 16, queue_size: int = 10000,
+                 overflow: str = OVERFLOW_DROP_OLDEST, sample_interval: float = 5.0):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.queues: Dict[str, deque] = {}
+        self.subscribers: Dict[str, Tuple[Callable, ...]] = {}
+        self.queue_size = queue_size
+        self.overflow = overflow
         self.running = True
         self.performance_log = os.path.join("logs", r"performance_log.csv")
-        self.message_count = 0
         self.start_time = time.time()
-        
+        self.sample_interval = sample_interval
+
+        self._topics: Dict[str, _Topic] = {}
+        self._shards = [threading.Lock() for _ in range(num_shards)]
+        self._topics_lock = threading.Lock()
+        self._subscribers_lock = threading.Lock()
+        self._sampler_thread = None
+        self._stop_event = threading.Event()
+        self._last_sample = (self.start_time, 0)
+
         # Initialize performance log
         os.makedirs("logs", exist_ok=True)
         if not os.path.exists(self.performance_log):
             with open(self.performance_log, 'w', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(['timestamp', 'event_type', 'throughput_per_sec', 'queue_size', 'total_messages'])
-    
-    def create_queue(self, name: str):
-        """Create a new message queue"""
-        self.queues[name] = queue.Queue()
-        self.subscribers[name] = []
-    
+
+    def _shard(self, topic: str) -> threading.Lock:
+        return self._shards[hash(topic) % len(self._shards)]
+
+    def create_queue(self, name: str, queue_size: int = None, overflow: str = None) -> _Topic:
+        """Create a message queue for topic (existing queues are kept)."""
+        overflow = overflow or self.overflow
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        with self._topics_lock:
+            topic = self._topics.get(name)
+            if topic is None:
+                topic = _Topic(queue_size or self.queue_size, overflow)
+                self._topics[name] = topic
+                self.queues[name] = topic.buffer
+            return topic
+
     def publish(self, topic: str, message: dict):
         """Publish message to topic"""
-        if topic not in self.queues:
-            self.create_queue(topic)
-        
+        state = self._topics.get(topic) or self.create_queue(topic)
+
         message['timestamp'] = datetime.now().isoformat()
-        self.queues[topic].put(message)
-        self.message_count += 1
-        
+        with self._shard(topic):
+            buffer = state.buffer
+            if len(buffer) >= state.capacity:
+                state.dropped += 1
+                if state.overflow == OVERFLOW_DROP_NEWEST:
+                    message = None
+            if message is not None:
+                buffer.append(message)
+            state.published += 1
+
+        if self._sampler_thread is None and self.sample_interval > 0:
+            self._start_sampler()
+
+        if message is None:
+            return
+
         # Notify subscribers immediately
-        for callback in self.subscribers.get(topic, []):
+        for callback in self.subscribers.get(topic, ()):
             try:
                 callback(message)
             except Exception as e:
                 print(f"Subscriber error: {e}")
-        
-        self._log_performance(topic)
-    
+
     def subscribe(self, topic: str, callback: Callable):
         """Subscribe to topic with callback"""
-        if topic not in self.subscribers:
-            self.subscribers[topic] = []
-        self.subscribers[topic].append(callback)
-    
-    def get_messages(self, topic: str, timeout: float = 1.0) -> List[dict]:
-        """Get all messages from topic queue"""
-        if topic not in self.queues:
+        with self._subscribers_lock:
+            # Copy-on-write so publishers iterate without locking
+            self.subscribers[topic] = self.subscribers.get(topic, ()) + (callback,)
+
+    def get_messages(self, topic: str, max_n: Optional[int] = None) -> List[dict]:
+        """Drain up to max_n queued messages from topic without blocking."""
+        state = self._topics.get(topic)
+        if state is None:
             return []
-        
-        messages = []
-        try:
-            while True:
-                message = self.queues[topic].get(timeout=timeout)
-                messages.append(message)
-                self.queues[topic].task_done()
-        except queue.Empty:
-            pass
+
+        with self._shard(topic):
+            buffer = state.buffer
+            count = len(buffer) if max_n is None else min(max_n, len(buffer))
+            messages = [buffer.popleft() for _ in range(count)]
+            state.drained += count
         return messages
-    
-    def _log_performance(self, topic: str):
-        """Log throughput performance"""
+
+    @property
+    def message_count(self) -> int:
+        """Total messages published across topics."""
+        return sum(state.published for state in list(self._topics.values()))
+
+    def _start_sampler(self):
+        """Start the periodic throughput sampler."""
+        with self._topics_lock:
+            if self._sampler_thread is not None:
+                return
+            self._sampler_thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler_thread.start()
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.sample_interval):
+            self._log_performance()
+
+    def _log_performance(self):
+        """Log throughput since the previous sample"""
         current_time = time.time()
-        elapsed = current_time - self.start_time
-        throughput = self.message_count / elapsed if elapsed > 0 else 0
-        queue_size = self.queues[topic].qsize()
-        
+        total = self.message_count
+        last_time, last_total = self._last_sample
+        if total == last_total:
+            return
+        elapsed = current_time - last_time
+        throughput = (total - last_total) / elapsed if elapsed > 0 else 0
+        self._last_sample = (current_time, total)
+        queue_size = sum(len(buffer) for buffer in list(self.queues.values()))
+
         with open(self.performance_log, 'a', newline='') as f:
             writer = csv.writer(f)
             writer.writerow([
                 datetime.now().isoformat(),
-                f"message_published_{topic}",
+                "throughput_sample",
                 f"{throughput:.2f}",
                 queue_size,
-                self.message_count
+                total
             ])
-    
+
     def get_stats(self) -> dict:
         """Get bus statistics"""
         elapsed = time.time() - self.start_time
+        topics = list(self._topics.values())
+        total = sum(state.published for state in topics)
         return {
-            'total_messages': self.message_count,
-            'throughput_per_sec': self.message_count / elapsed if elapsed > 0 else 0,
-            'active_queues': len(self.queues),
-            'uptime_seconds': elapsed
+            'total_messages': total,
+            'throughput_per_sec': total / elapsed if elapsed > 0 else 0,
+            'active_queues': len(topics),
+            'uptime_seconds': elapsed,
+            'queued_messages': sum(len(state.buffer) for state in topics),
+            'dropped_messages': sum(state.dropped for state in topics),
+            'drained_messages': sum(state.drained for state in topics)
         }
 
+    def stop(self):
+        """Stop the sampler and write a final sample."""
+        self.running = False
+        self._stop_event.set()
+        if self._sampler_thread is not None:
+            self._sampler_thread.join(timeout=1)
+            self._log_performance()
+
 # Global bus instance
-realtime_bus = RealtimeBus()
\ No newline at end of file
+realtime_bus = RealtimeBus()
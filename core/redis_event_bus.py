@@ -9,30 +9,72 @@ import time
 import threading
 import datetime
 import uuid
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional, Tuple
 import redis
 from core.env_config import EnvironmentConfig
-from security.signing import sign_payload
+from core.message_history import MessageHistory
+from core.dispatch_table import DispatchTable
+from core.subscriber_dispatcher import SubscriberDispatcher, OVERFLOW_BLOCK
+from core.bus_codec import get_codec, seal_message, open_message
+from security.signing import SIGNATURE_ALGORITHM
 from security.nonce_store import check_nonce
 
 class RedisEventBus:
     """External event bus using Redis pub/sub."""
     
-    def __init__(self, env='dev'):
+    def __init__(self, env='dev', auto_batch: bool = False,
+                 batch_window_ms: float = 5.0, max_batch_size: int = 100,
+                 history_size: int = 1000, dispatch_workers: int = 4,
+                 subscriber_queue_size: int = 1000, overflow_policy: str = OVERFLOW_BLOCK,
+                 codec: str = 'json', allow_unsigned: bool = False):
         self.env_config = EnvironmentConfig(env)
         self.redis_host = self.env_config.get('redis_host', 'localhost')
         self.redis_port = self.env_config.get('redis_port', 6379)
         self.redis_db = int(self.env_config.get('redis_db', 0))
+        self.codec = get_codec(codec)
+        # Accept unsigned legacy JSON from publishers not yet signing (migration only)
+        self.allow_unsigned = allow_unsigned
         
         # Initialize Redis connection
         self.redis_client = None
+        self.pubsub_client = None
         self.pubsub = None
         self.subscribers = {}
-        self.message_history = []
+        self._dispatch = DispatchTable()
+        
+        # Callbacks run on a worker pool behind per-subscriber queues;
+        # dispatch_workers=0 runs them inline on the listener thread
+        self.dispatcher = None
+        if dispatch_workers > 0:
+            self.dispatcher = SubscriberDispatcher(
+                workers=dispatch_workers,
+                queue_size=subscriber_queue_size,
+                overflow=overflow_policy
+            )
+        self.message_history = MessageHistory(history_size)
         self.running = False
         self.listener_thread = None
         
+        # Auto-batching: coalesce publishes within a short window into one pipeline
+        self.auto_batch = auto_batch
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[Dict[str, Any], bytes]] = []
+        self._batch_cond = threading.Condition()
+        self._flusher_thread = None
+        self._batch_stats = {
+            'batches_flushed': 0,
+            'messages_flushed': 0,
+            'max_batch_size': 0,
+            'total_flush_latency_ms': 0.0,
+            'last_flush_latency_ms': 0.0
+        }
+        self._stats_lock = threading.Lock()
+        
         self._connect()
+        
+        if self.auto_batch:
+            self._start_flusher()
     
     def _connect(self):
         """Connect to Redis server."""
@@ -49,7 +91,18 @@ class RedisEventBus:
             
             # Test connection
             self.redis_client.ping()
-            self.pubsub = self.redis_client.pubsub()
+            
+            # Pub/sub runs on a non-decoding client so listeners receive the
+            # raw envelope bytes that were signed
+            self.pubsub_client = redis.Redis(
+                host=self.redis_host,
+                port=self.redis_port,
+                db=self.redis_db,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                retry_on_timeout=True
+            )
+            self.pubsub = self.pubsub_client.pubsub()
             print(f"Connected to Redis at {self.redis_host}:{self.redis_port}")
             
         except redis.ConnectionError as e:
@@ -61,10 +114,18 @@ class RedisEventBus:
         """Setup mock mode when Redis is unavailable."""
         print("Running in mock mode (Redis unavailable)")
         self.redis_client = None
+        self.pubsub_client = None
         self.pubsub = None
     
-    def publish(self, event_type: str, data: Dict[str, Any]):
-        """Publish event to Redis channel with signature."""
+    def _build_message(self, event_type: str, data: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        """Build and sign a bus message.
+        
+        The message is canonicalized once; the signed envelope bytes are
+        published as-is.
+        
+        Returns:
+            (message dict with signature fields, envelope bytes)
+        """
         # Add nonce for replay protection
         nonce = str(uuid.uuid4())
         
@@ -76,18 +137,28 @@ class RedisEventBus:
             'nonce': nonce
         }
         
-        # Sign the message
-        message = sign_payload(message)
+        # Encode and sign once and keep the buffer for publishing
+        envelope, signature = seal_message(message, self.codec)
+        message['signature'] = signature
+        message['signature_algorithm'] = SIGNATURE_ALGORITHM
         
         # Store in history
         self.message_history.append(message)
-        if len(self.message_history) > 1000:  # Keep last 1000 messages
-            self.message_history.pop(0)
+        
+        return message, envelope
+    
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """Publish event to Redis channel with signature."""
+        entry = self._build_message(event_type, data)
+        
+        if self.auto_batch:
+            self._enqueue(entry)
+            return
         
         if self.redis_client:
             try:
                 channel = f"cicd.{event_type}"
-                self.redis_client.publish(channel, json.dumps(message))
+                self.redis_client.publish(channel, entry[1])
                 print(f"Published to {channel}: {event_type}")
             except redis.RedisError as e:
                 print(f"Failed to publish message: {e}")
@@ -95,12 +166,116 @@ class RedisEventBus:
             # Mock mode - just print
             print(f"[MOCK] Published: {event_type} -> {data}")
     
-    def subscribe(self, event_pattern: str, callback: Callable):
-        """Subscribe to event pattern."""
+    def publish_many(self, events: List[Tuple[str, Dict[str, Any]]]):
+        """Publish several events in a single Redis round trip.
+        
+        Args:
+            events: List of (event_type, data) tuples, published in order
+        """
+        entries = [self._build_message(event_type, data) for event_type, data in events]
+        if self.auto_batch:
+            for entry in entries:
+                self._enqueue(entry)
+            return
+        self._send_batch(entries)
+    
+    def _send_batch(self, entries: List[Tuple[Dict[str, Any], bytes]]):
+        """Send (message, envelope) entries through one non-transactional pipeline."""
+        if not entries:
+            return
+        
+        start_time = time.perf_counter()
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for message, envelope in entries:
+                    pipe.publish(f"cicd.{message['event_type']}", envelope)
+                pipe.execute()
+                print(f"Published batch of {len(entries)} messages")
+            except redis.RedisError as e:
+                print(f"Failed to publish batch: {e}")
+        else:
+            for message, _ in entries:
+                print(f"[MOCK] Published: {message['event_type']} -> {message['data']}")
+        
+        self._record_batch(len(entries), (time.perf_counter() - start_time) * 1000)
+    
+    def _record_batch(self, size: int, latency_ms: float):
+        """Record batch-size and flush-latency stats."""
+        with self._stats_lock:
+            stats = self._batch_stats
+            stats['batches_flushed'] += 1
+            stats['messages_flushed'] += size
+            stats['max_batch_size'] = max(stats['max_batch_size'], size)
+            stats['total_flush_latency_ms'] += latency_ms
+            stats['last_flush_latency_ms'] = latency_ms
+    
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Get batch-size and flush-latency statistics."""
+        with self._stats_lock:
+            stats = dict(self._batch_stats)
+        batches = stats['batches_flushed']
+        stats['avg_batch_size'] = stats['messages_flushed'] / batches if batches else 0.0
+        stats['avg_flush_latency_ms'] = stats['total_flush_latency_ms'] / batches if batches else 0.0
+        stats['pending'] = len(self._pending)
+        stats['auto_batch'] = self.auto_batch
+        return stats
+    
+    def _enqueue(self, entry: Tuple[Dict[str, Any], bytes]):
+        """Queue message for the background flusher."""
+        with self._batch_cond:
+            self._pending.append(entry)
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._batch_cond.notify()
+    
+    def _start_flusher(self):
+        """Start the auto-batch flusher thread."""
+        if self._flusher_thread and self._flusher_thread.is_alive():
+            return
+        self._flusher_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher_thread.start()
+    
+    def _flush_loop(self):
+        """Flush pending messages once the batch window closes or the batch fills."""
+        while self.auto_batch:
+            with self._batch_cond:
+                while not self._pending and self.auto_batch:
+                    self._batch_cond.wait()
+                deadline = time.monotonic() + self.batch_window
+                while self.auto_batch and len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._batch_cond.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+            self._send_batch(batch)
+    
+    def flush(self):
+        """Synchronously send any messages waiting for the batch window."""
+        with self._batch_cond:
+            batch = self._pending
+            self._pending = []
+        self._send_batch(batch)
+    
+    def subscribe(self, event_pattern: str, callback: Callable,
+                  queue_size: int = None, overflow_policy: str = None):
+        """Subscribe to event pattern.
+        
+        Args:
+            event_pattern: Exact event type, ``prefix*`` or ``*``
+            callback: Called with (event_type, data)
+            queue_size: Per-subscriber queue bound (dispatcher default if None)
+            overflow_policy: block, drop_oldest or drop_newest when the queue is full
+        """
+        if self.dispatcher:
+            self.dispatcher.register(callback, queue_size=queue_size, overflow=overflow_policy)
+        
         if event_pattern not in self.subscribers:
             self.subscribers[event_pattern] = []
         
         self.subscribers[event_pattern].append(callback)
+        self._dispatch.compile(self.subscribers)
         
         if self.redis_client and self.pubsub:
             try:
@@ -117,6 +292,30 @@ class RedisEventBus:
         else:
             print(f"[MOCK] Subscribed to: {event_pattern}")
     
+    def unsubscribe(self, event_pattern: str, callback: Callable = None):
+        """Unsubscribe a callback, or every callback, from event pattern."""
+        callbacks = self.subscribers.get(event_pattern)
+        if callbacks is None:
+            return
+        
+        if callback is not None and callback in callbacks:
+            callbacks.remove(callback)
+        if callback is None or not callbacks:
+            del self.subscribers[event_pattern]
+        self._dispatch.compile(self.subscribers)
+        
+        if self.dispatcher:
+            removed = callbacks if callback is None else [callback]
+            for removed_callback in removed:
+                if not any(removed_callback in cbs for cbs in self.subscribers.values()):
+                    self.dispatcher.unregister(removed_callback)
+        
+        if event_pattern not in self.subscribers and self.redis_client and self.pubsub:
+            try:
+                self.pubsub.punsubscribe(f"cicd.{event_pattern}")
+            except redis.RedisError as e:
+                print(f"Failed to unsubscribe: {e}")
+    
     def start_listener(self):
         """Start Redis message listener thread."""
         if self.running or not self.pubsub:
@@ -136,19 +335,23 @@ class RedisEventBus:
                 
                 if message['type'] == 'pmessage':
                     try:
-                        data = json.loads(message['data'])
+                        data = self._decode_message(message['data'])
+                        if data is None:
+                            print("Rejected message with invalid signature")
+                            continue
                         event_type = data['event_type']
                         
                         # Find matching subscribers
-                        for pattern, callbacks in self.subscribers.items():
-                            if self._pattern_matches(pattern, event_type):
-                                for callback in callbacks:
-                                    try:
-                                        callback(event_type, data['data'])
-                                    except Exception as e:
-                                        print(f"Callback error: {e}")
+                        for callback in self._dispatch.match(event_type):
+                            if self.dispatcher:
+                                self.dispatcher.submit(callback, event_type, data['data'])
+                                continue
+                            try:
+                                callback(event_type, data['data'])
+                            except Exception as e:
+                                print(f"Callback error: {e}")
                     
-                    except (json.JSONDecodeError, KeyError) as e:
+                    except (ValueError, KeyError) as e:
                         print(f"Invalid message format: {e}")
                         
         except Exception as e:
@@ -156,6 +359,15 @@ class RedisEventBus:
         finally:
             self.running = False
     
+    def _decode_message(self, raw) -> Optional[Dict[str, Any]]:
+        """Verify and decode raw pub/sub data from any codec.
+        
+        Signed frames are verified against their raw body bytes; legacy
+        JSON messages are verified by re-canonicalizing; unsigned ones are
+        rejected unless allow_unsigned is set.
+        """
+        return open_message(raw, allow_unsigned=self.allow_unsigned)
+    
     def _pattern_matches(self, pattern: str, event_type: str) -> bool:
         """Check if event type matches subscription pattern."""
         if pattern == "*":
@@ -164,9 +376,17 @@ class RedisEventBus:
             return event_type.startswith(pattern[:-1])
         return pattern == event_type
     
-    def get_message_history(self, limit: int = 100) -> List[Dict]:
-        """Get recent message history."""
-        return self.message_history[-limit:]
+    def get_message_history(self, limit: int = 100, event_type: str = None,
+                            since=None) -> List[Dict]:
+        """Get recent message history, oldest first.
+        
+        Args:
+            limit: Maximum number of messages
+            event_type: Exact event type or ``prefix*`` pattern
+            since: Only messages published at or after this time
+                (epoch seconds, ISO-8601 string or datetime)
+        """
+        return self.message_history.query(limit, event_type=event_type, since=since)
     
     def get_queue_stats(self) -> Dict[str, Any]:
         """Get Redis queue statistics."""
@@ -174,7 +394,9 @@ class RedisEventBus:
             'connected': self.redis_client is not None,
             'subscribers': len(self.subscribers),
             'message_history_count': len(self.message_history),
-            'environment': self.env_config.get('environment')
+            'environment': self.env_config.get('environment'),
+            'batching': self.get_batch_stats(),
+            'subscriber_metrics': self.dispatcher.get_metrics() if self.dispatcher else []
         }
         
         if self.redis_client:
@@ -194,13 +416,27 @@ class RedisEventBus:
     def stop(self):
         """Stop the event bus."""
         self.running = False
+        if self.auto_batch:
+            with self._batch_cond:
+                self.auto_batch = False
+                self._batch_cond.notify_all()
+            if self._flusher_thread and self._flusher_thread.is_alive():
+                self._flusher_thread.join(timeout=1)
+        self.flush()
         if self.pubsub:
             try:
                 self.pubsub.close()
             except:
                 pass
+        if self.pubsub_client:
+            try:
+                self.pubsub_client.close()
+            except:
+                pass
         if self.listener_thread and self.listener_thread.is_alive():
             self.listener_thread.join(timeout=1)
+        if self.dispatcher:
+            self.dispatcher.stop()
         print("Redis event bus stopped")
 
 # Global Redis event bus instance
@@ -79,6 +79,12 @@ class RedisStub:
         print(f"STUB: Published to {channel} (stored locally)")
         return True
     
+    def publish_many(self, events: list) -> bool:
+        """Stub bulk publish - stores each (channel, message) pair locally."""
+        for channel, message in events:
+            self.publish(channel, message)
+        return True
+    
     def get_messages(self) -> list:
         """Get all stored messages from stub."""
         return self.message_store.copy()
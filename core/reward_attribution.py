@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Reward Attribution Engine
+Delayed rewards for executed actions, from the health observed after them.
+
+Callers on the agent's hot path only append to a bounded inbox
+(record_action / record_observation). A background thread drains it into
+per-app time-sorted streams of actions and health observations, and once an
+action's horizon has passed joins it to the observations inside
+(t, t + horizon] with a sorted-merge over both streams. The mean health
+score of the window, mapped to [-1, 1], is the reward; rewards are fed to
+the learner's ``update_q_values`` in batches. Memory is bounded by the inbox
+size and per-app stream caps; observations no pending action can use are
+discarded.
+
+Enabled for the runtime by setting RL_REWARD_HORIZON (seconds); the shared
+engine per environment then trains that environment's RLDecisionLayer.
+"""
+
+import atexit
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Health score (1.0 = healthy) of runtime payload states and uptime statuses
+HEALTH_SCORES = {
+    'running': 1.0,
+    'starting': 0.5,
+    'degraded': 0.5,
+    'crashed': 0.0,
+    'stopped': 0.0,
+    'up': 1.0,
+    'down': 0.0,
+    'healthy': 1.0,
+    'unhealthy': 0.0,
+}
+
+_ACTION = 0
+_OBSERVATION = 1
+
+
+def health_score(health: Union[str, float, int]) -> Optional[float]:
+    """Health score in [0, 1] for a state/status string or number, None if unknown"""
+    if isinstance(health, str):
+        return HEALTH_SCORES.get(health.lower())
+    if isinstance(health, (int, float)):
+        return min(max(float(health), 0.0), 1.0)
+    return None
+
+
+class _AppStreams:
+    """Time-sorted pending actions and health observations of one app."""
+
+    def __init__(self, max_actions: int, max_observations: int):
+        self.max_actions = max_actions
+        self.max_observations = max_observations
+        self.actions: List[Tuple[float, str, str]] = []  # (timestamp, state, action)
+        self.observation_times: List[float] = []
+        self.observation_scores: List[float] = []
+
+    def add_action(self, timestamp: float, state: str, action: str) -> int:
+        """Insert in time order; returns the number of actions evicted"""
+        item = (timestamp, state, action)
+        if not self.actions or timestamp >= self.actions[-1][0]:
+            self.actions.append(item)
+        else:
+            bisect.insort(self.actions, item)
+        evicted = max(len(self.actions) - self.max_actions, 0)
+        if evicted:
+            del self.actions[:evicted]
+        return evicted
+
+    def add_observation(self, timestamp: float, score: float) -> int:
+        """Insert in time order; returns the number of observations evicted"""
+        times = self.observation_times
+        if not times or timestamp >= times[-1]:
+            times.append(timestamp)
+            self.observation_scores.append(score)
+        else:
+            i = bisect.bisect_right(times, timestamp)
+            times.insert(i, timestamp)
+            self.observation_scores.insert(i, score)
+        return self._drop_observations(len(times) - self.max_observations)
+
+    def _drop_observations(self, count: int) -> int:
+        if count <= 0:
+            return 0
+        del self.observation_times[:count]
+        del self.observation_scores[:count]
+        return count
+
+    def join(self, now: float, horizon: float) -> Tuple[List[Tuple[str, str, float]], int]:
+        """
+        Attribute every action whose horizon has passed.
+
+        Returns:
+            Tuple of ((state, action, reward) list, count of actions with no
+            observation in their window)
+        """
+        times, scores = self.observation_times, self.observation_scores
+        # An action is due once the horizon passed in wall-clock time or
+        # in the app's own observation timeline
+        watermark = max(now, times[-1]) if times else now
+        rewards, unobserved = [], 0
+        lo = hi = 0
+        window_sum = 0.0
+        due = 0
+        for timestamp, state, action in self.actions:
+            end = timestamp + horizon
+            if end > watermark:
+                break
+            due += 1
+            # Both streams are sorted, so the window (t, t + horizon] only moves forward
+            while hi < len(times) and times[hi] <= end:
+                window_sum += scores[hi]
+                hi += 1
+            while lo < hi and times[lo] <= timestamp:
+                window_sum -= scores[lo]
+                lo += 1
+            if hi > lo:
+                rewards.append((state, action, 2.0 * window_sum / (hi - lo) - 1.0))
+            else:
+                unobserved += 1
+        del self.actions[:due]
+
+        # Observations at or before the oldest pending action can no longer be
+        # attributed; without pending actions keep one horizon for late arrivals
+        cutoff = self.actions[0][0] if self.actions else now - horizon
+        self._drop_observations(bisect.bisect_right(times, cutoff))
+        return rewards, unobserved
+
+    def is_empty(self) -> bool:
+        return not self.actions and not self.observation_times
+
+
+class RewardAttributionEngine:
+    """Background sorted-merge time join of executed actions and later health."""
+
+    def __init__(self, learner: Any, horizon: float = 60.0, batch_size: int = 32,
+                 flush_interval: Optional[float] = 1.0, max_queue: int = 10000,
+                 max_actions_per_app: int = 1000, max_observations_per_app: int = 1000,
+                 max_apps: int = 1000, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            learner: Object with update_q_values([(state, action, reward), ...])
+            horizon: Seconds after an action whose health is attributed to it
+            flush_interval: Seconds between background drains; None disables the
+                background thread (call flush() yourself)
+            max_queue: Inbox size; the oldest entries are dropped beyond it
+            max_apps: Apps tracked at once; events for further apps are dropped
+        """
+        self.learner = learner
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_actions_per_app = max_actions_per_app
+        self.max_observations_per_app = max_observations_per_app
+        self.max_apps = max_apps
+        self.clock = clock
+
+        self._inbox: deque = deque(maxlen=max_queue)
+        self._apps: Dict[str, _AppStreams] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+        self._closed = False
+        self.stats = {
+            'actions': 0,
+            'observations': 0,
+            'rewards': 0,
+            'unobserved': 0,
+            'dropped': 0,
+            'batches': 0,
+            'learner_errors': 0,
+        }
+
+    # Hot path: a bounded deque append, no locks or I/O
+
+    def record_action(self, app: str, state: str, action: str, timestamp: Optional[float] = None):
+        """Record an executed action in state for app"""
+        self._enqueue((_ACTION, app, self.clock() if timestamp is None else timestamp, state, action))
+
+    def record_observation(self, app: str, health: Union[str, float, int], timestamp: Optional[float] = None):
+        """Record a health/uptime observation (state, status or 0-1 score) for app"""
+        score = health_score(health)
+        if score is not None:
+            self._enqueue((_OBSERVATION, app, self.clock() if timestamp is None else timestamp, score, None))
+
+    def _enqueue(self, item: Tuple):
+        if len(self._inbox) == self._inbox.maxlen:
+            self.stats['dropped'] += 1
+        self._inbox.append(item)
+        if self._worker is None and self.flush_interval is not None and not self._closed:
+            self._start_worker()
+
+    # Background side
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None or self._closed:
+                return
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Drain the inbox, attribute due actions and feed the learner; returns rewards emitted"""
+        with self._lock:
+            self._drain_inbox()
+            now = self.clock()
+            rewards = []
+            for app in list(self._apps):
+                streams = self._apps[app]
+                app_rewards, unobserved = streams.join(now, self.horizon)
+                rewards.extend(app_rewards)
+                self.stats['unobserved'] += unobserved
+                if streams.is_empty():
+                    del self._apps[app]
+
+            for start in range(0, len(rewards), self.batch_size):
+                batch = rewards[start:start + self.batch_size]
+                try:
+                    self.learner.update_q_values(batch)
+                except Exception as e:
+                    print(f"Reward attribution learner error: {e}")
+                    self.stats['learner_errors'] += 1
+                    continue
+                self.stats['batches'] += 1
+                self.stats['rewards'] += len(batch)
+            return len(rewards)
+
+    def _drain_inbox(self):
+        """Move queued events into the per-app streams (caller holds the lock)"""
+        while True:
+            try:
+                kind, app, timestamp, value, action = self._inbox.popleft()
+            except IndexError:
+                return
+            streams = self._apps.get(app)
+            if streams is None:
+                if len(self._apps) >= self.max_apps:
+                    self.stats['dropped'] += 1
+                    continue
+                streams = self._apps[app] = _AppStreams(self.max_actions_per_app, self.max_observations_per_app)
+            if kind == _ACTION:
+                self.stats['actions'] += 1
+                self.stats['dropped'] += streams.add_action(timestamp, value, action)
+            else:
+                self.stats['observations'] += 1
+                self.stats['dropped'] += streams.add_observation(timestamp, value)
+
+    def close(self):
+        """Stop the background thread and attribute whatever is due"""
+        self._closed = True
+        self._stop.set()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=5)
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current queue and stream sizes"""
+        with self._lock:
+            pending_actions = sum(len(s.actions) for s in self._apps.values())
+            observations_held = sum(len(s.observation_times) for s in self._apps.values())
+            tracked_apps = len(self._apps)
+        return {
+            **self.stats,
+            'queued': len(self._inbox),
+            'pending_actions': pending_actions,
+            'observations_held': observations_held,
+            'tracked_apps': tracked_apps,
+            'horizon': self.horizon,
+        }
+
+
+_engines: Dict[str, RewardAttributionEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def register_reward_engine(env: str, engine: Optional[RewardAttributionEngine]):
+    """Set (or with None, clear) the shared engine for env"""
+    with _engines_lock:
+        if engine is None:
+            _engines.pop(env, None)
+        else:
+            _engines[env] = engine
+
+
+def get_reward_engine(env: str = 'dev') -> Optional[RewardAttributionEngine]:
+    """
+    Shared engine for env: a registered one, else one training env's
+    RLDecisionLayer when RL_REWARD_HORIZON is set, else None.
+    """
+    engine = _engines.get(env)
+    if engine is not None or not os.getenv('RL_REWARD_HORIZON'):
+        return engine
+    with _engines_lock:
+        if env not in _engines:
+            from core.rl_decision_layer import RLDecisionLayer
+            _engines[env] = RewardAttributionEngine(RLDecisionLayer(env), horizon=float(os.getenv('RL_REWARD_HORIZON')))
+        return _engines[env]
@@ -4,11 +4,18 @@ Demo-Frozen Version - Learning Disabled for Demo Safety
 """
 
 import json
+import os
+import sys
 import time
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import logging
 
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+from core.action_policy import get_action_policy, SOURCE_RL_BRAIN
+
 class Environment(Enum):
     DEV = "dev"
     STAGE = "stage" 
@@ -39,12 +46,8 @@ class RLDecisionBrain:
         self.exploration_rate = 0.0  # FROZEN: No exploration during demo
         self.learning_enabled = False  # FROZEN: No Q-table updates
         
-        # Environment-specific allowed actions (FINAL LOCK)
-        self.allowed_actions = {
-            Environment.DEV: [Action.NOOP, Action.SCALE_UP, Action.SCALE_DOWN, Action.RESTART],
-            Environment.STAGE: [Action.NOOP, Action.SCALE_UP, Action.SCALE_DOWN],
-            Environment.PROD: [Action.NOOP, Action.RESTART]
-        }
+        # Environment-specific allowed actions (FINAL LOCK): core/action_policy.json
+        self.policy = get_action_policy()
         
         # Frozen decision table (deterministic mapping)
         self.decision_table = {
@@ -76,7 +79,7 @@ class RLDecisionBrain:
         proposed_action = self.decision_table.get(decision_key, Action.NOOP)
         
         # Enforce action scope filtering BEFORE emission
-        if proposed_action not in self.allowed_actions[environment]:
+        if not self.policy.is_allowed(proposed_action.value, environment.value, SOURCE_RL_BRAIN):
             logging.warning(f"Action {proposed_action} not allowed in {environment}, defaulting to NOOP")
             final_action = Action.NOOP
             action_filtered = True
@@ -101,6 +104,15 @@ class RLDecisionBrain:
         logging.info(f"Decision made: {environment.value} -> {final_action.value}")
         return decision
     
+    @property
+    def allowed_actions(self) -> Dict[Environment, List[Action]]:
+        """Allowed actions per environment, from the shared policy."""
+        return {
+            env: [Action(name) for name in self.policy.allowed_actions(env.value, SOURCE_RL_BRAIN)
+                  if name in Action._value2member_map_]
+            for env in Environment
+        }
+    
     def get_system_status(self) -> Dict:
         """Return current system configuration for demo visibility"""
         return {
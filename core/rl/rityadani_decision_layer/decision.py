@@ -6,19 +6,23 @@ No learning or exploration occurs here.
 
 import json
 import logging
+import os
+import sys
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+from core.action_policy import get_action_policy, SOURCE_RL_BRAIN
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Action scope per environment
-ALLOWED_ACTIONS = {
-    'dev': ['noop', 'scale_up', 'scale_down', 'restart'],
-    'stage': ['noop', 'scale_up', 'scale_down'],
-    'prod': ['noop', 'restart']
-}
+# Action scope per environment (core/action_policy.json, source "rl_brain");
+# enforcement consults the policy directly so reloads take effect
+ALLOWED_ACTIONS = get_action_policy().allowlists(SOURCE_RL_BRAIN)
 
 # Signal tiers
 REQUIRED_SIGNALS = ['app', 'env', 'state']
@@ -74,8 +78,7 @@ class MockOrchestratorIntegration:
     
     def _is_action_safe_for_env(self, action: str, env: str) -> bool:
         """Final safety validation as would be done by orchestrator."""
-        allowed_actions = ALLOWED_ACTIONS.get(env, [])
-        return action in allowed_actions
+        return get_action_policy().is_allowed(action, env, SOURCE_RL_BRAIN)
     
     def _mock_execute_action(self, action: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Mock action execution."""
@@ -217,7 +220,7 @@ class RLDecisionLayer:
         action = self._decide_action(env, state, runtime_signals)
 
         # Enforce action scope
-        if action not in ALLOWED_ACTIONS.get(env, []):
+        if not get_action_policy().is_allowed(action, env, SOURCE_RL_BRAIN):
             logger.info(f"Downgrading unsafe action '{action}' to 'noop' for env '{env}'")
             action = 'noop'
 
@@ -357,7 +360,7 @@ if __name__ == "__main__":
     
     for i, scenario in enumerate(unsafe_scenarios):
         decision = rl.make_decision(scenario)
-        action_allowed = decision['action'] in ALLOWED_ACTIONS.get(scenario['env'], [])
+        action_allowed = get_action_policy().is_allowed(decision['action'], scenario['env'], SOURCE_RL_BRAIN)
         print(f"Safety Test {i+1}: Input={scenario} -> Action={decision['action']} (Allowed: {action_allowed})")
         if not action_allowed and decision['action'] == 'noop':
             print("Safety guard working: Unsafe action downgraded to NOOP")
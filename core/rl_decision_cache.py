@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+RL Decision Cache
+Bounded LRU of RL brain responses keyed on the adapted RL request.
+
+The brain is deterministic (identical input -> identical output), and most
+runtime events are repeats of a few states, so a repeat state is answered
+from memory. Numeric fields are bucketed before keying so that, e.g.,
+latencies of 812ms and 838ms share an entry; bucket widths should stay well
+below the brain's own decision thresholds.
+
+Entries are fresh for ``ttl`` seconds. For a further ``stale_ttl`` seconds
+they are still served immediately while one background refresh replaces
+them (stale-while-revalidate).
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# Bucket widths for the numeric fields of the adapted RL request
+DEFAULT_BUCKET_WIDTHS = {
+    'latency_ms': 50.0,
+}
+
+CACHE_HIT = 'hit'
+CACHE_STALE = 'stale'
+CACHE_MISS = 'miss'
+CACHE_BYPASS = 'bypass'
+
+
+class RLDecisionCache:
+    """LRU decision cache with TTL and stale-while-revalidate."""
+
+    def __init__(self, max_size: int = 256, ttl: float = 30.0, stale_ttl: float = 300.0,
+                 bucket_widths: Optional[Dict[str, float]] = None,
+                 should_cache: Callable[[Dict[str, Any]], bool] = lambda response: True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.bucket_widths = DEFAULT_BUCKET_WIDTHS if bucket_widths is None else bucket_widths
+        self.should_cache = should_cache
+        self.clock = clock
+        # key -> (stored_at, response), least recently used first
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._refreshing = set()
+        self._pending: List = []
+        self._lock = threading.Lock()
+        self._executor = None
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+
+    def key_for(self, rl_request: Dict[str, Any]) -> Tuple:
+        """Normalized cache key: sorted fields, numeric ones bucketed."""
+        parts = []
+        for field in sorted(rl_request):
+            value = rl_request[field]
+            width = self.bucket_widths.get(field)
+            if width and isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = int(value // width)
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value, sort_keys=True, default=str)
+            parts.append((field, value))
+        return tuple(parts)
+
+    def get_or_compute(self, rl_request: Dict[str, Any],
+                       compute: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """
+        Cached response for rl_request, computing it on a miss.
+
+        Callers get their own shallow copy, so annotating it does not
+        change the cached entry.
+
+        Returns:
+            (response, status) with status one of hit, stale, miss or bypass
+        """
+        if self.max_size <= 0:
+            return compute(rl_request), CACHE_BYPASS
+
+        key = self.key_for(rl_request)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[1]), CACHE_HIT
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    self._schedule_refresh(key, rl_request, compute)
+                    return dict(entry[1]), CACHE_STALE
+                del self._entries[key]
+            self.misses += 1
+
+        response = compute(rl_request)
+        self._store(key, response)
+        return response, CACHE_MISS
+
+    def _store(self, key: Tuple, response: Dict[str, Any]) -> bool:
+        if not self.should_cache(response):
+            return False
+        with self._lock:
+            self._entries[key] = (self.clock(), dict(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def _schedule_refresh(self, key: Tuple, rl_request: Dict[str, Any], compute: Callable):
+        """Start one background refresh per key (caller holds the lock)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='rl-cache-refresh')
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(self._executor.submit(self._refresh, key, dict(rl_request), compute))
+
+    def _refresh(self, key: Tuple, rl_request: Dict[str, Any], compute: Callable):
+        try:
+            # A response that is not cacheable (e.g. a fallback) leaves the stale entry in place
+            stored = self._store(key, compute(rl_request))
+        except Exception as e:
+            print(f"RL decision cache refresh failed: {e}")
+            stored = False
+        with self._lock:
+            self._refreshing.discard(key)
+            if stored:
+                self.refreshes += 1
+            else:
+                self.refresh_failures += 1
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None):
+        """Block until background refreshes started so far have finished."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result(timeout=timeout)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'stale_ttl': self.stale_ttl,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'refreshing': len(self._refreshing),
+                'evictions': self.evictions
+            }
@@ -1,18 +1,51 @@
 """
 RL Decision Layer - Autonomous action selection for CI/CD events
+
+Q-value updates are applied in memory and persisted by a background
+checkpointer, every ``checkpoint_every`` updates or ``checkpoint_interval``
+seconds after the first unsaved update, whichever comes first, and on
+close() / interpreter exit. Each write goes to a temp file that is renamed
+over the table, so a crash never leaves a truncated file.
 """
 
+import atexit
+import copy
 import json
 import random
 import os
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List, Tuple
+
+# Initial Q-values used when no table has been saved yet
+DEFAULT_Q_TABLE = {
+    'crash': {'restart': 0.8, 'noop': 0.1},
+    'overload': {'scale_up': 0.7, 'noop': 0.3},
+    'false_alarm': {'noop': 0.9},
+    'latency': {'restart': 0.6, 'scale_up': 0.4},
+    'memory_leak': {'restart': 0.9}
+}
 
 class RLDecisionLayer:
-    def __init__(self, env='dev'):
+    def __init__(self, env='dev', checkpoint_every: int = 100, checkpoint_interval: float = 5.0):
         self.env = env
         self.q_table_path = f"logs/{env}/rl_q_table.json"
         self.q_table = self.load_q_table()
         
+        # Checkpointing
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints_written = 0
+        self._version = 0  # total updates applied
+        self._written_version = 0
+        self._dirty_updates = 0
+        self._first_dirty_at = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._checkpoint_cond = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._checkpointer_thread = None
+        
         # Action mappings for different failure types
         self.action_map = {
             'crash': ['restart', 'noop'],
@@ -32,19 +65,92 @@ class RLDecisionLayer:
                 pass
         
         # Initialize with default values
+        return copy.deepcopy(DEFAULT_Q_TABLE)
+    
+    def save_q_table(self):
+        """Save Q-table to file now (atomic: temp file plus rename)"""
+        with self._lock:
+            snapshot = json.dumps(self.q_table, indent=2)
+            version = self._version
+            self._dirty_updates = 0
+            self._first_dirty_at = None
+        self._write_snapshot(snapshot, version)
+    
+    def flush(self):
+        """Save the Q-table if it has unsaved updates"""
+        if self._dirty_updates:
+            self.save_q_table()
+    
+    def close(self):
+        """Stop the background checkpointer and save any unsaved updates"""
+        with self._checkpoint_cond:
+            self._closed = True
+            self._checkpoint_cond.notify()
+        thread = self._checkpointer_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+    
+    def get_checkpoint_stats(self) -> Dict[str, Any]:
+        """Unsaved update count and checkpoint settings"""
         return {
-            'crash': {'restart': 0.8, 'noop': 0.1},
-            'overload': {'scale_up': 0.7, 'noop': 0.3},
-            'false_alarm': {'noop': 0.9},
-            'latency': {'restart': 0.6, 'scale_up': 0.4},
-            'memory_leak': {'restart': 0.9}
+            'dirty_updates': self._dirty_updates,
+            'checkpoints_written': self.checkpoints_written,
+            'checkpoint_every': self.checkpoint_every,
+            'checkpoint_interval': self.checkpoint_interval
         }
     
-    def save_q_table(self):
-        """Save Q-table to file"""
-        os.makedirs(os.path.dirname(self.q_table_path), exist_ok=True)
-        with open(self.q_table_path, 'w') as f:
-            json.dump(self.q_table, f, indent=2)
+    def _write_snapshot(self, snapshot: str, version: int):
+        directory = os.path.dirname(self.q_table_path)
+        os.makedirs(directory, exist_ok=True)
+        with self._write_lock:
+            if version < self._written_version:
+                return  # a newer snapshot is already on disk
+            tmp_path = f"{self.q_table_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.q_table_path)
+            self._written_version = version
+            self.checkpoints_written += 1
+    
+    def _start_checkpointer(self):
+        """Start the background checkpointer (caller holds the lock)"""
+        if self._checkpointer_thread is not None or self._closed:
+            return
+        self._checkpointer_thread = threading.Thread(target=self._checkpoint_loop, daemon=True)
+        self._checkpointer_thread.start()
+        atexit.register(self.close)
+    
+    def _checkpoint_loop(self):
+        """Persist unsaved updates once enough accumulate or the interval passes"""
+        while True:
+            with self._checkpoint_cond:
+                while True:
+                    if self._closed:
+                        return
+                    if not self._dirty_updates:
+                        self._checkpoint_cond.wait()
+                        continue
+                    if self._dirty_updates >= self.checkpoint_every:
+                        break
+                    remaining = self._first_dirty_at + self.checkpoint_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._checkpoint_cond.wait(remaining)
+                snapshot = json.dumps(self.q_table, indent=2)
+                version = self._version
+                self._dirty_updates = 0
+                self._first_dirty_at = None
+            try:
+                self._write_snapshot(snapshot, version)
+            except OSError as e:
+                print(f"RL Q-table checkpoint failed: {e}")
+                with self._checkpoint_cond:
+                    # Keep the table marked dirty so the next checkpoint retries
+                    self._dirty_updates = max(self._dirty_updates, 1)
+                    self._first_dirty_at = self._first_dirty_at or time.monotonic()
     
     def choose_action(self, state: str) -> str:
         """Choose best action for given state"""
@@ -84,15 +190,35 @@ class RLDecisionLayer:
             return 0  # Safe default: noop
     
     def update_q_value(self, state: str, action: str, reward: float, learning_rate: float = 0.1):
-        """Update Q-value based on reward"""
-        if state not in self.q_table:
-            self.q_table[state] = {}
-        
-        if action not in self.q_table[state]:
-            self.q_table[state][action] = 0.0
-        
-        # Q-learning update rule
-        old_value = self.q_table[state][action]
-        self.q_table[state][action] = old_value + learning_rate * (reward - old_value)
+        """Update Q-value based on reward (persisted at the next checkpoint)"""
+        self.update_q_values([(state, action, reward)], learning_rate)
+    
+    def update_q_values(self, experiences: List[Tuple[str, str, float]], learning_rate: float = 0.1):
+        """Apply (state, action, reward) updates in order, under one lock acquisition"""
+        if not experiences:
+            return
+        with self._checkpoint_cond:
+            for state, action, reward in experiences:
+                if state not in self.q_table:
+                    self.q_table[state] = {}
+                
+                if action not in self.q_table[state]:
+                    self.q_table[state][action] = 0.0
+                
+                # Q-learning update rule
+                old_value = self.q_table[state][action]
+                self.q_table[state][action] = old_value + learning_rate * (reward - old_value)
+            
+            self._version += len(experiences)
+            self._dirty_updates += len(experiences)
+            if self._first_dirty_at is None:
+                self._first_dirty_at = time.monotonic()
+            closed = self._closed
+            if not closed:
+                self._start_checkpointer()
+                if self._dirty_updates == len(experiences) or self._dirty_updates >= self.checkpoint_every:
+                    self._checkpoint_cond.notify()
         
-        self.save_q_table()
\ No newline at end of file
+        if closed:
+            # No checkpointer after close(): persist directly
+            self.save_q_table()
\ No newline at end of file
@@ -7,6 +7,8 @@ import datetime
 import json
 import os
 from typing import Dict, Any, List, Optional
+from core.action_policy import get_action_policy, SOURCE_SAFE_ORCHESTRATOR
+from core.reward_attribution import get_reward_engine
 
 def get_safe_executor(env='dev'):
     """Get safe executor instance"""
@@ -23,12 +25,11 @@ class SafeOrchestrator:
             'rollback': self._rollback_deployment
         }
         
-        # Environment-specific safety rules
-        self.safety_rules = {
-            'prod': ['noop'],  # Production only allows noop for safety
-            'stage': ['restart', 'noop'],  # Stage allows restart and noop
-            'dev': ['restart', 'scale_up', 'noop', 'scale_down']  # Dev allows most actions
-        }
+        # Environment-specific safety rules (core/action_policy.json)
+        self.policy = get_action_policy()
+        
+        # Executed actions are rewarded later from observed health (RL_REWARD_HORIZON)
+        self.reward_engine = get_reward_engine(env)
         
         # Load DEMO_MODE configuration
         try:
@@ -41,8 +42,7 @@ class SafeOrchestrator:
     
     def is_action_safe(self, action: str) -> bool:
         """Check if action is safe for current environment"""
-        allowed_actions = self.safety_rules.get(self.env, ['noop'])
-        return action in allowed_actions
+        return self.policy.is_allowed(action, self.env, SOURCE_SAFE_ORCHESTRATOR)
     
     def execute_safe_action(self, action: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute action if safe, otherwise default to noop"""
@@ -288,6 +288,14 @@ class SafeOrchestrator:
                 'source': source
             })
             
+            if self.reward_engine is not None:
+                # Callers pass app_name (governance requires it); event_type is the Q-table state
+                self.reward_engine.record_action(
+                    context.get('app_name') or context.get('app', 'unknown'),
+                    context.get('event_type', 'unknown'),
+                    action
+                )
+            
             write_proof(ProofEvents.SYSTEM_STABLE, {
                 'env': self.env,
                 'recovery_action': action,
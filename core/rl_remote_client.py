@@ -2,23 +2,85 @@
 """
 RL Remote Client
 Handles HTTP communication with the remote RL decision service.
+
+Calls go through one pooled keep-alive session, so steady-state decisions
+reuse an open connection instead of paying a TCP+TLS handshake each time.
+
+With a hedge delay set, decide() is latency-budgeted: if the remote brain
+has not answered within the hedge delay (or the circuit breaker is open),
+the in-process frozen brain answers instead. Every decision is tagged with
+the path that answered it (decision_path: remote, local or fallback).
+
+At most pool_size remote calls are in flight for hedging; once they are all
+busy, decisions go straight to the local brain. Local answers carry
+LOCAL_CONFIDENCE: above SelfRestraint's default 0.6 minimum, so they can act,
+but below the arbitrator's 0.7 RL threshold, so the rule engine wins when
+the two disagree.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, List, Optional
+
+LATENCY_SAMPLES = 512
+
+# Which path answered a decision
+PATH_REMOTE = "remote"
+PATH_LOCAL = "local"
+PATH_FALLBACK = "fallback"
+
+FALLBACK_SOURCE = "remote_client_fallback"
+LOCAL_SOURCE = "local_rl_brain"
+LOCAL_CONFIDENCE = 0.65
 
 class RLRemoteClient:
     """Client for the remote RL Decision Brain service."""
     
     DEFAULT_URL = "https://rl-autonomous-decision-brain-py-3.onrender.com/decide"
     
-    def __init__(self, url: Optional[str] = None, timeout: float = 2.0):
+    BATCH_SUFFIX = "/batch"
+    
+    def __init__(self, url: Optional[str] = None, timeout: float = 2.0, pool_size: int = 10,
+                 hedge_delay: Optional[float] = None, latency_budget: Optional[float] = None,
+                 local_brain=None):
+        """
+        Args:
+            hedge_delay: Seconds to wait for the remote brain before asking the
+                local one; None disables hedging
+            latency_budget: Upper bound on a hedged decision (defaults to timeout)
+            local_brain: In-process brain with decide(request); defaults to
+                agents.decision.rl_brain.engine.RLDecisionBrain
+        """
         self.url = url or self.DEFAULT_URL
         self.timeout = timeout
+        self.pool_size = pool_size
         self.logger = logging.getLogger("RLRemoteClient")
+        self.session = self._create_session(pool_size)
+        
+        # Hedging
+        self.hedge_delay = hedge_delay
+        self.latency_budget = latency_budget if latency_budget is not None else timeout
+        self._local_brain = local_brain
+        self._hedge_executor = None
+        self._hedge_slots = threading.BoundedSemaphore(pool_size)
+        
+        # None until the first decide_many call tells us whether the server has a batch endpoint
+        self.batch_supported: Optional[bool] = None
+        
+        # Metrics
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._requests = 0
+        self._batch_requests = 0
+        self._fallbacks = 0
+        self._decision_latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._paths = {PATH_REMOTE: 0, PATH_LOCAL: 0, PATH_FALLBACK: 0}
         
         # Simple circuit breaker state
         self._consecutive_failures = 0
@@ -34,34 +96,103 @@ class RLRemoteClient:
             state_dict: The adapted state following RL schema
             
         Returns:
-            RL decision dictionary or fallback
+            RL decision dictionary or fallback, tagged with decision_path
         """
+        started = time.perf_counter()
+        if self.hedge_delay is None:
+            response = self._decide_remote(state_dict)
+        else:
+            response = self._decide_hedged(state_dict)
+        
+        path = response.setdefault("decision_path", PATH_REMOTE)
+        with self._metrics_lock:
+            self._paths[path] += 1
+            self._decision_latencies.append((time.perf_counter() - started) * 1000)
+        return response
+
+    def _decide_hedged(self, state_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Race the remote brain against the local one within the latency budget."""
+        started = time.perf_counter()
+        if self._circuit_open():
+            local = self._decide_local(state_dict, "circuit_breaker_active")
+            return local if local is not None else self._decide_remote(state_dict)
+        
+        # Every hedge worker is still busy with an earlier remote call
+        if not self._hedge_slots.acquire(blocking=False):
+            local = self._decide_local(state_dict, "hedge_saturated")
+            return local if local is not None else self._fallback_response("Hedge pool saturated")
+        
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                      thread_name_prefix='rl-hedge')
+        future = self._hedge_executor.submit(self._decide_remote, state_dict)
+        # Also runs if the future is cancelled before it starts
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        
+        # Prefer the remote answer if it arrives within the hedge delay
+        try:
+            remote = future.result(timeout=self.hedge_delay)
+            if remote.get("source") != FALLBACK_SOURCE:
+                return remote
+            hedge_reason = "remote_failed"
+        except FutureTimeout:
+            hedge_reason = "remote_slow"
+        
+        local = self._decide_local(state_dict, hedge_reason)
+        if local is not None:
+            future.cancel()
+            return local
+        
+        # Local brain unavailable: wait for the remote for what is left of the budget
+        remaining = self.latency_budget - (time.perf_counter() - started)
+        try:
+            return future.result(timeout=max(0.0, remaining))
+        except FutureTimeout:
+            return self._fallback_response("Latency budget exceeded")
+
+    def _decide_local(self, state_dict: Dict[str, Any], hedge_reason: str) -> Optional[Dict[str, Any]]:
+        """Decision from the in-process brain, or None if it is unavailable."""
+        try:
+            if self._local_brain is None:
+                from agents.decision.rl_brain.engine import RLDecisionBrain
+                self._local_brain = RLDecisionBrain()
+            response = self._local_brain.decide({
+                "environment": state_dict.get("env", "dev"),
+                "event_type": state_dict.get("event_type", "unknown"),
+                "metrics": {
+                    "latency_ms": state_dict.get("latency_ms", 0.0),
+                    "errors_last_min": state_dict.get("errors_last_min", 0),
+                    "workers": state_dict.get("workers", 0)
+                }
+            })
+        except Exception as e:
+            self.logger.error(f"RL Remote Client: Local brain failed: {str(e)}")
+            return None
+        if not isinstance(response, dict) or "action" not in response:
+            return None
+        
+        response = dict(response)
+        response["source"] = LOCAL_SOURCE
+        response["decision_path"] = PATH_LOCAL
+        response["hedge_reason"] = hedge_reason
+        response["confidence"] = min(float(response.get("confidence", LOCAL_CONFIDENCE)), LOCAL_CONFIDENCE)
+        return response
+
+    def _decide_remote(self, state_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Single remote decision with circuit breaker and fallback."""
         # 1. Check Circuit Breaker
-        if self._consecutive_failures >= self._max_failures:
-            if time.time() - self._last_failure_time < self._cooldown_period:
-                self.logger.warning("RL Remote Client: Circuit breaker active. Skipping remote call.")
-                return self._fallback_response("Circuit breaker active (RL Service Unavailable)")
-            else:
-                # Reset after cooldown
-                self._consecutive_failures = 0
+        if self._circuit_open():
+            self.logger.warning("RL Remote Client: Circuit breaker active. Skipping remote call.")
+            return self._fallback_response("Circuit breaker active (RL Service Unavailable)")
 
         # 2. Prepare Request
         try:
             headers = {'Content-Type': 'application/json'}
             
-            # Use /decide endpoint if not already in URL
-            request_url = self.url
-            if not request_url.endswith('/decide'):
-                request_url = request_url.rstrip('/') + '/decide'
-
+            request_url = self.decide_url
             self.logger.info(f"RL Remote Client: Calling {request_url}")
             
-            response = requests.post(
-                request_url,
-                json=state_dict,
-                headers=headers,
-                timeout=self.timeout
-            )
+            response = self._post(request_url, state_dict, headers)
             
             # 3. Handle Response
             if response.status_code == 200:
@@ -74,7 +205,7 @@ class RLRemoteClient:
 
         except requests.exceptions.Timeout:
             self._track_failure()
-            self.logger.error("RL Remote Client: Request timed out (2s threshold)")
+            self.logger.error(f"RL Remote Client: Request timed out ({self.timeout}s threshold)")
             return self._fallback_response("Request timed out")
         except requests.exceptions.RequestException as e:
             self._track_failure()
@@ -85,11 +216,73 @@ class RLRemoteClient:
             self.logger.error(f"RL Remote Client: Unexpected error: {str(e)}")
             return self._fallback_response(f"Unexpected error: {str(e)}")
 
+    def decide_many(self, states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Get decisions for several states, in order.
+        
+        Sends one request to the batch endpoint when the server has one;
+        otherwise (or once it has answered 404/405) falls back to
+        concurrent single decide calls over the pooled session.
+        """
+        if not states:
+            return []
+        if self._circuit_open():
+            return [self._fallback_response("Circuit breaker active (RL Service Unavailable)")
+                    for _ in states]
+        
+        if self.batch_supported is not False:
+            results = self._decide_batch(states)
+            if results is not None:
+                return results
+        
+        workers = min(self.pool_size, len(states))
+        if workers == 1:
+            return [self.decide(states[0])]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.decide, states))
+
+    def _decide_batch(self, states: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """One batched call; None means fall back to single calls."""
+        request_url = self.decide_url + self.BATCH_SUFFIX
+        try:
+            response = self._post(request_url, {"states": states}, {'Content-Type': 'application/json'})
+        except requests.exceptions.RequestException as e:
+            self._track_failure()
+            self.logger.error(f"RL Remote Client: Batch call failed: {str(e)}")
+            return [self._fallback_response(f"Connection error: {str(e)}") for _ in states]
+        
+        if response.status_code in (404, 405):
+            self.logger.info("RL Remote Client: No batch endpoint, using concurrent single calls")
+            self.batch_supported = False
+            return None
+        if response.status_code != 200:
+            self._track_failure()
+            self.logger.error(f"RL Remote Client: Batch call returned error {response.status_code}")
+            return [self._fallback_response(f"HTTP Error {response.status_code}") for _ in states]
+        
+        try:
+            results = response.json().get("results")
+        except (ValueError, AttributeError):
+            results = None
+        if not isinstance(results, list) or len(results) != len(states):
+            self.logger.warning("RL Remote Client: Unrecognised batch response, using single calls")
+            self.batch_supported = False
+            return None
+        
+        self.batch_supported = True
+        self._consecutive_failures = 0
+        for result in results:
+            if isinstance(result, dict):
+                result.setdefault("decision_path", PATH_REMOTE)
+        with self._metrics_lock:
+            self._batch_requests += 1
+        return results
+
     def get_scope(self) -> Dict[str, Any]:
         """Fetch the allowed action scope from remote service."""
         try:
             request_url = self.url.replace('/decide', '/scope')
-            response = requests.get(request_url, timeout=self.timeout)
+            response = self.session.get(request_url, timeout=self.timeout)
             if response.status_code == 200:
                 return response.json()
             return {"error": f"HTTP {response.status_code}", "scope": {}}
@@ -100,22 +293,113 @@ class RLRemoteClient:
         """Check health of the remote RL service."""
         try:
             request_url = self.url.replace('/decide', '/health')
-            response = requests.get(request_url, timeout=self.timeout)
+            response = self.session.get(request_url, timeout=self.timeout)
             if response.status_code == 200:
                 return response.json()
             return {"status": "error", "message": f"HTTP {response.status_code}"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """Connection reuse, latency and decision path metrics."""
+        with self._metrics_lock:
+            latencies = sorted(self._latencies)
+            decision_latencies = sorted(self._decision_latencies)
+            requests_sent = self._requests
+            metrics = {
+                "requests": requests_sent,
+                "batch_requests": self._batch_requests,
+                "fallbacks": self._fallbacks,
+                "pool_size": self.pool_size,
+                "hedge_delay": self.hedge_delay,
+                "decision_paths": dict(self._paths)
+            }
+        
+        connections = 0
+        # http:// and https:// share one adapter
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+        
+        metrics["connections_opened"] = connections
+        metrics["connection_reuse_ratio"] = (
+            round(1 - connections / requests_sent, 4) if requests_sent else 0.0
+        )
+        if latencies:
+            metrics["latency_ms"] = self._summarize(latencies)
+        if decision_latencies:
+            metrics["decision_latency_ms"] = self._summarize(decision_latencies)
+        return metrics
+
+    @staticmethod
+    def _summarize(samples: List[float]) -> Dict[str, float]:
+        """avg/p50/p95/p99/max of sorted latency samples."""
+        last = len(samples) - 1
+        return {
+            "avg": round(sum(samples) / len(samples), 2),
+            "p50": round(samples[len(samples) // 2], 2),
+            "p95": round(samples[min(last, int(len(samples) * 0.95))], 2),
+            "p99": round(samples[min(last, int(len(samples) * 0.99))], 2),
+            "max": round(samples[-1], 2)
+        }
+
+    def close(self):
+        """Close pooled connections and the hedge pool."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+    @property
+    def decide_url(self) -> str:
+        """The /decide endpoint, whether or not url already ends with it."""
+        if self.url.endswith('/decide'):
+            return self.url
+        return self.url.rstrip('/') + '/decide'
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        # Retries stay off: a retry would silently stretch the decision deadline
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive'})
+        return session
+
+    def _post(self, url: str, payload: Any, headers: Dict[str, str]) -> requests.Response:
+        """POST over the pooled session, recording latency of answered calls."""
+        with self._metrics_lock:
+            self._requests += 1
+        started = time.perf_counter()
+        response = self.session.post(url, json=payload, headers=headers, timeout=self.timeout)
+        with self._metrics_lock:
+            self._latencies.append((time.perf_counter() - started) * 1000)
+        return response
+
+    def _circuit_open(self) -> bool:
+        if self._consecutive_failures >= self._max_failures:
+            if time.time() - self._last_failure_time < self._cooldown_period:
+                return True
+            # Reset after cooldown
+            self._consecutive_failures = 0
+        return False
+
     def _track_failure(self):
         self._consecutive_failures += 1
         self._last_failure_time = time.time()
 
     def _fallback_response(self, reason: str) -> Dict[str, Any]:
         """Return a safe NOOP fallback when remote RL fails."""
+        with self._metrics_lock:
+            self._fallbacks += 1
         return {
             "action": "noop",
             "confidence": 0.0,
             "reason": f"Fallback: {reason}",
-            "source": "remote_client_fallback"
+            "source": FALLBACK_SOURCE,
+            "decision_path": PATH_FALLBACK
         }
@@ -83,12 +83,13 @@ class RuntimeEventEmissionLock:
             from core.redis_demo_behavior import get_redis_bus_demo_safe
             redis_bus = get_redis_bus_demo_safe(env, use_stub=True)
             
-            # Publish to specific event channel
+            # Publish to specific event channel and general runtime channel
+            # in a single round trip
             channel = f"runtime.{event_type}"
-            redis_bus.publish(channel, event_data)
-            
-            # Also publish to general runtime channel
-            redis_bus.publish("runtime.all", event_data)
+            redis_bus.publish_many([
+                (channel, event_data),
+                ("runtime.all", event_data)
+            ])
             
         except Exception as e:
             # Re-raise with context
@@ -4,17 +4,43 @@ Runtime → RL Direct Pipe
 Pipes normalized runtime JSON to Ritesh's RL layer unchanged and live
 """
 
-from core.rl_remote_client import RLRemoteClient
+import os
+from typing import Dict, Any, Optional
+from core.rl_remote_client import RLRemoteClient, FALLBACK_SOURCE, PATH_REMOTE
+from core.rl_decision_cache import RLDecisionCache
 from core.state_adapter import StateAdapter
+from core.reward_attribution import get_reward_engine
 
 class RuntimeRLPipe:
     """Direct pipe from runtime events to the remote RL Decision Brain."""
     
-    def __init__(self, env='dev'):
+    def __init__(self, env='dev', cache_size: int = 256, cache_ttl: float = 30.0,
+                 stale_ttl: float = 300.0, hedge_delay: Optional[float] = None):
         self.env = env
-        # Use the remote RL client
-        self.rl_brain = RLRemoteClient()
+        # Use the remote RL client; RL_HEDGE_DELAY (seconds) enables hedging with the local brain
+        if hedge_delay is None and os.getenv('RL_HEDGE_DELAY'):
+            hedge_delay = float(os.getenv('RL_HEDGE_DELAY'))
+        self.rl_brain = RLRemoteClient(hedge_delay=hedge_delay)
         self.state_adapter = StateAdapter(env)
+        # Repeat states are answered from cache; only remote answers are cached,
+        # so a fallback or local stand-in is not remembered as the brain's decision
+        self.decision_cache = RLDecisionCache(
+            max_size=cache_size,
+            ttl=cache_ttl,
+            stale_ttl=stale_ttl,
+            should_cache=lambda response: response.get("decision_path", PATH_REMOTE) == PATH_REMOTE
+        )
+        # Runtime payloads double as health observations for reward attribution
+        self.reward_engine = get_reward_engine(env)
+    
+    def _observe(self, payload: Dict[str, Any]):
+        """Record the app state of a validated payload for delayed rewards."""
+        if self.reward_engine is not None:
+            self.reward_engine.record_observation(payload.get('app', 'unknown'), payload.get('state'))
+    
+    def _decide(self, rl_request: Dict[str, Any]):
+        """RL brain decision for rl_request, through the decision cache."""
+        return self.decision_cache.get_or_compute(rl_request, self.rl_brain.decide)
         
     def get_decision(self, event_data: dict, agent_state: str = "unknown", memory_context: dict = None) -> dict:
         """
@@ -28,6 +54,8 @@ class RuntimeRLPipe:
         if not is_valid:
             return {'action': 'noop', 'confidence': 1.0, 'reason': error_msg}
             
+        self._observe(validated_payload)
+        
         # Adapt Agent State -> RL State
         rl_request = self.state_adapter.adapt_state(
             event=validated_payload,
@@ -36,12 +64,12 @@ class RuntimeRLPipe:
         )
 
         # Get RL decision
-        decision_response = self.rl_brain.decide(rl_request)
+        decision_response, cache_status = self._decide(rl_request)
         action_str = decision_response.get("action", "noop")
         source = decision_response.get("source", "rl_brain")
         
         # PROOF: Explicitly log if we hit a fallback (No Silent Failures)
-        if source == "remote_client_fallback":
+        if source == FALLBACK_SOURCE:
             from core.proof_logger import write_proof, ProofEvents
             write_proof(ProofEvents.RL_DECISION, {
                 "env": self.env,
@@ -56,6 +84,8 @@ class RuntimeRLPipe:
             "confidence": decision_response.get("confidence", 0.8), 
             "brain_response": decision_response,
             "source": "rl_brain",
+            "cache_status": cache_status,
+            "decision_path": decision_response.get("decision_path"),
             "rl_state_vector": self.state_adapter.to_vector(rl_request) # Feature logging
         }
 
@@ -77,6 +107,8 @@ class RuntimeRLPipe:
                 'validation_error': error_msg
             }
         
+        self._observe(validated_payload)
+        
         # Structured proof logging - RL_CONSUME
         write_proof(ProofEvents.RL_CONSUME, {
             'env': self.env,
@@ -97,7 +129,7 @@ class RuntimeRLPipe:
         )
 
         # Get RL decision
-        decision_response = self.rl_brain.decide(rl_request)
+        decision_response, _ = self._decide(rl_request)
 
         
         # Map action string to integer for compatibility with existing orchestrator logic
@@ -9,8 +9,9 @@ The agent can block itself based on:
 """
 
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from enum import Enum
+from core.batch_result import BatchResult
 
 
 class BlockReason(Enum):
@@ -113,6 +114,49 @@ class SelfRestraint:
         # No blocking conditions met
         return BlockDecision(should_block=False)
     
+    def check_many(
+        self,
+        candidates: Sequence[Tuple],
+        memory_signals: Optional[Dict[str, Any]] = None,
+        health_signals: Optional[Dict[str, Any]] = None
+    ) -> BatchResult:
+        """Evaluate many candidates against shared signals.
+        
+        Equivalent to calling evaluate_block once per candidate with
+        decision_data={'confidence': confidence}: the signal rules are
+        evaluated once for the whole batch, then confidence per candidate.
+        
+        Args:
+            candidates: (app_name, action[, confidence]) tuples; confidence
+                defaults to 1.0
+            memory_signals: Memory context signals
+            health_signals: Health monitoring signals
+            
+        Returns:
+            BatchResult with per-candidate blocked flags and reasons
+        """
+        count = len(candidates)
+        
+        shared_block = None
+        if health_signals:
+            shared_block = self._check_conflicting_signals(health_signals)
+        if (shared_block is None or not shared_block.should_block) and memory_signals:
+            shared_block = self._check_memory_risk(memory_signals)
+        if shared_block is not None and shared_block.should_block:
+            return BatchResult([True] * count, [shared_block.reason] * count,
+                               lambda i: shared_block.details, BlockDecision)
+        
+        threshold = self.min_confidence
+        confidences = [candidate[2] if len(candidate) > 2 else 1.0 for candidate in candidates]
+        blocked = [confidence < threshold for confidence in confidences]
+        low_confidence = BlockReason.LOW_CONFIDENCE.value
+        reasons: List[Optional[str]] = [low_confidence if is_blocked else None for is_blocked in blocked]
+        
+        def explain(i: int) -> Dict[str, Any]:
+            return {'confidence': confidences[i], 'threshold': threshold}
+        
+        return BatchResult(blocked, reasons, explain, BlockDecision)
+    
     def _check_conflicting_signals(self, health_signals: Dict[str, Any]) -> BlockDecision:
         """Check for conflicting health signals.
         
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Bus Transport
+Single-producer / multi-consumer ring buffer in multiprocessing.shared_memory
+for co-located agent processes, with the same publish/subscribe interface as
+RedisEventBus.
+"""
+
+import struct
+import time
+import datetime
+import threading
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, List, Callable, Any, Iterator, Optional
+from core.dispatch_table import DispatchTable
+from core.bus_codec import get_codec, encode_message, decode_message
+
+# Header: magic, version, capacity, write position, reserve position
+# (both monotonic byte offsets)
+_HEADER = struct.Struct('<4sIQQQ')
+_HEADER_SIZE = 64
+_MAGIC = b'SHMB'
+_VERSION = 2
+_WRITE_POS_OFFSET = 16
+_RESERVE_POS_OFFSET = 24
+_POS = struct.Struct('<Q')
+_LEN = struct.Struct('<I')
+_PAD = 0xFFFFFFFF  # Length marker: skip to the start of the ring
+
+
+class RingOverrunError(Exception):
+    """Raised when a frame is larger than the ring can hold."""
+    pass
+
+
+class SharedMemoryRing:
+    """Ring of length-prefixed frames in a named shared-memory block.
+
+    The producer never waits for consumers. Each consumer keeps its own
+    cursor and detects when the producer has lapped it, skipping ahead and
+    counting the lost frames.
+
+    Writes are seqlock-style: the producer publishes reserve_pos (the end
+    of the frame it is about to write) before copying any bytes and
+    write_pos once they are in place. Readers check a frame against
+    reserve_pos, so a frame the producer has started to overwrite is
+    rejected even before the overwrite is committed.
+    """
+
+    def __init__(self, name: str, capacity: int = 4 * 1024 * 1024, create: bool = False):
+        self.name = name
+        self.owner = create
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity)
+            _HEADER.pack_into(self.shm.buf, 0, _MAGIC, _VERSION, capacity, 0, 0)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Only the creator may unlink the block; stop this process's
+            # resource tracker from removing it on exit
+            try:
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+            except Exception:
+                pass
+            magic, version, capacity, _, _ = _HEADER.unpack_from(self.shm.buf, 0)
+            if magic != _MAGIC or version != _VERSION:
+                self.shm.close()
+                raise ValueError(f"Shared memory block {name} is not a bus ring")
+        self.capacity = capacity
+        self.buf = self.shm.buf
+
+    @property
+    def write_pos(self) -> int:
+        return _POS.unpack_from(self.buf, _WRITE_POS_OFFSET)[0]
+
+    @property
+    def reserve_pos(self) -> int:
+        """End of the region the producer has written or is writing."""
+        return _POS.unpack_from(self.buf, _RESERVE_POS_OFFSET)[0]
+
+    def write(self, payload: bytes):
+        """Append one frame. Single producer only."""
+        size = _LEN.size + len(payload)
+        if size > self.capacity:
+            raise RingOverrunError(f"Frame of {len(payload)} bytes exceeds ring capacity {self.capacity}")
+
+        pos = self.write_pos
+        offset = pos % self.capacity
+        remaining = self.capacity - offset
+        wrap = size > remaining
+        # Announce the overwritten region before touching it
+        _POS.pack_into(self.buf, _RESERVE_POS_OFFSET, pos + (remaining if wrap else 0) + size)
+        if wrap:
+            # Frame would straddle the end: mark the tail as padding and wrap
+            if remaining >= _LEN.size:
+                _LEN.pack_into(self.buf, _HEADER_SIZE + offset, _PAD)
+            pos += remaining
+            offset = 0
+
+        start = _HEADER_SIZE + offset
+        _LEN.pack_into(self.buf, start, len(payload))
+        self.buf[start + _LEN.size:start + size] = payload
+        # Publish the frame only after its bytes are in place
+        _POS.pack_into(self.buf, _WRITE_POS_OFFSET, pos + size)
+
+    def reader(self, from_start: bool = False) -> 'RingReader':
+        """Create a consumer cursor at the current write position (or oldest data)."""
+        write_pos = self.write_pos
+        # Once the ring has wrapped, the oldest byte may be mid-frame
+        start = 0 if from_start and write_pos <= self.capacity else write_pos
+        return RingReader(self, start)
+
+    def close(self):
+        """Detach; the creator also unlinks the block."""
+        self.buf = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A consumer still holds a memoryview into the ring
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class RingReader:
+    """Per-consumer cursor over a SharedMemoryRing."""
+
+    def __init__(self, ring: SharedMemoryRing, cursor: int):
+        self.ring = ring
+        self.cursor = cursor
+        self.frames_read = 0
+        self.overruns = 0
+        self._frame_pos = cursor
+
+    @property
+    def lag_bytes(self) -> int:
+        return self.ring.write_pos - self.cursor
+
+    def frame_valid(self) -> bool:
+        """Check the last yielded frame was not overwritten, even partly, while being read."""
+        if self.ring.reserve_pos - self._frame_pos > self.ring.capacity:
+            self.overruns += 1
+            return False
+        return True
+
+    def read(self, max_frames: Optional[int] = None) -> Iterator[memoryview]:
+        """Yield frames as zero-copy memoryviews.
+
+        A view is only valid until the consumer advances; decode or copy it,
+        then confirm with frame_valid(), before requesting the next frame.
+        """
+        ring = self.ring
+        capacity = ring.capacity
+        buf = ring.buf
+        read = 0
+        while max_frames is None or read < max_frames:
+            write_pos = ring.write_pos
+            if self.cursor >= write_pos:
+                return
+            if write_pos - self.cursor > capacity:
+                # Lapped by the producer: resume at the newest position
+                self.overruns += 1
+                self.cursor = write_pos
+                return
+
+            offset = self.cursor % capacity
+            remaining = capacity - offset
+            if remaining < _LEN.size:
+                self.cursor += remaining
+                continue
+            length = _LEN.unpack_from(buf, _HEADER_SIZE + offset)[0]
+            if ring.reserve_pos - self.cursor > capacity or (
+                    length != _PAD and length > remaining - _LEN.size):
+                # Torn length prefix: the producer is overwriting this region
+                self.overruns += 1
+                self.cursor = ring.write_pos
+                return
+            if length == _PAD:
+                self.cursor += remaining
+                continue
+
+            start = _HEADER_SIZE + offset + _LEN.size
+            frame = buf[start:start + length]
+            self._frame_pos = self.cursor
+            self.cursor += _LEN.size + length
+            read += 1
+            self.frames_read += 1
+            yield frame
+            frame.release()
+
+
+class SharedMemoryBus:
+    """Publish/subscribe bus over a shared-memory ring.
+
+    One process creates the bus and publishes; co-located processes attach
+    by name and subscribe with the same (event_type, data) callbacks and
+    ``prefix*`` patterns as RedisEventBus.
+    """
+
+    def __init__(self, name: str = 'cicd_bus', capacity: int = 4 * 1024 * 1024,
+                 create: bool = False, poll_interval: float = 0.0001, listen: bool = True,
+                 codec: str = 'json'):
+        self.ring = SharedMemoryRing(name, capacity=capacity, create=create)
+        self.codec = get_codec(codec)
+        self.poll_interval = poll_interval
+        self.listen = listen  # False: caller drives delivery with poll()
+        self.subscribers: Dict[str, List[Callable]] = {}
+        self._dispatch = DispatchTable()
+        self._reader = None
+        self.published = 0
+        self.delivered = 0
+        self.decode_errors = 0
+        self.running = False
+        self.listener_thread = None
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """Publish event to the ring (producer process only)."""
+        message = {
+            'event_type': event_type,
+            'data': data,
+            'timestamp': datetime.datetime.now().isoformat()
+        }
+        self.ring.write(encode_message(message, self.codec))
+        self.published += 1
+
+    def subscribe(self, event_pattern: str, callback: Callable):
+        """Subscribe to event pattern; starts the poll thread on first use."""
+        self.subscribers.setdefault(event_pattern, []).append(callback)
+        self._dispatch.compile(self.subscribers)
+        if self._reader is None:
+            self._reader = self.ring.reader()
+        if self.listen and not self.running:
+            self.start_listener()
+
+    def unsubscribe(self, event_pattern: str, callback: Callable = None):
+        """Unsubscribe a callback, or every callback, from event pattern."""
+        callbacks = self.subscribers.get(event_pattern)
+        if callbacks is None:
+            return
+        if callback is not None and callback in callbacks:
+            callbacks.remove(callback)
+        if callback is None or not callbacks:
+            del self.subscribers[event_pattern]
+        self._dispatch.compile(self.subscribers)
+
+    def start_listener(self):
+        """Start polling the ring from the current write position."""
+        if self.running:
+            return
+        if self._reader is None:
+            self._reader = self.ring.reader()
+        self.running = True
+        self.listener_thread = threading.Thread(target=self._listen_for_messages, daemon=True)
+        self.listener_thread.start()
+
+    def poll(self, max_frames: Optional[int] = None) -> int:
+        """Dispatch pending frames on the calling thread; returns frames handled."""
+        if self._reader is None:
+            self._reader = self.ring.reader()
+        handled = 0
+        for frame in self._reader.read(max_frames):
+            handled += 1
+            try:
+                # Decodes straight from the shared-memory view where the codec allows
+                message = decode_message(frame)
+                event_type = message['event_type']
+            except (ValueError, KeyError, TypeError):
+                if self._reader.frame_valid():
+                    self.decode_errors += 1
+                continue
+            if not self._reader.frame_valid():
+                continue
+            for callback in self._dispatch.match(event_type):
+                try:
+                    callback(event_type, message['data'])
+                    self.delivered += 1
+                except Exception as e:
+                    print(f"Callback error: {e}")
+        return handled
+
+    def _listen_for_messages(self):
+        """Poll the ring, spinning briefly before backing off to poll_interval."""
+        idle = 0
+        while self.running:
+            if self.poll(max_frames=256):
+                idle = 0
+                continue
+            idle += 1
+            if idle > 100:
+                time.sleep(self.poll_interval)
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Get ring statistics."""
+        return {
+            'transport': 'shared_memory',
+            'name': self.ring.name,
+            'capacity_bytes': self.ring.capacity,
+            'write_pos': self.ring.write_pos,
+            'subscribers': len(self.subscribers),
+            'published': self.published,
+            'delivered': self.delivered,
+            'decode_errors': self.decode_errors,
+            'lag_bytes': self._reader.lag_bytes if self._reader else 0,
+            'overruns': self._reader.overruns if self._reader else 0
+        }
+
+    def stop(self):
+        """Stop polling and detach from the ring."""
+        self.running = False
+        if self.listener_thread and self.listener_thread.is_alive():
+            self.listener_thread.join(timeout=1)
+        self.ring.close()
@@ -1,58 +1,192 @@
 import json
 import datetime
 import os
-from typing import Dict, List, Callable, Any
+import glob
+import threading
+from collections import deque
+from typing import Dict, List, Callable, Any, Deque, Optional
 from .event_bus import event_bus
 
+try:
+    import fcntl
+except ImportError:  # Windows: single writer per log directory
+    fcntl = None
+
 class SovereignBus:
-    """Event bus with Redis pub/sub and file-based persistence."""
-    
-    def __init__(self, log_file="bus_events.json"):
+    """Event bus with Redis pub/sub and segmented append-only persistence.
+
+    Messages are appended as JSON lines to ``bus_events.<n>.jsonl`` segments
+    that roll over by size; only the newest ``max_segments`` are kept. Recent
+    messages, overall and per event type, are held in bounded in-memory
+    indexes that serve reads. Lines appended by other processes are picked
+    up incrementally from the active segment; writers serialize catch-up,
+    append and rollover with an exclusive flock on ``bus.lock``.
+    """
+
+    SEGMENT_PREFIX = "bus_events."
+    SEGMENT_SUFFIX = ".jsonl"
+    LOCK_FILE = "bus.lock"
+
+    def __init__(self, log_dir=os.path.join("logs", "bus"), segment_max_bytes=1024 * 1024,
+                 max_segments=5, history_size=100, history_per_type=100):
         self.listeners: Dict[str, List[Callable]] = {}
-        self.log_file = log_file
-        self.message_log: List[Dict] = self._load_messages()
+        self.log_dir = log_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self.message_log: Deque[Dict] = deque(maxlen=history_size)
+        self.history_per_type = history_per_type
+        self._by_type: Dict[str, Deque[Dict]] = {}
+        self._lock = threading.RLock()
+        self._segment_index = 0
+        self._offset = 0
+        self._segment_file = None
+        self._lock_file = None
         self.event_bus = event_bus
-    
+        self._load_messages()
+
+    def _segment_path(self, index: int) -> str:
+        """Path of segment number index."""
+        return os.path.join(self.log_dir, f"{self.SEGMENT_PREFIX}{index:06d}{self.SEGMENT_SUFFIX}")
+
+    @property
+    def active_segment_path(self) -> str:
+        """Path of the segment currently appended to."""
+        return self._segment_path(self._segment_index)
+
+    def _list_segments(self) -> List[int]:
+        """Existing segment numbers, oldest first."""
+        pattern = os.path.join(self.log_dir, f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}")
+        indexes = []
+        for path in glob.glob(pattern):
+            name = os.path.basename(path)[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if name.isdigit():
+                indexes.append(int(name))
+        return sorted(indexes)
+
     def _load_messages(self):
-        """Load existing messages from file."""
+        """Rebuild in-memory indexes from retained segments."""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return []
-    
-    def _save_messages(self):
-        """Save messages to file."""
+            os.makedirs(self.log_dir, exist_ok=True)
+            segments = self._list_segments()
+            if not segments:
+                return
+            for index in segments[:-1]:
+                self._segment_index, self._offset = index, 0
+                self._read_new_lines()
+            self._segment_index, self._offset = segments[-1], 0
+            self._read_new_lines()
+        except Exception as e:
+            print(f"Bus load error: {e}")
+
+    def _index(self, message: Dict):
+        """Add message to in-memory indexes."""
+        self.message_log.append(message)
+        event_type = message.get("event_type")
+        by_type = self._by_type.get(event_type)
+        if by_type is None:
+            by_type = self._by_type[event_type] = deque(maxlen=self.history_per_type)
+        by_type.append(message)
+
+    def _read_new_lines(self):
+        """Index complete lines appended to the active segment after our offset."""
+        path = self._segment_path(self._segment_index)
+        if not os.path.exists(path) or os.path.getsize(path) <= self._offset:
+            return
+        with open(path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        end = chunk.rfind(b'\n') + 1  # Ignore a partially written trailing line
+        for line in chunk[:end].splitlines():
+            try:
+                self._index(json.loads(line))
+            except ValueError:
+                continue
+        self._offset += end
+
+    def _catch_up(self):
+        """Pick up lines and segments written by other processes."""
+        self._read_new_lines()
+        while os.path.exists(self._segment_path(self._segment_index + 1)):
+            self._switch_segment(self._segment_index + 1)
+            self._read_new_lines()
+
+    def _switch_segment(self, index: int):
+        """Make segment index the active one."""
+        if self._segment_file:
+            self._segment_file.close()
+            self._segment_file = None
+        self._segment_index = index
+        self._offset = 0
+
+    def _prune_segments(self):
+        """Delete segments beyond the retention limit."""
+        for index in self._list_segments()[:-self.max_segments]:
+            try:
+                os.remove(self._segment_path(index))
+            except OSError:
+                pass
+
+    def _save_message(self, message: Dict):
+        """Append one message to the active segment."""
+        line = (json.dumps(message) + "\n").encode()
         try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.message_log[-100:], f, indent=2)  # Keep last 100
+            if self._offset and self._offset + len(line) > self.segment_max_bytes:
+                self._switch_segment(self._segment_index + 1)
+            if self._segment_file is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                # Unbuffered append: each line is a single write() call
+                self._segment_file = open(self._segment_path(self._segment_index), 'ab', buffering=0)
+                self._prune_segments()
+            self._segment_file.write(line)
+            # File position, not offset + len(line), so the offset stays on a line boundary
+            self._offset = self._segment_file.tell()
         except Exception as e:
             print(f"Bus save error: {e}")
-    
+
+    def _lock_writers(self):
+        """Take the cross-process writer lock (no-op without fcntl)."""
+        if fcntl is None:
+            return
+        try:
+            if self._lock_file is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                self._lock_file = open(os.path.join(self.log_dir, self.LOCK_FILE), 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        except OSError as e:
+            print(f"Bus lock error: {e}")
+
+    def _unlock_writers(self):
+        if fcntl is not None and self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
     def subscribe(self, event_type: str, callback: Callable):
         """Subscribe to event type via Redis and local."""
         if event_type not in self.listeners:
             self.listeners[event_type] = []
         self.listeners[event_type].append(callback)
-        
+
         # Subscribe via Redis
         self.event_bus.subscribe(event_type, callback)
-    
+
     def publish(self, event_type: str, data: Any = None):
-        """Publish event via Redis and save to file."""
+        """Publish event via Redis and append to the segment log."""
         message = {
             "timestamp": datetime.datetime.now().isoformat(),
             "event_type": event_type,
             "data": data
         }
-        self.message_log.append(message)
-        self._save_messages()
-        
+        with self._lock:
+            self._lock_writers()
+            try:
+                self._catch_up()
+                self._index(message)
+                self._save_message(message)
+            finally:
+                self._unlock_writers()
+
         # Publish via Redis
         self.event_bus.publish(event_type, message)
-        
+
         # Notify local subscribers
         if event_type in self.listeners:
             for callback in self.listeners[event_type]:
@@ -60,13 +194,44 @@ class SovereignBus:
                     callback(message)
                 except Exception as e:
                     print(f"Bus error: {e}")
-    
-    def get_messages(self, event_type: str = None) -> List[Dict]:
-        """Get message history."""
-        self.message_log = self._load_messages()  # Refresh from file
-        if event_type:
-            return [msg for msg in self.message_log if msg["event_type"] == event_type]
-        return self.message_log
-
-# Global bus instance
-bus = SovereignBus()
\ No newline at end of file
+
+    def get_messages(self, event_type: str = None, limit: Optional[int] = None) -> List[Dict]:
+        """Get recent message history from memory, oldest first."""
+        with self._lock:
+            self._catch_up()
+            if event_type:
+                messages = list(self._by_type.get(event_type, ()))
+            else:
+                messages = list(self.message_log)
+        return messages[-limit:] if limit else messages
+
+    def close(self):
+        """Close the active segment and lock files."""
+        with self._lock:
+            if self._segment_file:
+                self._segment_file.close()
+                self._segment_file = None
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+
+# Global bus instance, created on first use
+_bus = None
+_bus_lock = threading.Lock()
+
+def get_bus() -> SovereignBus:
+    """Get or create the global sovereign bus."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = SovereignBus()
+    return _bus
+
+class _LazyBus:
+    """Module-level ``bus`` that creates the global bus (and logs/bus) on first use."""
+
+    def __getattr__(self, name):
+        return getattr(get_bus(), name)
+
+bus = _LazyBus()
@@ -2,9 +2,45 @@
 """
 State Adapter
 Converts heterogeneous Agent State into normalized RL Observation.
+
+Batches of events can also be featurized into a float32 matrix with a fixed
+column layout (FEATURE_NAMES) for the batched decide path and offline
+training. Categorical fields are one-hot encoded against fixed vocab tables;
+values outside a vocab land in its "<unk>" column.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Union
+import numpy as np
+
+UNKNOWN = "<unk>"
+
+# Vocab tables (FIXED: append only, existing columns must not move)
+ENV_VOCAB = (UNKNOWN, "dev", "stage", "prod")
+EVENT_TYPE_VOCAB = (UNKNOWN, "deploy", "scale", "restart", "crash", "overload", "false_alarm",
+                    "critical_system_failure", "high_cpu", "high_memory", "low_load")
+STATE_VOCAB = (UNKNOWN, "idle", "observing", "validating", "deciding", "enforcing", "acting",
+               "observing_results", "explaining", "blocked", "shutting_down")
+
+# Numeric columns: RL request fields, then memory context signals
+NUMERIC_FEATURES = ("latency_ms", "errors_last_min", "workers")
+MEMORY_FEATURES = ("recent_failures", "repeated_actions", "instability_score")
+
+FEATURE_NAMES = (
+    NUMERIC_FEATURES
+    + MEMORY_FEATURES
+    + tuple(f"env={v}" for v in ENV_VOCAB)
+    + tuple(f"event_type={v}" for v in EVENT_TYPE_VOCAB)
+    + tuple(f"state={v}" for v in STATE_VOCAB)
+)
+
+_ENV_INDEX = {v: i for i, v in enumerate(ENV_VOCAB)}
+_EVENT_TYPE_INDEX = {v: i for i, v in enumerate(EVENT_TYPE_VOCAB)}
+_STATE_INDEX = {v: i for i, v in enumerate(STATE_VOCAB)}
+
+_NUM_NUMERIC = len(NUMERIC_FEATURES) + len(MEMORY_FEATURES)
+_ENV_OFFSET = _NUM_NUMERIC
+_EVENT_TYPE_OFFSET = _ENV_OFFSET + len(ENV_VOCAB)
+_STATE_OFFSET = _EVENT_TYPE_OFFSET + len(EVENT_TYPE_VOCAB)
 
 class StateAdapter:
     """
@@ -25,12 +61,91 @@ class StateAdapter:
         Required Fields:
             app, env, event_type, state, latency_ms, errors_last_min, workers
         """
+        # 1. Map to flat schema
+        rl_request = self._map_event(event, agent_state)
+        
+        # 2. Log normalization event
+        from core.proof_logger import write_proof, ProofEvents
+        write_proof(ProofEvents.RL_INPUT, {
+            "mapped_payload": rl_request,
+            "original_event_type": event.get("event_type")
+        })
+        
+        return rl_request
+
+    def adapt_states(self,
+                     events: Sequence[Dict[str, Any]],
+                     agent_states: Union[str, Sequence[str]]) -> List[Dict[str, Any]]:
+        """
+        Batch version of adapt_state, with one proof log entry for the batch.
+        
+        Args:
+            events: Runtime events
+            agent_states: One agent state for all events, or one per event
+        """
+        if isinstance(agent_states, str):
+            agent_states = [agent_states] * len(events)
+        if len(agent_states) != len(events):
+            raise ValueError("agent_states must match events in length")
+        
+        rl_requests = [self._map_event(event, state) for event, state in zip(events, agent_states)]
+        if rl_requests:
+            from core.proof_logger import write_proof, ProofEvents
+            write_proof(ProofEvents.RL_INPUT, {
+                "batch_size": len(rl_requests),
+                "mapped_payloads": rl_requests,
+                "original_event_types": [event.get("event_type") for event in events]
+            })
+        return rl_requests
+
+    def featurize_batch(self,
+                        events: Sequence[Dict[str, Any]],
+                        agent_states: Union[str, Sequence[str]],
+                        memory_contexts: Optional[Sequence[Dict[str, Any]]] = None) -> np.ndarray:
+        """
+        Feature matrix (len(events) x len(FEATURE_NAMES), float32) for a batch of events.
+        """
+        return self.to_matrix(self.adapt_states(events, agent_states), memory_contexts)
+
+    def to_matrix(self,
+                  rl_requests: Sequence[Dict[str, Any]],
+                  memory_contexts: Optional[Sequence[Dict[str, Any]]] = None) -> np.ndarray:
+        """
+        Feature matrix for already adapted RL requests, columns as FEATURE_NAMES.
+        """
+        n = len(rl_requests)
+        if memory_contexts is not None and len(memory_contexts) != n:
+            raise ValueError("memory_contexts must match rl_requests in length")
+        
+        matrix = np.zeros((n, len(FEATURE_NAMES)), dtype=np.float32)
+        if n == 0:
+            return matrix
+        
+        matrix[:, :len(NUMERIC_FEATURES)] = [
+            [_as_float(r.get(name)) for name in NUMERIC_FEATURES] for r in rl_requests
+        ]
+        if memory_contexts is not None:
+            matrix[:, len(NUMERIC_FEATURES):_NUM_NUMERIC] = [
+                [_as_float((m or {}).get(name)) for name in MEMORY_FEATURES] for m in memory_contexts
+            ]
+        
+        # One-hot categoricals: one fancy-indexed assignment per field
+        rows = np.arange(n)
+        matrix[rows, _ENV_OFFSET + np.fromiter(
+            (_ENV_INDEX.get(r.get("env"), 0) for r in rl_requests), dtype=np.intp, count=n)] = 1.0
+        matrix[rows, _EVENT_TYPE_OFFSET + np.fromiter(
+            (_EVENT_TYPE_INDEX.get(r.get("event_type"), 0) for r in rl_requests), dtype=np.intp, count=n)] = 1.0
+        matrix[rows, _STATE_OFFSET + np.fromiter(
+            (_STATE_INDEX.get(r.get("state"), 0) for r in rl_requests), dtype=np.intp, count=n)] = 1.0
+        return matrix
+
+    def _map_event(self, event: Dict[str, Any], agent_state: str) -> Dict[str, Any]:
+        """Map one runtime event onto the flat RL request schema."""
         # Robust metrics extraction - look in data or top level
         data = event.get('data', {})
         metrics = event.get('metrics', {}) or data.get('metrics', {})
         
-        # 1. Map to flat schema
-        rl_request = {
+        return {
             "app": event.get("app_id") or event.get("app_name") or "unknown-app",
             "env": self.env,
             "event_type": event.get("event_type", "unknown"),
@@ -39,15 +154,6 @@ class StateAdapter:
             "errors_last_min": int(metrics.get("errors_last_min") or metrics.get("error_rate", 0) * 10 or 0),
             "workers": int(event.get("workers") or metrics.get("workers") or 3)
         }
-        
-        # 2. Log normalization event
-        from core.proof_logger import write_proof, ProofEvents
-        write_proof(ProofEvents.RL_INPUT, {
-            "mapped_payload": rl_request,
-            "original_event_type": event.get("event_type")
-        })
-        
-        return rl_request
 
     def _normalize_metrics(self, metrics: Dict[str, Any]) -> Dict[str, float]:
         """Ensure metrics are floats and handle missing values."""
@@ -84,3 +190,10 @@ class StateAdapter:
             metrics.get('memory_percent', 0) / 100.0,
             metrics.get('error_rate', 0)
         ]
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
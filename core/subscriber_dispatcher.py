@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Subscriber Dispatcher
+Runs bus callbacks on a worker pool, each subscriber behind its own bounded
+queue, so a slow subscriber cannot stall delivery to the others.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
+
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_DROP_NEWEST = 'drop_newest'
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+
+class _SubscriberQueue:
+    """Bounded FIFO for one subscriber plus its delivery metrics."""
+
+    def __init__(self, callback: Callable, maxsize: int, overflow: str):
+        self.callback = callback
+        self.name = getattr(callback, '__qualname__', repr(callback))
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.items = deque()
+        self.cond = threading.Condition()
+        self.scheduled = False  # True while queued on, or held by, a worker
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.total_lag_ms = 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.cond:
+            return {
+                'subscriber': self.name,
+                'depth': len(self.items),
+                'capacity': self.maxsize,
+                'overflow_policy': self.overflow,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'last_lag_ms': self.last_lag_ms,
+                'max_lag_ms': self.max_lag_ms,
+                'avg_lag_ms': self.total_lag_ms / self.delivered if self.delivered else 0.0
+            }
+
+
+class SubscriberDispatcher:
+    """Worker pool delivering messages to per-subscriber ordered queues.
+
+    A subscriber queue is handed to at most one worker at a time, which
+    preserves per-subscriber ordering while different subscribers are
+    serviced in parallel.
+    """
+
+    DRAIN_BATCH = 32  # Messages delivered per turn before yielding to other subscribers
+
+    def __init__(self, workers: int = 4, queue_size: int = 1000,
+                 overflow: str = OVERFLOW_BLOCK):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self._subscribers: Dict[Callable, _SubscriberQueue] = {}
+        self._ready: "queue.Queue[Optional[_SubscriberQueue]]" = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.running = False
+
+    def register(self, callback: Callable, queue_size: int = None, overflow: str = None):
+        """Give callback its own bounded queue (no-op if already registered)."""
+        overflow = overflow or self.overflow
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers[callback] = _SubscriberQueue(
+                    callback, queue_size or self.queue_size, overflow
+                )
+        self.start()
+
+    def unregister(self, callback: Callable):
+        """Remove callback's queue, discarding undelivered messages."""
+        with self._lock:
+            sub = self._subscribers.pop(callback, None)
+        if sub is not None:
+            with sub.cond:
+                sub.items.clear()
+                sub.cond.notify_all()
+
+    def submit(self, callback: Callable, *args):
+        """Queue a call for callback, applying its overflow policy when full.
+
+        Returns:
+            False if the message was dropped
+        """
+        sub = self._subscribers.get(callback)
+        if sub is None:
+            return False
+
+        entry = (time.perf_counter(), args)
+        with sub.cond:
+            if len(sub.items) >= sub.maxsize:
+                if sub.overflow == OVERFLOW_DROP_NEWEST:
+                    sub.dropped += 1
+                    return False
+                if sub.overflow == OVERFLOW_DROP_OLDEST:
+                    sub.items.popleft()
+                    sub.dropped += 1
+                else:
+                    # Block the producer until the subscriber catches up
+                    while len(sub.items) >= sub.maxsize and self.running \
+                            and self._subscribers.get(callback) is sub:
+                        sub.cond.wait(0.1)
+            sub.items.append(entry)
+            schedule = not sub.scheduled
+            sub.scheduled = True
+
+        if schedule:
+            self._ready.put(sub)
+        return True
+
+    def start(self):
+        """Start worker threads."""
+        if self.running:
+            return
+        self.running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"bus-dispatch-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self):
+        """Deliver messages for one ready subscriber at a time."""
+        while True:
+            sub = self._ready.get()
+            if sub is None:
+                break
+
+            for _ in range(self.DRAIN_BATCH):
+                with sub.cond:
+                    if not sub.items:
+                        break
+                    enqueued_at, args = sub.items.popleft()
+                    sub.cond.notify()
+
+                lag_ms = (time.perf_counter() - enqueued_at) * 1000
+                failed = False
+                try:
+                    sub.callback(*args)
+                except Exception as e:
+                    failed = True
+                    print(f"Callback error: {e}")
+
+                with sub.cond:
+                    sub.errors += failed
+                    sub.delivered += 1
+                    sub.last_lag_ms = lag_ms
+                    sub.total_lag_ms += lag_ms
+                    if lag_ms > sub.max_lag_ms:
+                        sub.max_lag_ms = lag_ms
+
+            with sub.cond:
+                if sub.items:
+                    requeue = True
+                else:
+                    sub.scheduled = False
+                    requeue = False
+            if requeue:
+                self._ready.put(sub)
+
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        """Get per-subscriber depth, lag and drop metrics."""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        return [sub.metrics() for sub in subscribers]
+
+    def stop(self, timeout: float = 1.0):
+        """Stop workers once already-scheduled subscribers yield."""
+        if not self.running:
+            return
+        self.running = False
+        for _ in self._threads:
+            self._ready.put(None)
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
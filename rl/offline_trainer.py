@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Offline RL Trainer
+Retrain the per-environment RLDecisionLayer Q-tables from historical logs.
+
+Sources, each streamed line by line and applied in chunks:
+- ``day1_proof.log``: RL_DECISION entries joined to the ORCH_EXEC /
+  ORCH_REFUSE / UNSAFE_ACTION_REFUSED / DEMO_MODE_BLOCK entry that follows
+  them in the same environment
+- ``healing_log.csv``: failure_type / strategy / status
+- ``deployment_log*.csv`` and ``<env>/*deployment_log*.csv``: deploy outcomes
+- ``<env>/performance/*.csv``: refused actions
+
+Each environment is trained in its own worker process and written to
+``<logs>/<env>/rl_q_table.json`` in the format RLDecisionLayer.load_q_table
+reads. Only actions RLDecisionLayer.process_state can return are trained;
+healing strategies with an equivalent action are mapped to it and any other
+action is dropped (counted in stats['dropped_actions']).
+
+A chunk is applied with a closed form of the layer's update rule
+(q += lr * (reward - q)), so the result equals replaying every experience
+through update_q_value in file order.
+
+Usage:
+    python -m rl.offline_trainer --logs-dir logs --envs dev stage --workers 4
+"""
+
+import copy
+import csv
+import glob
+import json
+import operator
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+from core.rl_decision_layer import RLDecisionLayer, DEFAULT_Q_TABLE
+
+ENVS = ['dev', 'stage', 'prod']
+PROOF_LOG = "day1_proof.log"
+HEALING_LOG = "healing_log.csv"
+DEPLOY_STATE = "deploy"
+
+OUTCOME_REWARDS = {
+    'success': 1.0,
+    'executed': 1.0,
+    'failure': -1.0,
+    'failed': -1.0,
+    'refused': -1.0,
+}
+OUTCOME_EVENTS = {
+    'ORCH_EXEC': 1.0,
+    'ORCH_REFUSE': -1.0,
+    'UNSAFE_ACTION_REFUSED': -1.0,
+    'DEMO_MODE_BLOCK': -1.0,
+}
+# Same index -> name mapping RuntimeRLPipe logs in RL_DECISION 'decision'
+ACTION_NAMES = {0: 'noop', 1: 'restart', 2: 'scale_up', 3: 'scale_down', 4: 'rollback'}
+EXECUTABLE_ACTIONS = frozenset(ACTION_NAMES.values())
+# Healing strategies that do the same thing as an executable action
+STRATEGY_ACTIONS = {
+    'restore_previous_version': 'rollback',
+    'scale_workers': 'scale_up',
+}
+_PROOF_EVENT = re.compile('"event_name": "(?:%s)"' % '|'.join(['RL_DECISION'] + list(OUTCOME_EVENTS)))
+
+
+class _CellTable:
+    """Flat (state, action) -> Q-value array that grows as cells appear."""
+
+    def __init__(self, initial):
+        self.cells = {}
+        self.keys = []
+        self.values = np.zeros(max(16, sum(len(a) for a in initial.values())))
+        for state, actions in initial.items():
+            for action, value in actions.items():
+                self.values[self.index(state, action)] = value
+
+    def index(self, state, action):
+        key = (state, action)
+        i = self.cells.get(key)
+        if i is None:
+            i = self.cells[key] = len(self.keys)
+            self.keys.append(key)
+            if i == len(self.values):
+                self.values = np.concatenate([self.values, np.zeros(i)])
+        return i
+
+    def update(self, experiences, learning_rate):
+        """Apply a chunk of (state, action, reward) in order, vectorized per cell."""
+        cells = np.fromiter((self.index(s, a) for s, a, _ in experiences),
+                            dtype=np.intp, count=len(experiences))
+        rewards = np.fromiter((r for _, _, r in experiences), dtype=np.float64, count=len(experiences))
+        order = np.argsort(cells, kind='stable')
+        cells, rewards = cells[order], rewards[order]
+        unique, starts, counts = np.unique(cells, return_index=True, return_counts=True)
+
+        # k updates q <- q + lr * (r_i - q) collapse to
+        # q_k = (1 - lr)^k * q_0 + sum_i lr * (1 - lr)^(k - i) * r_i
+        decay = 1.0 - learning_rate
+        position = np.arange(len(cells)) - np.repeat(starts, counts)
+        remaining = np.repeat(counts, counts) - 1 - position
+        weighted = learning_rate * decay ** remaining * rewards
+        self.values[unique] = decay ** counts * self.values[unique] + np.add.reduceat(weighted, starts)
+
+    def to_dict(self):
+        table = {}
+        for (state, action), value in zip(self.keys, self.values.tolist()):
+            table.setdefault(state, {})[action] = value
+        return table
+
+
+def _read_csv(path, *columns):
+    """Rows as tuples of the named columns ('' where the file lacks one)"""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        get = operator.itemgetter(*[header.index(c) if c in header else width for c in columns])
+        for row in reader:
+            if len(row) < width:
+                row.extend([''] * (width - len(row)))
+            row.append('')
+            yield get(row)
+
+
+def _proof_experiences(path, env, stats):
+    """RL_DECISION entries joined to the outcome logged after them"""
+    env_marker = f'"env": "{env}"'
+    pending = None
+    with open(path) as f:
+        for line in f:
+            # Cheap substring checks so only relevant entries are parsed
+            if env_marker not in line or not _PROOF_EVENT.search(line):
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                stats['malformed'] += 1
+                continue
+            event = entry.get('event_name')
+            if entry.get('env') != env:
+                continue
+            if event == 'RL_DECISION':
+                if pending is not None:
+                    stats['unjoined_decisions'] += 1
+                action = entry.get('decision_str') or ACTION_NAMES.get(entry.get('decision'), 'noop')
+                pending = (entry.get('event_type') or 'unknown', action)
+            elif event in OUTCOME_EVENTS and pending is not None:
+                if entry.get('action') not in (None, pending[1]):
+                    stats['unjoined_decisions'] += 1
+                else:
+                    stats['proof_log'] += 1
+                    yield pending[0], pending[1], OUTCOME_EVENTS[event]
+                pending = None
+    if pending is not None:
+        stats['unjoined_decisions'] += 1
+
+
+def _healing_experiences(path, env, default_env, stats):
+    for row_env, failure_type, strategy, status in _read_csv(path, 'environment', 'failure_type', 'strategy', 'status'):
+        if (row_env or default_env) != env:
+            continue
+        reward = OUTCOME_REWARDS.get(status)
+        if reward is None or not failure_type or not strategy:
+            stats['skipped_rows'] += 1
+            continue
+        stats['healing_log'] += 1
+        yield failure_type, STRATEGY_ACTIONS.get(strategy, strategy), reward
+
+
+def _deployment_experiences(path, env, file_env, stats):
+    for row_env, action_type, status in _read_csv(path, 'environment', 'action_type', 'status'):
+        if (row_env or file_env) != env:
+            continue
+        reward = OUTCOME_REWARDS.get(status)
+        if reward is None:
+            stats['skipped_rows'] += 1
+            continue
+        stats['deployment_log'] += 1
+        yield DEPLOY_STATE, action_type or 'deploy', reward
+
+
+def _performance_experiences(path, env, stats):
+    """Refusals are logged to the throughput log as '<env>_REFUSED_<action>'"""
+    marker = f"{env}_REFUSED_"
+    for environment, _ in _read_csv(path, 'environment', 'timestamp'):
+        if environment.startswith(marker):
+            stats['performance_log'] += 1
+            yield DEPLOY_STATE, environment[len(marker):], OUTCOME_REWARDS['refused']
+
+
+def _executable(experiences, stats):
+    """Drop experiences whose action the decision layer cannot execute"""
+    for experience in experiences:
+        if experience[1] in EXECUTABLE_ACTIONS:
+            yield experience
+        else:
+            stats['dropped_actions'] += 1
+
+
+def _sources(logs_dir, env, default_env, stats):
+    """Experience streams for env, in a fixed source order"""
+    proof_log = os.path.join(logs_dir, PROOF_LOG)
+    if os.path.exists(proof_log):
+        yield _proof_experiences(proof_log, env, stats)
+
+    healing_log = os.path.join(logs_dir, HEALING_LOG)
+    if os.path.exists(healing_log):
+        yield _healing_experiences(healing_log, env, default_env, stats)
+
+    for path in sorted(glob.glob(os.path.join(logs_dir, "deployment_log*.csv"))):
+        yield _deployment_experiences(path, env, default_env, stats)
+    env_dir = os.path.join(logs_dir, env)
+    for path in sorted(glob.glob(os.path.join(env_dir, "*deployment_log*.csv"))):
+        yield _deployment_experiences(path, env, env, stats)
+
+    for path in sorted(glob.glob(os.path.join(env_dir, "performance", "*.csv"))):
+        yield _performance_experiences(path, env, stats)
+
+
+def train_env(logs_dir, env, initial, learning_rate=0.1, chunk_size=10000, default_env='dev'):
+    """
+    Train one environment's Q-table from its log history.
+
+    Returns:
+        Tuple of (env, q_table dict, stats dict)
+    """
+    table = _CellTable(initial)
+    stats = Counter()
+    for experiences in _sources(logs_dir, env, default_env, stats):
+        experiences = _executable(experiences, stats)
+        while True:
+            chunk = list(islice(experiences, chunk_size))
+            if not chunk:
+                break
+            table.update(chunk, learning_rate)
+            stats['experiences'] += len(chunk)
+            stats['chunks'] += 1
+    return env, table.to_dict(), dict(stats)
+
+
+def train(logs_dir="logs", envs=None, workers=None, merge=False, learning_rate=0.1,
+          chunk_size=10000, default_env='dev', write=True):
+    """
+    Retrain the Q-table of each environment in parallel and export it.
+
+    Args:
+        logs_dir: Directory holding the proof log and CSV logs
+        envs: Environments to train (default: dev, stage, prod)
+        workers: Worker processes (default: one per environment, up to the CPU count)
+        merge: Start from each environment's saved table instead of the defaults
+        write: Save tables to <logs_dir>/<env>/rl_q_table.json
+
+    Returns:
+        Dict of env -> {'q_table', 'stats', 'path'}; environments without any
+        experience are not written
+    """
+    envs = list(envs or ENVS)
+    layers = {}
+    for env in envs:
+        layer = RLDecisionLayer(env=env)
+        layer.q_table_path = os.path.join(logs_dir, env, "rl_q_table.json")
+        layer.q_table = layer.load_q_table() if merge else copy.deepcopy(DEFAULT_Q_TABLE)
+        layers[env] = layer
+
+    jobs = [(logs_dir, env, layers[env].q_table, learning_rate, chunk_size, default_env) for env in envs]
+    workers = min(workers or os.cpu_count() or 1, len(envs))
+    if workers <= 1:
+        outputs = [train_env(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(train_env, *zip(*jobs)))
+
+    results = {}
+    for env, q_table, stats in outputs:
+        layer = layers[env]
+        path = None
+        if write and stats.get('experiences'):
+            layer.q_table = q_table
+            layer.save_q_table()
+            path = layer.q_table_path
+        results[env] = {'q_table': q_table, 'stats': stats, 'path': path}
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline RL Trainer")
+    parser.add_argument("--logs-dir", default="logs")
+    parser.add_argument("--envs", nargs='+', default=ENVS)
+    parser.add_argument("--workers", type=int, default=None,
+                        help='Worker processes (default: one per environment)')
+    parser.add_argument("--merge", action='store_true',
+                        help='Continue from the saved Q-tables instead of the defaults')
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--default-env", default='dev',
+                        help='Environment for log rows without one')
+    parser.add_argument("--dry-run", action='store_true',
+                        help='Train but do not write Q-tables')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = train(args.logs_dir, args.envs, args.workers, args.merge, args.learning_rate,
+                    args.chunk_size, args.default_env, write=not args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    for env, result in results.items():
+        stats = result['stats']
+        print(f"{env}: {stats.get('experiences', 0)} experiences "
+              f"(proof {stats.get('proof_log', 0)}, healing {stats.get('healing_log', 0)}, "
+              f"deploy {stats.get('deployment_log', 0)}, performance {stats.get('performance_log', 0)}; "
+              f"{stats.get('unjoined_decisions', 0)} unjoined decisions, "
+              f"{stats.get('dropped_actions', 0)} non-executable actions dropped), "
+              f"{len(result['q_table'])} states -> {result['path'] or 'not written'}")
+    print(f"Trained {len(results)} environments in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import csv
+import os
+import numpy as np
+
+class QTable:
+    """Dense numpy Q-table with state/action index maps.
+
+    Rows are states, columns actions. Unknown states get a zero row on first
+    use; the backing array doubles in capacity when it fills, so adding a
+    state is amortised O(actions) instead of a DataFrame reallocation.
+    """
+
+    def __init__(self, actions, states=(), initial_capacity=16):
+        self.actions = list(actions)
+        self.action_index = {a: i for i, a in enumerate(self.actions)}
+        self.states = []
+        self.state_index = {}
+        self._values = np.zeros((max(initial_capacity, len(states), 1), len(self.actions)))
+        for state in states:
+            self.index(state)
+
+    @property
+    def values(self):
+        """Q-values of the known states (a view, not a copy)."""
+        return self._values[:len(self.states)]
+
+    @property
+    def shape(self):
+        return (len(self.states), len(self.actions))
+
+    def __contains__(self, state):
+        return state in self.state_index
+
+    def index(self, state):
+        """Row index of state, adding a zero row if it is new."""
+        i = self.state_index.get(state)
+        if i is None:
+            i = len(self.states)
+            if i == self._values.shape[0]:
+                grown = np.zeros((i * 2, len(self.actions)))
+                grown[:i] = self._values
+                self._values = grown
+            self.states.append(state)
+            self.state_index[state] = i
+        return i
+
+    def indices(self, states):
+        """Row indexes for a sequence of states, as an int array."""
+        return np.fromiter((self.index(s) for s in states), dtype=np.intp, count=len(states))
+
+    def action_indices(self, actions):
+        return np.fromiter((self.action_index[a] for a in actions), dtype=np.intp, count=len(actions))
+
+    # index() may grow (replace) the backing array, so it is resolved before _values is read
+    def row(self, state):
+        i = self.index(state)
+        return self._values[i]
+
+    def get(self, state, action):
+        i = self.index(state)
+        return self._values[i, self.action_index[action]]
+
+    def set(self, state, action, value):
+        i = self.index(state)
+        self._values[i, self.action_index[action]] = value
+
+    def best_action(self, state):
+        return self.actions[int(np.argmax(self.row(state)))]
+
+    def save_csv(self, path):
+        """Write states x actions as CSV (same layout as DataFrame.to_csv)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([""] + self.actions)
+            for state, row in zip(self.states, self.values.tolist()):
+                writer.writerow([state] + row)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_csv(cls, path, states, actions):
+        """Load a CSV Q-table, keeping only known actions and adding missing states.
+
+        Raises:
+            FileNotFoundError: No table at path
+        """
+        table = cls(actions, states)
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            return table
+        columns = [(j, table.action_index[a]) for j, a in enumerate(rows[0][1:], start=1)
+                   if a in table.action_index]
+        for row in rows[1:]:
+            if not row:
+                continue
+            i = table.index(row[0])
+            for j, k in columns:
+                try:
+                    table._values[i, k] = float(row[j])
+                except (IndexError, ValueError):
+                    table._values[i, k] = 0.0
+        return table
@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: the single-writer rule is not enforced
+    fcntl = None
+
+EXPERIENCE_DTYPE = np.dtype([
+    ('state', '<i4'),
+    ('action', '<i4'),
+    ('reward', '<f4'),
+    ('next_state', '<i4'),
+    ('timestamp', '<f8'),
+    ('priority', '<f4'),
+])
+
+# Header slots (float64): records held, next write slot, max priority, total appended
+_COUNT, _POS, _MAX_PRIORITY, _TOTAL = range(4)
+_HEADER_SIZE = 4
+
+DATA_FILE = "experience.dat"
+HEADER_FILE = "header.dat"
+META_FILE = "meta.json"
+LOCK_FILE = "writer.lock"
+
+
+class ReplayStore:
+    """Persistent experience replay ring backed by numpy memmaps.
+
+    Records are fixed-dtype (EXPERIENCE_DTYPE) rows in ``experience.dat``;
+    the ring position and counts live in a small ``header.dat`` memmap, so
+    an append is two in-place writes. State and action names are kept in
+    ``meta.json`` (rewritten only when a new name appears) and records hold
+    their indexes. Other processes can open the same directory with
+    ``readonly=True`` and sample while the owner keeps appending.
+
+    A directory has a single writer: each writer keeps its own name lists,
+    so two would point record indexes at each other's names. A writable
+    open takes an exclusive flock on ``writer.lock`` and raises
+    RuntimeError if another store holds it; close() releases it.
+
+    With ``path=None`` the ring is held in memory and nothing is persisted.
+    """
+
+    def __init__(self, path=None, capacity=100000, actions=(), readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        self.states = []
+        self.actions = []
+        self._state_index = {}
+        self._action_index = {}
+        self._meta_version = None
+        self._lock_file = None
+
+        if path is None:
+            if readonly:
+                raise ValueError("readonly requires a path")
+            self.capacity = capacity
+            self._data = np.zeros(capacity, dtype=EXPERIENCE_DTYPE)
+            self._header = np.zeros(_HEADER_SIZE)
+        else:
+            self._open(capacity)
+
+        if not readonly:
+            for action in actions:
+                self._index_of(action, self.actions, self._action_index)
+            self._save_meta()
+
+    def _open(self, capacity):
+        if not self.readonly:
+            os.makedirs(self.path, exist_ok=True)
+            self._lock_writer()
+        meta_path = os.path.join(self.path, META_FILE)
+        if os.path.exists(meta_path):
+            self._load_meta()
+        elif self.readonly:
+            raise FileNotFoundError(f"No replay store at {self.path}")
+        else:
+            self.capacity = capacity
+            np.memmap(os.path.join(self.path, DATA_FILE), dtype=EXPERIENCE_DTYPE,
+                      mode='w+', shape=(capacity,)).flush()
+            np.memmap(os.path.join(self.path, HEADER_FILE), dtype='<f8',
+                      mode='w+', shape=(_HEADER_SIZE,)).flush()
+
+        mode = 'r' if self.readonly else 'r+'
+        self._data = np.memmap(os.path.join(self.path, DATA_FILE), dtype=EXPERIENCE_DTYPE,
+                               mode=mode, shape=(self.capacity,))
+        self._header = np.memmap(os.path.join(self.path, HEADER_FILE), dtype='<f8',
+                                 mode=mode, shape=(_HEADER_SIZE,))
+
+    def _lock_writer(self):
+        if fcntl is None:
+            return
+        lock_file = open(os.path.join(self.path, LOCK_FILE), 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise RuntimeError(f"Replay store {self.path} is already open for writing; "
+                               "use readonly=True or a separate directory")
+        self._lock_file = lock_file
+
+    def _load_meta(self):
+        meta_path = os.path.join(self.path, META_FILE)
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        stat = os.stat(meta_path)
+        self._meta_version = (stat.st_mtime_ns, stat.st_size)
+        self.capacity = meta['capacity']
+        self.states = meta['states']
+        self.actions = meta['actions']
+        self._state_index = {s: i for i, s in enumerate(self.states)}
+        self._action_index = {a: i for i, a in enumerate(self.actions)}
+
+    def _save_meta(self):
+        if self.path is None:
+            return
+        meta_path = os.path.join(self.path, META_FILE)
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'capacity': self.capacity, 'dtype': EXPERIENCE_DTYPE.descr,
+                       'states': self.states, 'actions': self.actions}, f)
+        os.replace(tmp_path, meta_path)
+
+    def refresh(self):
+        """Reload state/action names written by the owning process (readers)."""
+        if self.path is None:
+            return
+        stat = os.stat(os.path.join(self.path, META_FILE))
+        if (stat.st_mtime_ns, stat.st_size) != self._meta_version:
+            self._load_meta()
+
+    def _index_of(self, name, names, index):
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(name)
+            return i, True
+        return i, False
+
+    def __len__(self):
+        return int(self._header[_COUNT])
+
+    @property
+    def total_appended(self):
+        return int(self._header[_TOTAL])
+
+    def append(self, state, action, reward, next_state, timestamp=None):
+        """Append one experience, overwriting the oldest once the ring is full."""
+        if self.readonly:
+            raise PermissionError("Replay store is open read-only")
+        with self._lock:
+            s, new_s = self._index_of(state, self.states, self._state_index)
+            n, new_n = self._index_of(next_state, self.states, self._state_index)
+            a, new_a = self._index_of(action, self.actions, self._action_index)
+            if new_s or new_n or new_a:
+                self._save_meta()
+
+            header = self._header
+            pos = int(header[_POS])
+            # New experience gets the highest priority seen so it is sampled at least once
+            priority = header[_MAX_PRIORITY] or 1.0
+            self._data[pos] = (s, a, reward, n, time.time() if timestamp is None else timestamp, priority)
+            header[_POS] = (pos + 1) % self.capacity
+            header[_COUNT] = min(header[_COUNT] + 1, self.capacity)
+            header[_TOTAL] += 1
+            return pos
+
+    def sample(self, batch_size, rng=None, prioritized=False, alpha=0.6, beta=0.4):
+        """
+        Sample a batch of records.
+
+        Returns:
+            Dict of arrays: slots, state, action, reward, next_state and
+            timestamp; prioritized sampling adds importance weights
+        """
+        rng = rng or np.random.default_rng()
+        count = len(self)
+        if count == 0:
+            raise ValueError("Replay store is empty")
+
+        if prioritized:
+            scaled = self._data['priority'][:count].astype(np.float64) ** alpha
+            probabilities = scaled / scaled.sum()
+            slots = rng.choice(count, size=batch_size, p=probabilities)
+            weights = (count * probabilities[slots]) ** -beta
+            weights /= weights.max()
+        else:
+            slots = rng.integers(0, count, size=batch_size)
+
+        records = self._data[slots]
+        batch = {
+            'slots': slots,
+            'state': records['state'].astype(np.intp),
+            'action': records['action'].astype(np.intp),
+            'reward': records['reward'].astype(np.float64),
+            'next_state': records['next_state'].astype(np.intp),
+            'timestamp': records['timestamp'],
+        }
+        if prioritized:
+            batch['weights'] = weights
+        return batch
+
+    def update_priorities(self, slots, priorities, epsilon=1e-3):
+        """Set sampling priorities (e.g. |TD error|) for sampled slots."""
+        if self.readonly:
+            raise PermissionError("Replay store is open read-only")
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + epsilon
+        with self._lock:
+            self._data['priority'][slots] = priorities
+            self._header[_MAX_PRIORITY] = max(self._header[_MAX_PRIORITY], float(priorities.max()))
+
+    def records(self):
+        """All held records, oldest first."""
+        count = len(self)
+        if count < self.capacity:
+            return np.array(self._data[:count])
+        pos = int(self._header[_POS])
+        return np.concatenate([self._data[pos:], self._data[:pos]])
+
+    def flush(self):
+        """Write memmap pages to disk."""
+        if self.path is not None and not self.readonly:
+            self._data.flush()
+            self._header.flush()
+
+    def close(self):
+        """Flush and release the writer lock."""
+        self.flush()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
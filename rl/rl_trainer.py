@@ -1,14 +1,29 @@
-import pandas as pd
 import random
 import os
 import csv
+import time
+import atexit
 import datetime
 import numpy as np
 from core.sovereign_bus import bus
+from rl.q_table import QTable
+from rl.replay_store import ReplayStore
 
 class RLTrainer:
-    """Enhanced RL trainer with Q-learning, Double DQN, and Actor-Critic methods."""
-    def __init__(self, rl_log_file, performance_log_file, train_mode=False, algorithm="q_learning"):
+    """Enhanced RL trainer with Q-learning, Double DQN, and Actor-Critic methods.
+
+    The Q-table is a dense numpy array (see QTable). Experience goes to a
+    persistent memmap replay store (see ReplayStore, by default in a
+    ``replay`` directory next to the Q-table file) so learn_batch can update
+    a whole sampled batch with a few vectorized operations, and experience
+    survives restarts. The Q-table is written to CSV only by checkpoint() (or
+    save_q_table()); performance rows are appended once performance_flush_rows
+    are buffered or performance_flush_interval seconds have passed, at
+    checkpoint() and at exit.
+    """
+    def __init__(self, rl_log_file, performance_log_file, train_mode=False, algorithm="q_learning",
+                 target_sync_interval=10, buffer_size=100000, replay_dir=None, prioritized_replay=False,
+                 performance_flush_rows=1000, performance_flush_interval=30.0):
         self.q_table_file = rl_log_file
         self.performance_log_file = performance_log_file
         self.train_mode = train_mode
@@ -21,13 +36,32 @@ class RLTrainer:
         self.epsilon_decay = 0.995
         self.min_epsilon = 0.01
         
-        # Enhanced features
-        self.experience_buffer = []
-        self.buffer_size = 1000
+        # Enhanced features: persistent experience replay
         self.batch_size = 32
+        self.prioritized_replay = prioritized_replay
+        self.replay = ReplayStore(
+            replay_dir or os.path.join(os.path.dirname(rl_log_file), "replay"),
+            capacity=buffer_size,
+            actions=self.actions
+        )
+        self.buffer_size = self.replay.capacity
         
         self.q_table = self._load_q_table()
+        # Replay store state/action index -> Q-table row/column
+        self._replay_rows = np.zeros(0, dtype=np.intp)
+        self._replay_columns = np.zeros(0, dtype=np.intp)
+        # Double DQN target table, synced every target_sync_interval batch updates
+        self.target_sync_interval = target_sync_interval
+        self._target_values = self.q_table.values.copy()
+        self._batch_updates = 0
+        
+        # Performance rows are buffered and appended in batches
+        self.performance_flush_rows = performance_flush_rows
+        self.performance_flush_interval = performance_flush_interval
+        self._pending_performance = []
+        self._performance_flushed_at = time.monotonic()
         self._initialize_performance_log()
+        atexit.register(self.flush_performance_log)
         print(f"Initialized Enhanced RL Trainer ({algorithm}).")
 
     def _initialize_performance_log(self):
@@ -39,41 +73,52 @@ class RLTrainer:
                 writer.writerow(["timestamp", "state", "action", "reward"])
 
     def _log_performance(self, state, action, reward):
-        """Logs a single state, action, and reward tuple to the performance log."""
-        timestamp = pd.Timestamp.now().isoformat()
+        """Buffers a single state, action, and reward tuple for the performance log."""
+        timestamp = datetime.datetime.now().isoformat()
+        self._pending_performance.append([timestamp, state, action, reward])
+        if (len(self._pending_performance) >= self.performance_flush_rows
+                or time.monotonic() - self._performance_flushed_at >= self.performance_flush_interval):
+            self.flush_performance_log()
+
+    def flush_performance_log(self):
+        """Appends buffered performance rows to the performance log."""
+        self._performance_flushed_at = time.monotonic()
+        if not self._pending_performance:
+            return
         with open(self.performance_log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([timestamp, state, action, reward])
+            csv.writer(f).writerows(self._pending_performance)
+        self._pending_performance = []
 
     def _load_q_table(self):
         """Loads the Q-table, creating it if it doesn't exist."""
         os.makedirs(os.path.dirname(self.q_table_file), exist_ok=True)
         try:
-            qt = pd.read_csv(self.q_table_file, index_col=0)
-        except (FileNotFoundError, pd.errors.EmptyDataError):
-            qt = pd.DataFrame(index=self.states, columns=self.actions, data=0.0)
-            return qt
-        
-        # Ensure all states and actions exist
-        for a in self.actions:
-            if a not in qt.columns: qt[a] = 0.0
-        for s in self.states:
-            if s not in qt.index: qt.loc[s] = 0.0
-        
-        return qt.loc[self.states, self.actions].fillna(0.0).astype(float)
+            return QTable.load_csv(self.q_table_file, self.states, self.actions)
+        except FileNotFoundError:
+            return QTable(self.actions, self.states)
 
     def save_q_table(self):
         """Saves the current Q-table to the log file."""
-        self.q_table.to_csv(self.q_table_file)
+        self.q_table.save_csv(self.q_table_file)
         print(f"Q-table saved to {self.q_table_file}")
 
+    def checkpoint(self):
+        """Persists the Q-table, buffered performance rows and replay pages."""
+        self.flush_performance_log()
+        self.replay.flush()
+        self.save_q_table()
+
+    def close(self):
+        """Writes buffered performance rows and releases the replay store."""
+        self.flush_performance_log()
+        self.replay.close()
+
     def choose_action(self, state):
         """Chooses an action based on the current policy."""
-        if state not in self.q_table.index:
-            self.q_table.loc[state] = 0.0
+        row = self.q_table.row(state)
         
         if self.train_mode:
-            untrained = self.q_table.loc[state][self.q_table.loc[state] == 0].index.tolist()
+            untrained = [a for a, q in zip(self.actions, row) if q == 0]
             if untrained:
                 action = random.choice(untrained)
                 print(f"Training: Trying untrained action '{action}'")
@@ -83,11 +128,11 @@ class RLTrainer:
             action = random.choice(self.actions)
             print(f"RL: Exploring -> {action}")
         else:
-            action = self.q_table.loc[state].idxmax()
+            action = self.q_table.best_action(state)
             print(f"RL: Best strategy -> {action}")
         
         # Publish to bus
-        q_value = self.q_table.loc[state, action]
+        q_value = self.q_table.get(state, action)
         bus.publish("rl.action_chosen", {
             "state": state,
             "action": action,
@@ -97,60 +142,120 @@ class RLTrainer:
     
     def _show_best_strategy(self, state):
         """Show current best strategy for the state."""
-        best_action = self.q_table.loc[state].idxmax()
-        best_value = self.q_table.loc[state].max()
+        best_action = self.q_table.best_action(state)
+        best_value = self.q_table.row(state).max()
         print(f"Best for {state}: {best_action} (Q={best_value:.3f})")
     
     def show_learning_progress(self):
         """Display learned strategies for all states."""
         print("\n=== LEARNED STRATEGIES ===")
         for state in self.states:
-            if state in self.q_table.index:
-                best_action = self.q_table.loc[state].idxmax()
-                best_value = self.q_table.loc[state].max()
+            if state in self.q_table:
+                best_action = self.q_table.best_action(state)
+                best_value = self.q_table.row(state).max()
                 print(f"{state}: {best_action} (Q={best_value:.3f})")
         print("========================\n")
 
+    @property
+    def experience_buffer(self):
+        """Buffered experiences as (state, action, reward, next_state), oldest first."""
+        states, actions = self.replay.states, self.replay.actions
+        return [(states[r['state']], actions[r['action']], float(r['reward']), states[r['next_state']])
+                for r in self.replay.records()]
+
     def _add_experience(self, state, action, reward, next_state):
         """Add experience to replay buffer for advanced algorithms."""
-        experience = (state, action, reward, next_state)
-        self.experience_buffer.append(experience)
-        if len(self.experience_buffer) > self.buffer_size:
-            self.experience_buffer.pop(0)
+        self.replay.append(state, action, reward, next_state)
+
+    def _replay_to_q(self, states, actions, next_states):
+        """Translate replay store indexes to Q-table rows and columns."""
+        names = self.replay.states
+        if len(self._replay_rows) < len(names):
+            added = [self.q_table.index(name) for name in names[len(self._replay_rows):]]
+            self._replay_rows = np.concatenate([self._replay_rows, np.array(added, dtype=np.intp)])
+        actions_known = self.replay.actions
+        if len(self._replay_columns) < len(actions_known):
+            added = [self.q_table.action_index[a] for a in actions_known[len(self._replay_columns):]]
+            self._replay_columns = np.concatenate([self._replay_columns, np.array(added, dtype=np.intp)])
+        return self._replay_rows[states], self._replay_columns[actions], self._replay_rows[next_states]
     
     def _double_dqn_update(self, state, action, reward, next_state):
         """Double DQN learning update to reduce overestimation bias."""
-        if next_state not in self.q_table.index:
-            self.q_table.loc[next_state] = 0.0
+        next_row = self.q_table.row(next_state)
         
         # Double DQN: Use main network to select action, target to evaluate
-        best_next_action = self.q_table.loc[next_state].idxmax()
-        target_q = reward + self.gamma * self.q_table.loc[next_state, best_next_action]
+        best_next_action = self.actions[int(np.argmax(next_row))]
+        target_q = reward + self.gamma * self.q_table.get(next_state, best_next_action)
         
-        old_value = self.q_table.loc[state, action]
+        old_value = self.q_table.get(state, action)
         new_value = old_value + self.alpha * (target_q - old_value)
-        self.q_table.loc[state, action] = new_value
+        self.q_table.set(state, action, new_value)
         
         return old_value, new_value
     
     def _actor_critic_update(self, state, action, reward, next_state):
         """Simplified Actor-Critic update using advantage estimation."""
-        if next_state not in self.q_table.index:
-            self.q_table.loc[next_state] = 0.0
+        next_row = self.q_table.row(next_state)
         
         # Critic: Estimate state value
-        state_value = self.q_table.loc[state].mean()
-        next_state_value = self.q_table.loc[next_state].mean()
+        state_value = self.q_table.row(state).mean()
+        next_state_value = next_row.mean()
         
         # TD error (advantage)
         td_error = reward + self.gamma * next_state_value - state_value
         
         # Actor: Update action probabilities based on advantage
-        old_value = self.q_table.loc[state, action]
+        old_value = self.q_table.get(state, action)
         new_value = old_value + self.alpha * td_error
-        self.q_table.loc[state, action] = new_value
+        self.q_table.set(state, action, new_value)
         
         return old_value, new_value
+
+    def learn_batch(self, batch_size=None, rng=None):
+        """
+        Vectorized update over a batch sampled from the experience buffer.
+
+        Q-learning targets r + gamma * max_a Q(s', a); double_dqn selects a'
+        with the online table and evaluates it with the target table, which
+        is re-synced every target_sync_interval batches. Repeated (s, a)
+        pairs in a batch accumulate their updates. With prioritized_replay,
+        batches are drawn by |TD error| and updates are importance-weighted.
+
+        Returns:
+            Mean absolute TD error of the batch (0.0 if the buffer is empty)
+        """
+        if len(self.replay) == 0:
+            return 0.0
+        batch = self.replay.sample(batch_size or self.batch_size, rng=rng, prioritized=self.prioritized_replay)
+        states, actions, next_states = self._replay_to_q(batch['state'], batch['action'], batch['next_state'])
+        rewards = batch['reward']
+        
+        q = self.q_table.values
+        if self.algorithm == "double_dqn":
+            target_values = self._synced_target(q)
+            best_next = np.argmax(q[next_states], axis=1)
+            next_q = target_values[next_states, best_next]
+        else:
+            next_q = q[next_states].max(axis=1)
+        
+        td_error = rewards + self.gamma * next_q - q[states, actions]
+        step = self.alpha * td_error
+        if self.prioritized_replay:
+            step = step * batch['weights']
+            self.replay.update_priorities(batch['slots'], td_error)
+        np.add.at(q, (states, actions), step)
+        self._batch_updates += 1
+        
+        if self.train_mode:
+            self.epsilon = max(self.min_epsilon, self.epsilon * self.epsilon_decay)
+        return float(np.abs(td_error).mean())
+
+    def _synced_target(self, q):
+        """Target table for double_dqn, refreshed on schedule or when states were added."""
+        if (self._target_values.shape != q.shape
+                or self._batch_updates % self.target_sync_interval == 0):
+            self._target_values = q.copy()
+        return self._target_values
     
     def learn(self, state, action, base_reward, user_feedback=None, next_state="no_failure"):
         """Enhanced learning with multiple algorithms."""
@@ -169,9 +274,9 @@ class RLTrainer:
         elif self.algorithm == "actor_critic":
             old_value, new_value = self._actor_critic_update(state, action, final_reward, next_state)
         else:  # Default Q-learning
-            old_value = self.q_table.loc[state, action]
+            old_value = self.q_table.get(state, action)
             new_value = old_value + self.alpha * (final_reward - old_value)
-            self.q_table.loc[state, action] = new_value
+            self.q_table.set(state, action, new_value)
         
         # Decay exploration
         if self.train_mode:
@@ -194,7 +299,8 @@ class RLTrainer:
         return {
             "algorithm": self.algorithm,
             "epsilon": self.epsilon,
-            "experience_buffer_size": len(self.experience_buffer),
+            "experience_buffer_size": len(self.replay),
+            "batch_updates": self._batch_updates,
             "q_table_shape": self.q_table.shape,
             "avg_q_value": float(self.q_table.values.mean())
         }
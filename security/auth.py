@@ -3,14 +3,90 @@
 import jwt
 import os
 import time
+import hashlib
+import threading
+from collections import OrderedDict
 from functools import wraps
 
+class VerifiedTokenCache:
+    """Bounded LRU of token verification results keyed by token hash.
+
+    clear() starts a new generation; a put() for a result computed in an
+    earlier generation is dropped.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        """Cached result for token, or None if absent or expired."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, result: dict, expires_at: float, generation: int = None):
+        key = self._key(token)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        return {'size': len(self._entries), 'max_size': self.max_size,
+                'hits': self.hits, 'misses': self.misses}
+
 class TokenAuth:
-    """JWT token authentication."""
+    """JWT token authentication.
+
+    Verification results are cached: valid tokens until the earlier of
+    their exp claim and ``cache_ttl``, invalid ones for ``negative_ttl``.
+    Changing ``secret_key`` clears the cache. ``cache_size=0`` disables it.
+    """
     
-    def __init__(self, secret_key: str = None):
+    def __init__(self, secret_key: str = None, cache_size: int = 1024, cache_ttl: float = 60.0,
+                 negative_ttl: float = 5.0):
+        self.cache = VerifiedTokenCache(cache_size) if cache_size > 0 else None
+        self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
         self.secret_key = secret_key or os.getenv('JWT_SECRET_KEY', 'default-jwt-secret-change-in-prod')
         self.algorithm = 'HS256'
+
+    @property
+    def secret_key(self) -> str:
+        return self._secret_key
+
+    @secret_key.setter
+    def secret_key(self, value: str):
+        """Rotate the signing secret; cached verifications no longer apply."""
+        self._secret_key = value
+        if self.cache is not None:
+            self.cache.clear()
     
     def generate_token(self, user_id: str, expires_in: int = 3600) -> str:
         """Generate JWT token."""
@@ -23,6 +99,27 @@ class TokenAuth:
     
     def verify_token(self, token: str) -> dict:
         """Verify JWT token."""
+        if self.cache is None:
+            return self._decode(token)
+        cached = self.cache.get(token)
+        if cached is not None:
+            return dict(cached)
+
+        # A rotation during _decode must not leave an old-key result cached
+        generation = self.cache.generation
+        result = self._decode(token)
+        now = time.time()
+        if result['valid']:
+            expires_at = now + self.cache_ttl
+            exp = result['payload'].get('exp')
+            if isinstance(exp, (int, float)):
+                expires_at = min(expires_at, exp)
+        else:
+            expires_at = now + self.negative_ttl
+        self.cache.put(token, result, expires_at, generation)
+        return dict(result)
+
+    def _decode(self, token: str) -> dict:
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
             return {'valid': True, 'payload': payload}
@@ -3,68 +3,306 @@
 import time
 import json
 import os
-from typing import Set
+import math
+import threading
+from typing import Callable, Dict, List, Optional
 
-class NonceStore:
-    """Stores nonces to prevent replay attacks."""
-    
-    def __init__(self, store_file: str = 'security/nonce_store.json', ttl: int = 3600):
-        self.store_file = store_file
-        self.ttl = ttl  # Time-to-live in seconds
-        self.nonces: Set[str] = set()
-        self.nonce_timestamps = {}
-        self._load_store()
-    
-    def _load_store(self):
-        """Load nonces from file."""
-        if os.path.exists(self.store_file):
+class TimingWheelNonceBackend:
+    """In-process nonce set with hashed-timing-wheel expiry and an append log.
+
+    Nonces land in the wheel bucket for their insert tick; a bucket is
+    swept as a whole once every nonce in it is past its TTL, so insert and
+    expiry are O(1) amortized. Each accepted nonce is appended to the log,
+    which is compacted to the live set once it grows well past it.
+    """
+
+    def __init__(self, log_file: Optional[str] = 'security/nonce_store.log', ttl: int = 3600,
+                 bucket_seconds: float = None, compact_min_lines: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self.log_file = log_file
+        self.compact_min_lines = compact_min_lines
+        self.clock = clock
+        self.bucket_seconds = bucket_seconds or max(1.0, ttl / 60.0)
+        self._ticks_per_ttl = math.ceil(ttl / self.bucket_seconds)
+        self._num_slots = self._ticks_per_ttl + 2
+        self._slots: List[List[str]] = [[] for _ in range(self._num_slots)]
+        self._slot_tick = [-1] * self._num_slots
+        self._swept_tick = None
+        self._seen: Dict[str, float] = {}
+        self._log = None
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _load(self):
+        """Rebuild live nonces from the legacy JSON store and the append log."""
+        if not self.log_file:
+            return
+        now = self.clock()
+        legacy_file = os.path.splitext(self.log_file)[0] + '.json'
+        entries = {}
+        if os.path.exists(legacy_file):
             try:
-                with open(self.store_file, 'r') as f:
-                    data = json.load(f)
-                    self.nonces = set(data.get('nonces', []))
-                    self.nonce_timestamps = data.get('timestamps', {})
-                    self._cleanup_expired()
+                with open(legacy_file, 'r') as f:
+                    entries.update(json.load(f).get('timestamps', {}))
             except Exception:
                 pass
-    
-    def _save_store(self):
-        """Save nonces to file."""
-        os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
-        with open(self.store_file, 'w') as f:
-            json.dump({
-                'nonces': list(self.nonces),
-                'timestamps': self.nonce_timestamps
-            }, f)
-    
-    def _cleanup_expired(self):
-        """Remove expired nonces."""
-        current_time = time.time()
-        expired = [
-            nonce for nonce, timestamp in self.nonce_timestamps.items()
-            if current_time - timestamp > self.ttl
-        ]
-        for nonce in expired:
-            self.nonces.discard(nonce)
-            self.nonce_timestamps.pop(nonce, None)
-    
+        if os.path.exists(self.log_file):
+            try:
+                with open(self.log_file, 'r') as f:
+                    for line in f:
+                        nonce, _, timestamp = line.rstrip('\n').rpartition('\t')
+                        if nonce:
+                            entries[nonce] = float(timestamp)
+                            self._log_lines += 1
+            except Exception:
+                pass
+        self._advance(now)
+        for nonce, timestamp in sorted(entries.items(), key=lambda item: item[1]):
+            if now - timestamp <= self.ttl:
+                self._insert(nonce, timestamp)
+
+    def _insert(self, nonce: str, timestamp: float):
+        tick = self._tick(timestamp)
+        slot = tick % self._num_slots
+        if self._slot_tick[slot] != tick:
+            self._sweep_slot(slot)
+            self._slot_tick[slot] = tick
+        self._slots[slot].append(nonce)
+        self._seen[nonce] = timestamp
+
+    def _sweep_slot(self, slot: int):
+        """Drop every nonce still owned by slot."""
+        tick = self._slot_tick[slot]
+        for nonce in self._slots[slot]:
+            timestamp = self._seen.get(nonce)
+            if timestamp is not None and self._tick(timestamp) == tick:
+                del self._seen[nonce]
+        self._slots[slot] = []
+        self._slot_tick[slot] = -1
+
+    def _advance(self, now: float):
+        """Sweep buckets whose nonces have all expired."""
+        target = self._tick(now) - self._ticks_per_ttl - 1
+        start = target - self._num_slots + 1
+        if self._swept_tick is not None:
+            start = max(start, self._swept_tick + 1)
+        for tick in range(start, target + 1):
+            slot = tick % self._num_slots
+            if self._slot_tick[slot] == tick:
+                self._sweep_slot(slot)
+        if self._swept_tick is None or target > self._swept_tick:
+            self._swept_tick = target
+
+    def _append_log(self, nonce: str, timestamp: float):
+        if not self.log_file:
+            return
+        if self._log is None:
+            os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+            self._log = open(self.log_file, 'a', buffering=1)
+        self._log.write(f"{nonce}\t{timestamp}\n")
+        self._log_lines += 1
+        if self._log_lines > max(self.compact_min_lines, 2 * len(self._seen)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with only live nonces (temp file plus rename)."""
+        if not self.log_file:
+            return
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        tmp_file = self.log_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            for nonce, timestamp in self._seen.items():
+                f.write(f"{nonce}\t{timestamp}\n")
+        os.replace(tmp_file, self.log_file)
+        self._log_lines = len(self._seen)
+
+    def add(self, nonce: str) -> bool:
+        """Store nonce; False if it was already seen within the TTL."""
+        with self._lock:
+            now = self.clock()
+            self._advance(now)
+            timestamp = self._seen.get(nonce)
+            if timestamp is not None and now - timestamp <= self.ttl:
+                return False
+            self._insert(nonce, now)
+            self._append_log(nonce, now)
+            return True
+
+    def record(self, nonce: str):
+        """Store a nonce already known to be new, skipping the lookup."""
+        with self._lock:
+            now = self.clock()
+            self._advance(now)
+            self._insert(nonce, now)
+            self._append_log(nonce, now)
+
+    def contains(self, nonce: str) -> bool:
+        with self._lock:
+            now = self.clock()
+            self._advance(now)
+            timestamp = self._seen.get(nonce)
+            return timestamp is not None and now - timestamp <= self.ttl
+
+    def live_nonces(self) -> List[str]:
+        """Nonces still within the TTL, including those reloaded from the log."""
+        with self._lock:
+            now = self.clock()
+            self._advance(now)
+            return [nonce for nonce, timestamp in self._seen.items() if now - timestamp <= self.ttl]
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+class RedisNonceBackend:
+    """Nonce set shared across processes via Redis ``SET key 1 NX EX ttl``.
+
+    Nonces passed to record() are written behind in pipelined batches;
+    pending writes are flushed before any exact check. Other processes add
+    nonces this one never sees, so NonceStore does not accept a prefilter
+    in front of this backend.
+    """
+
+    def __init__(self, client, ttl: int = 3600, prefix: str = 'nonce:', write_batch: int = 100):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.write_batch = write_batch
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, nonce: str) -> bool:
+        self.flush()
+        return bool(self.client.set(self.prefix + nonce, 1, nx=True, ex=self.ttl))
+
+    def record(self, nonce: str):
+        with self._lock:
+            self._pending.append(self.prefix + nonce)
+            if len(self._pending) < self.write_batch:
+                return
+        self.flush()
+
+    def flush(self):
+        """Write pending recorded nonces in one pipeline."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key in pending:
+            pipe.set(key, 1, ex=self.ttl)
+        pipe.execute()
+
+    def contains(self, nonce: str) -> bool:
+        self.flush()
+        return bool(self.client.exists(self.prefix + nonce))
+
+    def close(self):
+        self.flush()
+
+class _StandInPipeline:
+    def __init__(self, client):
+        self.client = client
+        self._commands = []
+
+    def set(self, *args, **kwargs):
+        self._commands.append((args, kwargs))
+        return self
+
+    def execute(self) -> list:
+        results = [self.client.set(*args, **kwargs) for args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+class InMemoryRedisStandIn:
+    """In-memory stand-in for the Redis commands the nonce backend uses."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name: str) -> bool:
+        entry = self._data.get(name)
+        if entry is None:
+            return False
+        expires_at = entry[1]
+        if expires_at is not None and self.clock() >= expires_at:
+            del self._data[name]
+            return False
+        return True
+
+    def set(self, name: str, value, nx: bool = False, ex: Optional[int] = None):
+        with self._lock:
+            if nx and self._live(name):
+                return None
+            self._data[name] = (value, self.clock() + ex if ex else None)
+            return True
+
+    def exists(self, name: str) -> int:
+        with self._lock:
+            return int(self._live(name))
+
+    def pipeline(self, transaction: bool = True) -> _StandInPipeline:
+        return _StandInPipeline(self)
+
+class NonceStore:
+    """Stores nonces to prevent replay attacks.
+
+    An optional prefilter (see security.replay_filter) answers "definitely
+    new" for most fresh nonces so the backend only takes a blind insert.
+    The filter must know every live nonce, so it is seeded from the
+    backend's live_nonces() at construction (covering nonces accepted before
+    a restart) and is refused for backends without it, such as the shared
+    RedisNonceBackend. Use it where each message is verified by a single
+    consumer.
+    """
+
+    def __init__(self, store_file: str = 'security/nonce_store.log', ttl: int = 3600, backend=None,
+                 prefilter=None):
+        self.store_file = store_file
+        self.ttl = ttl  # Time-to-live in seconds
+        self.backend = backend if backend is not None else TimingWheelNonceBackend(store_file, ttl=ttl)
+        self.prefilter = prefilter
+        self._lock = threading.Lock()
+        if prefilter is not None:
+            live_nonces = getattr(self.backend, 'live_nonces', None)
+            if live_nonces is None:
+                raise ValueError(f"{type(self.backend).__name__} cannot seed a replay prefilter; "
+                                 "nonces it holds would be reported as definitely new")
+            for nonce in live_nonces():
+                prefilter.add(nonce)
+
     def check_and_store(self, nonce: str) -> bool:
         """Check if nonce is valid and store it. Returns True if valid (not seen before)."""
-        self._cleanup_expired()
-        
-        if nonce in self.nonces:
-            return False  # Replay attack detected
-        
-        # Store nonce
-        self.nonces.add(nonce)
-        self.nonce_timestamps[nonce] = time.time()
-        self._save_store()
-        
-        return True
-    
+        if self.prefilter is None:
+            return self.backend.add(nonce)
+        with self._lock:
+            if not self.prefilter.check_and_add(nonce):
+                self.backend.record(nonce)
+                return True
+            return self.backend.add(nonce)
+
     def is_valid(self, nonce: str) -> bool:
         """Check if nonce is valid without storing."""
-        self._cleanup_expired()
-        return nonce not in self.nonces
+        if self.prefilter is not None and not self.prefilter.might_contain(nonce):
+            return True
+        return not self.backend.contains(nonce)
+
+    def close(self):
+        self.backend.close()
 
 # Global nonce store instance
 _nonce_store = None
@@ -78,4 +316,4 @@ def get_nonce_store() -> NonceStore:
 
 def check_nonce(nonce: str) -> bool:
     """Convenience function to check and store nonce."""
-    return get_nonce_store().check_and_store(nonce)
\ No newline at end of file
+    return get_nonce_store().check_and_store(nonce)
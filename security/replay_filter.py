@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""SSPL Phase III - Probabilistic Replay Pre-filter
+
+Rotating Bloom filter placed in front of NonceStore. A negative answer
+means the nonce is definitely new and the exact store only needs a blind
+insert; a positive answer ("maybe seen") falls through to the exact check.
+"""
+import math
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, List
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def positions(self, key: str) -> List[int]:
+        """Bit positions for key (double hashing over one blake2b digest)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def contains_positions(self, positions: List[int]) -> bool:
+        bits = self.bits
+        for pos in positions:
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add_positions(self, positions: List[int]):
+        bits = self.bits
+        for pos in positions:
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def add(self, key: str):
+        self.add_positions(self.positions(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_positions(self.positions(key))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+class RotatingBloomFilter:
+    """Bloom filter generations rotated every ``rotation_seconds``.
+
+    Set rotation_seconds to the nonce TTL: with two generations a nonce
+    stays in the filter for at least one full TTL. ``capacity`` is the
+    number of nonces expected per rotation period.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, rotation_seconds: float = 3600,
+                 generations: int = 2, clock: Callable[[], float] = time.time):
+        if generations < 2:
+            raise ValueError("generations must be at least 2")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rotation_seconds = rotation_seconds
+        self.clock = clock
+        self._generations = [BloomFilter(capacity, error_rate) for _ in range(generations)]
+        self._generation_start = clock()
+        self._lock = threading.Lock()
+        self.definitely_new = 0
+        self.maybe_seen = 0
+        self.rotations = 0
+
+    def _rotate(self, now: float):
+        elapsed = int((now - self._generation_start) // self.rotation_seconds)
+        if elapsed <= 0:
+            return
+        for _ in range(min(elapsed, len(self._generations))):
+            self._generations.pop()
+            self._generations.insert(0, BloomFilter(self.capacity, self.error_rate))
+        self._generation_start += elapsed * self.rotation_seconds
+        self.rotations += elapsed
+
+    def check_and_add(self, nonce: str) -> bool:
+        """Add nonce; returns True if it may have been seen before."""
+        with self._lock:
+            self._rotate(self.clock())
+            current = self._generations[0]
+            # All generations share a size, so one set of positions serves every check
+            positions = current.positions(nonce)
+            seen = False
+            for gen in self._generations:
+                if gen.contains_positions(positions):
+                    seen = True
+                    break
+            current.add_positions(positions)
+            if seen:
+                self.maybe_seen += 1
+            else:
+                self.definitely_new += 1
+            return seen
+
+    def add(self, nonce: str):
+        """Add nonce without counting a check (used to seed the filter)."""
+        with self._lock:
+            self._rotate(self.clock())
+            self._generations[0].add(nonce)
+
+    def might_contain(self, nonce: str) -> bool:
+        with self._lock:
+            self._rotate(self.clock())
+            positions = self._generations[0].positions(nonce)
+            return any(gen.contains_positions(positions) for gen in self._generations)
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(gen.memory_bytes for gen in self._generations)
+
+    def get_stats(self) -> Dict[str, float]:
+        checks = self.definitely_new + self.maybe_seen
+        return {
+            'checks': checks,
+            'definitely_new': self.definitely_new,
+            'maybe_seen': self.maybe_seen,
+            'fallthrough_rate': self.maybe_seen / checks if checks else 0.0,
+            'rotations': self.rotations,
+            'memory_bytes': self.memory_bytes,
+            'bits_per_generation': self._generations[0].num_bits,
+            'num_hashes': self._generations[0].num_hashes
+        }
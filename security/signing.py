@@ -4,6 +4,22 @@ import hashlib
 import hmac
 import json
 import os
+from typing import Optional, Tuple, Union
+
+SIGNATURE_ALGORITHM = 'HMAC-SHA256'
+
+# Envelope wire format: a fixed-width JSON header followed by the canonical
+# payload bytes, so receivers can slice out and verify the exact bytes that
+# were signed without re-serializing.
+ENVELOPE_HEADER = b'{"signature_algorithm":"HMAC-SHA256","signature":"'
+ENVELOPE_PAYLOAD_KEY = b'","payload":'
+_SIGNATURE_HEX_LEN = 64
+_PAYLOAD_OFFSET = len(ENVELOPE_HEADER) + _SIGNATURE_HEX_LEN + len(ENVELOPE_PAYLOAD_KEY)
+_ENVELOPE_HEADER_STR = ENVELOPE_HEADER.decode()
+
+def canonicalize(payload_dict: dict) -> bytes:
+    """Serialize payload to canonical JSON bytes."""
+    return json.dumps(payload_dict, sort_keys=True, separators=(',', ':')).encode()
 
 class PayloadSigner:
     """Signs and verifies payloads for SSPL Phase III compliance."""
@@ -11,22 +27,25 @@ class PayloadSigner:
     def __init__(self, secret_key: str = None):
         self.secret_key = secret_key or os.getenv('SSPL_SECRET_KEY', 'default-secret-key-change-in-prod')
     
+    def sign_bytes(self, canonical: bytes) -> str:
+        """Generate HMAC-SHA256 signature over canonical bytes."""
+        return hmac.digest(self.secret_key.encode(), canonical, hashlib.sha256).hex()
+    
+    def verify_bytes(self, canonical: bytes, signature: str) -> bool:
+        """Verify signature over canonical bytes."""
+        if not signature:
+            return False
+        # Constant-time comparison
+        return hmac.compare_digest(signature, self.sign_bytes(canonical))
+    
     def sign_payload(self, payload_dict: dict) -> dict:
         """Sign payload and return with signature field."""
-        # Create canonical string from payload
-        canonical = json.dumps(payload_dict, sort_keys=True, separators=(',', ':'))
-        
-        # Generate HMAC-SHA256 signature
-        signature = hmac.new(
-            self.secret_key.encode(),
-            canonical.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        signature = self.sign_bytes(canonicalize(payload_dict))
         
         # Add signature to payload
         signed_payload = payload_dict.copy()
         signed_payload['signature'] = signature
-        signed_payload['signature_algorithm'] = 'HMAC-SHA256'
+        signed_payload['signature_algorithm'] = SIGNATURE_ALGORITHM
         
         return signed_payload
     
@@ -43,18 +62,51 @@ class PayloadSigner:
         payload_copy.pop('signature', None)
         payload_copy.pop('signature_algorithm', None)
         
-        # Recreate canonical string
-        canonical = json.dumps(payload_copy, sort_keys=True, separators=(',', ':'))
+        return self.verify_bytes(canonicalize(payload_copy), signature)
+    
+    def seal_envelope(self, payload_dict: dict) -> Tuple[bytes, str]:
+        """Canonicalize payload once, sign it and wrap it in an envelope.
         
-        # Generate expected signature
-        expected_signature = hmac.new(
-            self.secret_key.encode(),
-            canonical.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        Returns:
+            (envelope bytes, signature)
+        """
+        canonical = canonicalize(payload_dict)
+        signature = self.sign_bytes(canonical)
+        envelope = b''.join((
+            ENVELOPE_HEADER, signature.encode(), ENVELOPE_PAYLOAD_KEY, canonical, b'}'
+        ))
+        return envelope, signature
+    
+    def open_envelope(self, envelope: Union[bytes, str]) -> Optional[dict]:
+        """Verify envelope against its raw payload bytes and decode it.
         
-        # Constant-time comparison
-        return hmac.compare_digest(signature, expected_signature)
+        Returns:
+            Payload dict, or None if the envelope is malformed or tampered
+        """
+        if isinstance(envelope, str):
+            envelope = envelope.encode()
+        if not is_envelope(envelope) or not envelope.endswith(b'}'):
+            return None
+        
+        signature_end = len(ENVELOPE_HEADER) + _SIGNATURE_HEX_LEN
+        if envelope[signature_end:_PAYLOAD_OFFSET] != ENVELOPE_PAYLOAD_KEY:
+            return None
+        
+        signature = envelope[len(ENVELOPE_HEADER):signature_end].decode('ascii', 'replace')
+        canonical = envelope[_PAYLOAD_OFFSET:-1]
+        if not self.verify_bytes(canonical, signature):
+            return None
+        
+        try:
+            return json.loads(canonical)
+        except ValueError:
+            return None
+
+def is_envelope(data: Union[bytes, str]) -> bool:
+    """Check whether raw message data uses the signed envelope format."""
+    if isinstance(data, str):
+        return data.startswith(_ENVELOPE_HEADER_STR)
+    return data.startswith(ENVELOPE_HEADER)
 
 # Global signer instance
 _signer = None
@@ -72,4 +124,12 @@ def sign_payload(payload_dict: dict) -> dict:
 
 def verify_payload(payload_dict: dict, signature: str = None) -> bool:
     """Convenience function to verify payload."""
-    return get_signer().verify_payload(payload_dict, signature)
\ No newline at end of file
+    return get_signer().verify_payload(payload_dict, signature)
+
+def seal_envelope(payload_dict: dict) -> Tuple[bytes, str]:
+    """Convenience function to build a signed envelope."""
+    return get_signer().seal_envelope(payload_dict)
+
+def open_envelope(envelope: Union[bytes, str]) -> Optional[dict]:
+    """Convenience function to verify and decode a signed envelope."""
+    return get_signer().open_envelope(envelope)
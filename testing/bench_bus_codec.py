@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Bus Codec Benchmark
+Compares encode/decode time and message size per codec on real bus payloads
+"""
+
+import sys
+import os
+import time
+import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bus_codec import get_codec, codec_backends, encode_message, decode_message
+from integration.event_schema import StandardEvent
+
+def sample_payloads():
+    """Bus messages as RedisEventBus builds them for typical events."""
+    deploy = StandardEvent.from_deployment('stage', 'success', 1523.7, dataset='student.csv', worker_id=2)
+    issue = StandardEvent.from_issue('prod', 'latency_spike', reason='p95 above threshold')
+    runtime = {
+        'timestamp': datetime.datetime.now().isoformat(),
+        'env': 'dev',
+        'event_type': 'scale',
+        'status': 'success',
+        'response_time': 231.5,
+        'dataset': 'patient.csv',
+        'scale_direction': 'up',
+        'worker_count': 4
+    }
+    return {
+        'StandardEvent(deploy)': deploy.to_dict(),
+        'StandardEvent(issue)': issue.to_dict(),
+        'runtime.scale': runtime
+    }
+
+def wrap(event_type, data):
+    return {
+        'event_type': event_type,
+        'data': data,
+        'timestamp': datetime.datetime.now().isoformat(),
+        'environment': 'dev',
+        'nonce': '6f1c2a8e-3b7d-4c61-9d0e-2f4a5b6c7d8e'
+    }
+
+def bench(codec_name, message, iterations=20000):
+    codec = get_codec(codec_name)
+    encoded = encode_message(message, codec)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode_message(message, codec)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_message(encoded)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    assert decode_message(encoded) == message
+    return encode_us, decode_us, len(encoded)
+
+if __name__ == "__main__":
+    print("📦 Bus Codec Benchmark")
+    print(f"   Backends: {codec_backends()}")
+    for label, data in sample_payloads().items():
+        message = wrap(label, data)
+        print(f"\n   {label}")
+        print(f"   {'codec':<10} {'encode µs':>10} {'decode µs':>10} {'bytes':>7}")
+        for codec_name in ['json', 'fast_json', 'msgpack']:
+            if codec_backends()[codec_name] == 'unavailable':
+                print(f"   {codec_name:<10} {'not installed':>30}")
+                continue
+            encode_us, decode_us, size = bench(codec_name, message)
+            print(f"   {codec_name:<10} {encode_us:>10.2f} {decode_us:>10.2f} {size:>7}")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Offline Trainer Benchmark
+Retraining throughput over a synthetic log history: replaying every
+experience through RLDecisionLayer.update_q_value in one process against
+rl.offline_trainer with one worker and with one worker per environment.
+"""
+
+import sys
+import os
+import csv
+import json
+import time
+import random
+import tempfile
+from collections import Counter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.rl_decision_layer import RLDecisionLayer
+from rl.offline_trainer import ENVS, train, _sources, _executable
+
+DECISIONS_PER_ENV = 100000
+ROWS_PER_ENV = 100000
+STATES = ['crash', 'overload', 'false_alarm', 'latency', 'memory_leak']
+ACTIONS = ['noop', 'restart', 'scale_up', 'scale_down', 'rollback']
+STRATEGIES = ['retry_deployment', 'restore_previous_version', 'scale_workers']
+
+def write_history(logs_dir, seed=7):
+    rng = random.Random(seed)
+    with open(os.path.join(logs_dir, 'day1_proof.log'), 'w') as f:
+        for i in range(DECISIONS_PER_ENV * len(ENVS)):
+            env = ENVS[i % len(ENVS)]
+            action = rng.choice(ACTIONS)
+            f.write(json.dumps({'event_name': 'RL_DECISION', 'timestamp': '2026-01-01T00:00:00', 'env': env,
+                                'event_type': rng.choice(STATES), 'decision_str': action,
+                                'status': 'decided'}) + '\n')
+            f.write(json.dumps({'event_name': 'RL_INTAKE_VALIDATED', 'timestamp': '2026-01-01T00:00:00',
+                                'env': env, 'action': action, 'source': 'rl_decision_layer'}) + '\n')
+            f.write(json.dumps({'event_name': rng.choice(['ORCH_EXEC', 'ORCH_REFUSE']),
+                                'timestamp': '2026-01-01T00:00:00', 'env': env, 'action': action}) + '\n')
+    for env in ENVS:
+        os.makedirs(os.path.join(logs_dir, env))
+        with open(os.path.join(logs_dir, env, 'deployment_log_worker_1.csv'), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'dataset_changed', 'status', 'response_time_ms', 'action_type',
+                             'environment', 'worker_id', 'app_name', 'build_id'])
+            for _ in range(ROWS_PER_ENV):
+                writer.writerow(['2026-01-01T00:00:00', 'data.csv', rng.choice(['success', 'failed']), 500,
+                                 rng.choice(['deploy', 'scale_up']), env, 1, 'app', 'b1'])
+    with open(os.path.join(logs_dir, 'healing_log.csv'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['timestamp', 'app_name', 'failure_type', 'strategy', 'status', 'duration_sec'])
+        for _ in range(ROWS_PER_ENV):
+            writer.writerow(['2026-01-01 00:00:00', 'app-1', rng.choice(STATES), rng.choice(STRATEGIES),
+                             rng.choice(['success', 'failure']), 20])
+
+def bench_update_q_value(logs_dir):
+    """Same streams, one update_q_value call per experience"""
+    start = time.perf_counter()
+    for env in ENVS:
+        layer = RLDecisionLayer(env=env, checkpoint_every=10 ** 9, checkpoint_interval=3600)
+        layer.q_table_path = os.path.join(logs_dir, 'reference', env, 'rl_q_table.json')
+        stats = Counter()
+        for experiences in _sources(logs_dir, env, 'dev', stats):
+            for state, action, reward in _executable(experiences, stats):
+                layer.update_q_value(state, action, reward)
+        layer.close()
+    return time.perf_counter() - start
+
+def bench_offline(logs_dir, workers):
+    start = time.perf_counter()
+    results = train(logs_dir, ENVS, workers=workers)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(r['stats']['experiences'] for r in results.values())
+
+def main():
+    with tempfile.TemporaryDirectory() as logs_dir:
+        write_history(logs_dir)
+        reference = bench_update_q_value(logs_dir)
+        serial, experiences = bench_offline(logs_dir, workers=1)
+        parallel, _ = bench_offline(logs_dir, workers=len(ENVS))
+
+    print(f"{experiences:,} experiences across {len(ENVS)} environments ({os.cpu_count()} CPUs)")
+    for name, elapsed in [("update_q_value per experience (before)", reference),
+                          ("offline trainer, 1 worker", serial),
+                          (f"offline trainer, {len(ENVS)} workers", parallel)]:
+        print(f"  {name:<40} {elapsed:>7.2f}s  {experiences / elapsed:>12,.0f} experiences/sec"
+              f"  ({reference / elapsed:,.1f}x)")
+
+if __name__ == "__main__":
+    main()
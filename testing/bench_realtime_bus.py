@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+RealtimeBus Microbenchmark
+Measures in-process publish and drain throughput (target: >100k msgs/sec)
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime_bus import RealtimeBus
+
+def bench_single_thread(n=200000):
+    """Publish n messages to one topic and drain them in batches."""
+    bus = RealtimeBus(queue_size=n, sample_interval=1.0)
+    start = time.perf_counter()
+    for i in range(n):
+        bus.publish('bench', {'i': i})
+    publish_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    drained = 0
+    while drained < n:
+        drained += len(bus.get_messages('bench', max_n=1000))
+    drain_elapsed = time.perf_counter() - start
+    bus.stop()
+    return n / publish_elapsed, n / drain_elapsed
+
+def bench_multi_topic(n=200000, threads=4):
+    """Publish n messages split across threads, one topic per thread."""
+    bus = RealtimeBus(queue_size=n, sample_interval=1.0)
+    per_thread = n // threads
+
+    def publisher(topic):
+        for i in range(per_thread):
+            bus.publish(topic, {'i': i})
+
+    workers = [threading.Thread(target=publisher, args=(f'bench.{t}',)) for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    bus.stop()
+    return per_thread * threads / elapsed
+
+if __name__ == "__main__":
+    publish_rate, drain_rate = bench_single_thread()
+    multi_rate = bench_multi_topic()
+    print("🚀 RealtimeBus Microbenchmark")
+    print(f"   Publish (1 thread):      {publish_rate:,.0f} msgs/sec")
+    print(f"   Drain (max_n=1000):      {drain_rate:,.0f} msgs/sec")
+    print(f"   Publish (4 threads/4 topics): {multi_rate:,.0f} msgs/sec")
+    print(f"   {'✅' if publish_rate > 100000 else '❌'} Target >100k msgs/sec")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+RL Trainer Benchmark
+Training steps/sec with the previous pandas DataFrame Q-table (per-step
+.loc lookups/assignments and a CSV append per step) against the numpy
+QTable, per step and with vectorized batch updates.
+"""
+
+import sys
+import os
+import csv
+import io
+import time
+import random
+import tempfile
+import contextlib
+from unittest.mock import patch
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+STEPS = 5000
+BATCH_SIZE = 32
+STATES = ["deployment_failure", "latency_issue", "anomaly_score", "anomaly_health"]
+ACTIONS = ["retry_deployment", "restore_previous_version", "adjust_thresholds"]
+
+def experiences(n, seed=7):
+    rng = random.Random(seed)
+    extra = [f"state_{i}" for i in range(60)]
+    for _ in range(n):
+        yield (rng.choice(STATES + extra), rng.choice(ACTIONS), rng.choice([1, -1]),
+               rng.choice(STATES + ["no_failure"]))
+
+class PandasTrainerReference:
+    """The previous RLTrainer storage and update path (double_dqn)."""
+
+    def __init__(self, performance_log_file):
+        self.q_table = pd.DataFrame(index=STATES, columns=ACTIONS, data=0.0)
+        self.performance_log_file = performance_log_file
+        self.alpha, self.gamma = 0.1, 0.95
+
+    def learn(self, state, action, reward, next_state):
+        with open(self.performance_log_file, 'a', newline='') as f:
+            csv.writer(f).writerow([pd.Timestamp.now().isoformat(), state, action, reward])
+        if state not in self.q_table.index:
+            self.q_table.loc[state] = 0.0
+        if next_state not in self.q_table.index:
+            self.q_table.loc[next_state] = 0.0
+        best_next_action = self.q_table.loc[next_state].idxmax()
+        target_q = reward + self.gamma * self.q_table.loc[next_state, best_next_action]
+        old_value = self.q_table.loc[state, action]
+        self.q_table.loc[state, action] = old_value + self.alpha * (target_q - old_value)
+
+def bench_pandas(tmp_dir):
+    trainer = PandasTrainerReference(os.path.join(tmp_dir, "pandas_perf.csv"))
+    data = list(experiences(STEPS))
+    start = time.perf_counter()
+    for exp in data:
+        trainer.learn(*exp)
+    return STEPS / (time.perf_counter() - start)
+
+def make_trainer(tmp_dir, name):
+    from rl.rl_trainer import RLTrainer
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RLTrainer(os.path.join(tmp_dir, f"{name}_q.csv"), os.path.join(tmp_dir, f"{name}_perf.csv"),
+                         algorithm="double_dqn", replay_dir=os.path.join(tmp_dir, f"{name}_replay"))
+
+def bench_numpy_per_step(tmp_dir):
+    trainer = make_trainer(tmp_dir, "step")
+    data = list(experiences(STEPS))
+    start = time.perf_counter()
+    for state, action, reward, next_state in data:
+        trainer._log_performance(state, action, reward)
+        trainer._add_experience(state, action, reward, next_state)
+        trainer._double_dqn_update(state, action, reward, next_state)
+    trainer.flush_performance_log()
+    return STEPS / (time.perf_counter() - start)
+
+def bench_numpy_batch(tmp_dir):
+    trainer = make_trainer(tmp_dir, "batch")
+    for state, action, reward, next_state in experiences(1000):
+        trainer._add_experience(state, action, reward, next_state)
+    rng = np.random.default_rng(7)
+    batches = STEPS // BATCH_SIZE
+    start = time.perf_counter()
+    for _ in range(batches):
+        trainer.learn_batch(BATCH_SIZE, rng=rng)
+    return batches * BATCH_SIZE / (time.perf_counter() - start)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir, patch('rl.rl_trainer.bus'):
+        results = [
+            ("pandas DataFrame, per step (before)", bench_pandas(tmp_dir)),
+            ("numpy QTable, per step", bench_numpy_per_step(tmp_dir)),
+            (f"numpy QTable, batches of {BATCH_SIZE}", bench_numpy_batch(tmp_dir)),
+        ]
+    print(f"{STEPS} double_dqn updates, {len(STATES) + 61} states")
+    baseline = results[0][1]
+    for name, rate in results:
+        print(f"  {name:<38} {rate:>12,.0f} steps/sec  ({rate / baseline:,.1f}x)")
+
+if __name__ == "__main__":
+    main()
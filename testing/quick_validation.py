@@ -17,8 +17,8 @@ def validate_system():
     # 1. Event Bus Validation
     print("\n🚌 Event Bus Status:")
     try:
-        with open("bus_events.json", 'r') as f:
-            bus_events = json.load(f)
+        from core.sovereign_bus import bus
+        bus_events = bus.get_messages()
         
         event_types = list(set([e["event_type"] for e in bus_events[-20:]]))
         
@@ -110,8 +110,8 @@ def validate_system():
     # Check if agents are publishing to bus
     agent_events = {}
     try:
-        with open("bus_events.json", 'r') as f:
-            events = json.load(f)
+        from core.sovereign_bus import bus
+        events = bus.get_messages()
         
         for event in events[-50:]:  # Last 50 events
             event_type = event["event_type"]
@@ -137,7 +137,8 @@ def validate_system():
     print("\n⚡ Real-time Features:")
     
     # Check if files are being updated
-    files_to_check = ["bus_events.json", "mcp_outbox.json", "insightflow/telemetry.json"]
+    from core.sovereign_bus import bus
+    files_to_check = [bus.active_segment_path, "mcp_outbox.json", "insightflow/telemetry.json"]
     recent_updates = 0
     
     for file_path in files_to_check:
@@ -0,0 +1,186 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from core.action_governance import ActionGovernance, GovernanceReason
+from core.governance_backend import LocalGovernanceBackend, RedisGovernanceBackend
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+class TestActionGovernance(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000000.0
+        patcher = patch('core.action_governance.time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.governance = ActionGovernance(env='dev')
+
+    def _evaluate(self, action, app_name):
+        return self.governance.evaluate_action(action, {'app_name': app_name})
+
+    def test_cooldown_is_scoped_per_app(self):
+        self.assertFalse(self._evaluate('restart', 'app-a').should_block)
+        self.assertFalse(self._evaluate('restart', 'app-b').should_block)
+
+        decision = self._evaluate('restart', 'app-a')
+        self.assertTrue(decision.should_block)
+        self.assertEqual(decision.reason, GovernanceReason.COOLDOWN_ACTIVE.value)
+        self.assertEqual(decision.details['app_name'], 'app-a')
+
+    def test_cooldown_expires(self):
+        self._evaluate('restart', 'app-a')
+        self.now += 61
+        self.assertFalse(self._evaluate('restart', 'app-a').should_block)
+
+    def test_repetition_limit_within_window(self):
+        governance = ActionGovernance(env='dev', cooldown_periods={'restart': 0})
+        for _ in range(3):
+            self.assertFalse(governance.evaluate_action('restart', {'app_name': 'a'}).should_block)
+            self.now += 10
+
+        decision = governance.evaluate_action('restart', {'app_name': 'a'})
+        self.assertTrue(decision.should_block)
+        self.assertEqual(decision.reason, GovernanceReason.REPETITION_LIMIT_EXCEEDED.value)
+        self.assertEqual(decision.details['actual'], 3)
+        self.assertFalse(governance.evaluate_action('restart', {'app_name': 'b'}).should_block)
+
+        # Once the window (plus at most one bucket) has passed, the app may act again
+        self.now += 300 + governance._bucket_width
+        self.assertFalse(governance.evaluate_action('restart', {'app_name': 'a'}).should_block)
+
+    def test_idle_keys_are_evicted(self):
+        for i in range(200):
+            self._evaluate('restart', f'app-{i}')
+        self.assertEqual(self.governance.get_config()['tracked_keys'], 200)
+
+        self.now += 301
+        self._evaluate('restart', 'app-new')
+        self.assertEqual(self.governance.get_config()['tracked_keys'], 1)
+
+    def test_action_history_filters_by_app(self):
+        self._evaluate('restart', 'app-a')
+        self._evaluate('scale_up', 'app-b')
+        history = self.governance.get_action_history(app_name='app-b')
+        self.assertEqual([r['action'] for r in history], ['scale_up'])
+
+    def test_shared_backend_enforces_limits_across_instances(self):
+        backend = LocalGovernanceBackend()
+        worker_a = ActionGovernance(env='dev', backend=backend)
+        worker_b = ActionGovernance(env='dev', backend=backend)
+        self.assertFalse(worker_a.evaluate_action('restart', {'app_name': 'a'}).should_block)
+        self.assertTrue(worker_b.evaluate_action('restart', {'app_name': 'a'}).should_block)
+
+    def test_blocked_until_cache_skips_backend(self):
+        backend = LocalGovernanceBackend()
+        governance = ActionGovernance(env='dev', backend=backend)
+        governance.evaluate_action('restart', {'app_name': 'a'})
+        governance.evaluate_action('restart', {'app_name': 'a'})
+
+        with patch.object(backend, 'check') as check:
+            self.now += 30
+            decision = governance.evaluate_action('restart', {'app_name': 'a'})
+        check.assert_not_called()
+        self.assertTrue(decision.should_block)
+        self.assertEqual(decision.details['time_remaining'], '30.0s')
+        self.assertEqual(governance.blocked_cache_hits, 1)
+
+        self.now += 31
+        self.assertFalse(governance.evaluate_action('restart', {'app_name': 'a'}).should_block)
+
+    def test_evaluate_many_has_no_side_effects(self):
+        self._evaluate('restart', 'app-a')
+        candidates = [('app-a', 'restart', 0.9), ('app-b', 'restart', 0.9), ('app-b', 'restart', 0.9),
+                      (None, 'restart', 0.9), ('app-c', 'deploy', 0.9)]
+        batch = self.governance.evaluate_many(candidates)
+
+        self.assertEqual(batch.blocked, [True, False, False, True, True])
+        self.assertEqual(batch.reasons, [
+            GovernanceReason.COOLDOWN_ACTIVE.value, None, None,
+            GovernanceReason.PREREQUISITE_NOT_MET.value, GovernanceReason.ACTION_NOT_ELIGIBLE.value
+        ])
+        self.assertEqual(batch.allowed_indices(), [1, 2])
+        self.assertIsNone(batch.details(1))
+        self.assertEqual(batch.details(0)['app_name'], 'app-a')
+        self.assertEqual(batch.decision(4).details['action'], 'deploy')
+
+        # Nothing was recorded: app-b can still be committed
+        self.assertEqual(self.governance.get_config()['tracked_keys'], 1)
+        self.assertFalse(self._evaluate('restart', 'app-b').should_block)
+
+    def test_evaluate_many_matches_evaluate_action(self):
+        governance = ActionGovernance(env='stage')
+        governance.evaluate_action('scale_up', {'app_name': 'a'})
+        for candidate in [('a', 'scale_up'), ('b', 'scale_up'), ('a', 'rollback'), (None, 'noop')]:
+            batch_reason = governance.evaluate_many([candidate]).reasons[0]
+            probe = ActionGovernance(env='stage', backend=governance.backend)
+            self.assertEqual(batch_reason, probe.evaluate_action(candidate[1], {'app_name': candidate[0]}).reason)
+            governance.backend.reset()
+            governance.evaluate_action('scale_up', {'app_name': 'a'})
+
+class TestRedisGovernanceBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.script = self.client.register_script.return_value
+        self.backend = RedisGovernanceBackend(self.client)
+
+    def test_check_is_one_script_call(self):
+        self.script.return_value = [b'ok', b'', 0, b'0']
+        result = self.backend.check(('app-a', 'restart'), 1000.0, cooldown=60, window=300, limit=3,
+                                    bucket_width=10.0, idle_after=300)
+        self.assertTrue(result['allowed'])
+        self.script.assert_called_once()
+        kwargs = self.script.call_args.kwargs
+        self.assertEqual(kwargs['keys'], ['governance:app-a|restart'])
+        self.assertEqual(kwargs['args'][-1], '1')
+
+    def test_blocked_result_parsed(self):
+        self.script.return_value = [b'cooldown', b'990.5', 0, b'1050.5']
+        result = self.backend.check(('app-a', 'restart'), 1000.0, cooldown=60, window=300, limit=3,
+                                    bucket_width=10.0, idle_after=300)
+        self.assertFalse(result['allowed'])
+        self.assertEqual(result['reason'], 'cooldown_active')
+        self.assertEqual(result['last_execution'], 990.5)
+        self.assertEqual(result['blocked_until'], 1050.5)
+
+class _BackendContract:
+    """Behaviour both governance backends must share."""
+
+    def _check(self, key, now, limit=2):
+        return self.backend.check(key, now, cooldown=0, window=300, limit=limit, bucket_width=10.0,
+                                  idle_after=300)
+
+    def test_repetition_window(self):
+        self.assertTrue(self._check(('a', 'restart'), 1000.0)['allowed'])
+        self.assertTrue(self._check(('a', 'restart'), 1005.0)['allowed'])
+        result = self._check(('a', 'restart'), 1010.0)
+        self.assertEqual(result['reason'], 'repetition_limit_exceeded')
+        self.assertEqual(result['blocked_until'], 1310.0)
+
+    def test_zero_limit_blocks_without_buckets(self):
+        result = self._check(('b', 'restart'), 1000.0, limit=0)
+        self.assertEqual(result['reason'], 'repetition_limit_exceeded')
+        self.assertEqual((result['count'], result['blocked_until']), (0, 0.0))
+
+class TestLocalBackendContract(_BackendContract, unittest.TestCase):
+
+    def setUp(self):
+        self.backend = LocalGovernanceBackend()
+
+@unittest.skipIf(redis is None, "redis client not installed")
+class TestRedisScriptContract(_BackendContract, unittest.TestCase):
+    """Runs the Lua check script on a real Redis server when one is reachable."""
+
+    def setUp(self):
+        client = redis.Redis(host='127.0.0.1', port=6379, socket_connect_timeout=0.2)
+        try:
+            client.ping()
+        except redis.RedisError:
+            self.skipTest("no Redis server on 127.0.0.1:6379")
+        self.backend = RedisGovernanceBackend(client, prefix=f'test-governance-{id(self)}:')
+        self.addCleanup(self.backend.reset)
+
+if __name__ == '__main__':
+    unittest.main()
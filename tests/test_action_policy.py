@@ -0,0 +1,118 @@
+import unittest
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+from core.action_policy import (
+    ActionPolicy, compile_policy, SOURCE_GOVERNANCE, SOURCE_SAFE_ORCHESTRATOR,
+    SOURCE_RL_BRAIN, SOURCE_ORCHESTRATOR_SERVICE
+)
+
+POLICY = {
+    'actions': ['noop', 'restart', 'scale_up'],
+    'environments': {
+        'dev': {'allowed': ['noop', 'restart', 'scale_up'], 'sources': {'narrow': ['noop']}},
+        '*': {'allowed': ['noop']}
+    }
+}
+
+class TestActionPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'policy.json')
+        self._write(POLICY)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, document, mtime=None):
+        with open(self.path, 'w') as f:
+            json.dump(document, f)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_sources_narrow_environment_ceiling(self):
+        policy = ActionPolicy(self.path)
+        self.assertTrue(policy.is_allowed('restart', 'dev', 'other'))
+        self.assertFalse(policy.is_allowed('restart', 'dev', 'narrow'))
+        self.assertEqual(policy.allowed_actions('dev', 'narrow'), ['noop'])
+        self.assertFalse(policy.is_allowed('unknown_action', 'dev'))
+
+    def test_unknown_environment_uses_fallback(self):
+        policy = ActionPolicy(self.path)
+        self.assertTrue(policy.is_allowed('noop', 'qa'))
+        self.assertFalse(policy.is_allowed('restart', 'qa'))
+
+    def test_compile_rejects_invalid_policies(self):
+        widened = json.loads(json.dumps(POLICY))
+        widened['environments']['*']['sources'] = {'narrow': ['restart']}
+        with self.assertRaises(ValueError):
+            compile_policy(widened)
+
+        unknown = json.loads(json.dumps(POLICY))
+        unknown['environments']['dev']['allowed'].append('deploy')
+        with self.assertRaises(ValueError):
+            compile_policy(unknown)
+
+        no_fallback = json.loads(json.dumps(POLICY))
+        del no_fallback['environments']['*']
+        with self.assertRaises(ValueError):
+            compile_policy(no_fallback)
+
+    def test_hot_reload_on_change(self):
+        policy = ActionPolicy(self.path, check_interval=0)
+        self.assertTrue(policy.is_allowed('restart', 'dev'))
+
+        updated = json.loads(json.dumps(POLICY))
+        updated['environments']['dev']['allowed'] = ['noop']
+        updated['environments']['dev']['sources'] = {}
+        self._write(updated, mtime=os.path.getmtime(self.path) + 10)
+        self.assertFalse(policy.is_allowed('restart', 'dev'))
+
+    def test_invalid_edit_keeps_previous_policy(self):
+        policy = ActionPolicy(self.path, check_interval=0)
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        os.utime(self.path, (1, 1))
+        self.assertTrue(policy.is_allowed('restart', 'dev'))
+
+class TestShippedPolicy(unittest.TestCase):
+    """The shipped policy preserves each layer's allowlist."""
+
+    def setUp(self):
+        self.policy = ActionPolicy()
+
+    def test_layer_allowlists(self):
+        expected = {
+            SOURCE_GOVERNANCE: {
+                'dev': {'restart', 'scale_up', 'noop', 'scale_down', 'rollback'},
+                'stage': {'restart', 'noop', 'scale_up', 'scale_down'},
+                'prod': {'noop'}
+            },
+            SOURCE_SAFE_ORCHESTRATOR: {
+                'dev': {'restart', 'scale_up', 'noop', 'scale_down'},
+                'stage': {'restart', 'noop'},
+                'prod': {'noop'}
+            },
+            SOURCE_RL_BRAIN: {
+                'dev': {'noop', 'scale_up', 'scale_down', 'restart'},
+                'stage': {'noop', 'scale_up', 'scale_down'},
+                'prod': {'noop', 'restart'}
+            }
+        }
+        for source, allowlists in expected.items():
+            for env, actions in allowlists.items():
+                self.assertEqual(set(self.policy.allowed_actions(env, source)), actions, (source, env))
+
+    def test_orchestrator_service_fallback_matches_policy(self):
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'antigravity', 'services', 'orchestrator', 'main.py')
+        spec = importlib.util.spec_from_file_location('orchestrator_service_main', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.assertEqual(module.ALLOWED_ACTIONS, self.policy.allowlists(SOURCE_ORCHESTRATOR_SERVICE))
+
+if __name__ == '__main__':
+    unittest.main()
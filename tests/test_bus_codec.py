@@ -0,0 +1,61 @@
+import unittest
+from core.bus_codec import (get_codec, codec_backends, encode_message, decode_message, seal_message,
+                            open_message, CodecError, TAG_JSON, TAG_MSGPACK)
+
+MSGPACK_AVAILABLE = codec_backends()['msgpack'] != 'unavailable'
+CODECS = ['json', 'fast_json'] + (['msgpack'] if MSGPACK_AVAILABLE else [])
+
+class TestBusCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.message = {
+            'event_type': 'deploy.success',
+            'data': {'dataset': 'student.csv', 'latency': 1523.7, 'worker_id': 2,
+                     'ok': True, 'error': None, 'tags': ['a', 'b'], 'delta': -5, 'big': 2 ** 40},
+            'nonce': 'n-1'
+        }
+
+    def test_round_trip_every_codec(self):
+        for name in CODECS:
+            encoded = encode_message(self.message, get_codec(name))
+            self.assertEqual(decode_message(encoded), self.message)
+            self.assertEqual(decode_message(memoryview(encoded)), self.message)
+
+    def test_json_is_untagged_on_the_wire(self):
+        encoded = encode_message(self.message, get_codec('json'))
+        self.assertEqual(encoded[:1], b'{')
+        self.assertEqual(encode_message(self.message, get_codec('fast_json'))[:1], b'{')
+        self.assertEqual(decode_message(b'{"a": 1}'), {'a': 1})
+        self.assertEqual(decode_message('{"a": 1}'), {'a': 1})
+        # JSON tagged by earlier producers is still read
+        self.assertEqual(decode_message(bytes((TAG_JSON,)) + encoded), self.message)
+
+    @unittest.skipUnless(MSGPACK_AVAILABLE, "msgpack not installed")
+    def test_binary_codec_is_tagged(self):
+        self.assertEqual(encode_message(self.message, get_codec('msgpack'))[0], TAG_MSGPACK)
+
+    @unittest.skipIf(MSGPACK_AVAILABLE, "msgpack installed")
+    def test_missing_msgpack_fails_clearly(self):
+        with self.assertRaises(CodecError):
+            get_codec('msgpack')
+        with self.assertRaises(CodecError):
+            decode_message(bytes((TAG_MSGPACK,)) + b'\x80')
+
+    def test_sealed_messages_verify_per_codec(self):
+        for name in CODECS:
+            sealed, signature = seal_message(self.message, get_codec(name))
+            self.assertEqual(open_message(sealed), self.message)
+            tampered = sealed.replace(b'student', b'patient')
+            self.assertIsNone(open_message(tampered))
+
+    def test_unsigned_legacy_json_rejected(self):
+        raw = encode_message(self.message)  # plain JSON, no signature field
+        self.assertIsNone(open_message(raw))
+        self.assertEqual(open_message(raw, allow_unsigned=True), self.message)
+
+    def test_unknown_codec_rejected(self):
+        with self.assertRaises(ValueError):
+            get_codec('xml')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import datetime
+from core.message_history import MessageHistory
+
+class TestMessageHistory(unittest.TestCase):
+
+    def _fill(self, history, types, start=1000.0):
+        for i, event_type in enumerate(types):
+            history.append({'event_type': event_type, 'i': i}, published_at=start + i)
+
+    def test_ring_evicts_oldest(self):
+        history = MessageHistory(capacity=3)
+        self._fill(history, ['a', 'b', 'c', 'd', 'e'])
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual([m['i'] for m in history.query()], [2, 3, 4])
+        self.assertEqual(sorted(history.event_types()), ['c', 'd', 'e'])
+
+    def test_query_by_prefix_and_since(self):
+        history = MessageHistory(capacity=100)
+        self._fill(history, ['deploy.success', 'issue.detected', 'deploy.failure',
+                             'deploy.success', 'heal.completed', 'deploy.failure'])
+
+        deploys = history.query(limit=50, event_type='deploy.*', since=1002.0)
+        self.assertEqual([m['i'] for m in deploys], [2, 3, 5])
+
+        latest = history.query(limit=2, event_type='deploy.*')
+        self.assertEqual([m['i'] for m in latest], [3, 5])
+
+        exact = history.query(event_type='issue.detected')
+        self.assertEqual([m['i'] for m in exact], [1])
+
+    def test_since_on_full_history(self):
+        history = MessageHistory(capacity=4)
+        self._fill(history, ['a'] * 10)
+
+        self.assertEqual([m['i'] for m in history.query(since=1007.0)], [7, 8, 9])
+        since_dt = datetime.datetime.fromtimestamp(1008.0)
+        self.assertEqual([m['i'] for m in history.query(since=since_dt)], [8, 9])
+        self.assertEqual([m['i'] for m in history.query(limit=1)], [9])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from security.nonce_store import (
+    NonceStore, TimingWheelNonceBackend, RedisNonceBackend, InMemoryRedisStandIn
+)
+
+class FakeClock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestTimingWheelNonceStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, 'nonce_store.log')
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _make_backend(self, **kwargs):
+        kwargs.setdefault('ttl', 60)
+        kwargs.setdefault('bucket_seconds', 5)
+        return TimingWheelNonceBackend(self.log_file, clock=self.clock, **kwargs)
+
+    def test_replay_rejected_within_ttl(self):
+        store = NonceStore(ttl=60, backend=self._make_backend())
+        self.assertTrue(store.check_and_store('n1'))
+        self.assertFalse(store.check_and_store('n1'))
+        self.assertFalse(store.is_valid('n1'))
+        self.assertTrue(store.is_valid('n2'))
+
+    def test_expired_buckets_are_swept(self):
+        backend = self._make_backend()
+        for i in range(50):
+            backend.add(f'n{i}')
+        self.clock.now += 61
+        self.assertTrue(backend.add('n0'))
+        self.clock.now += 10
+        backend.add('later')
+        # Only n0 (re-added) and 'later' remain after the old bucket is swept
+        self.assertEqual(len(backend), 2)
+
+    def test_log_survives_restart(self):
+        backend = self._make_backend()
+        backend.add('a')
+        backend.add('b')
+        backend.close()
+
+        reopened = self._make_backend()
+        self.assertFalse(reopened.add('a'))
+        self.assertTrue(reopened.add('c'))
+        reopened.close()
+
+    def test_restart_drops_expired_entries(self):
+        backend = self._make_backend()
+        backend.add('old')
+        backend.close()
+        self.clock.now += 120
+
+        reopened = self._make_backend()
+        self.assertEqual(len(reopened), 0)
+        self.assertTrue(reopened.add('old'))
+        reopened.close()
+
+    def test_log_is_compacted(self):
+        backend = self._make_backend(compact_min_lines=10)
+        for i in range(15):
+            backend.add(f'n{i}')
+            self.clock.now += 10
+        backend.close()
+
+        with open(self.log_file) as f:
+            lines = f.read().splitlines()
+        self.assertLessEqual(len(lines), 10)
+        self.assertNotIn('n0', [line.split('\t')[0] for line in lines])
+
+    def test_loads_legacy_json_store(self):
+        with open(os.path.join(self.tmp_dir, 'nonce_store.json'), 'w') as f:
+            json.dump({'nonces': ['legacy'], 'timestamps': {'legacy': self.clock.now - 5}}, f)
+
+        backend = self._make_backend()
+        self.assertFalse(backend.add('legacy'))
+        backend.close()
+
+class TestRedisNonceBackend(unittest.TestCase):
+
+    def test_set_nx_ex_semantics(self):
+        clock = FakeClock()
+        store = NonceStore(ttl=30, backend=RedisNonceBackend(InMemoryRedisStandIn(clock), ttl=30))
+        self.assertTrue(store.check_and_store('n1'))
+        self.assertFalse(store.check_and_store('n1'))
+        self.assertFalse(store.is_valid('n1'))
+
+        clock.now += 31
+        self.assertTrue(store.is_valid('n1'))
+        self.assertTrue(store.check_and_store('n1'))
+
+if __name__ == '__main__':
+    unittest.main()
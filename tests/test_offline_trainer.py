@@ -0,0 +1,151 @@
+import unittest
+import copy
+import csv
+import json
+import os
+import random
+import shutil
+import tempfile
+from core.rl_decision_layer import DEFAULT_Q_TABLE
+from rl.offline_trainer import train, train_env, _CellTable
+
+class TestOfflineTrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+
+    def _write_csv(self, relative_path, header, rows):
+        path = os.path.join(self.tmp_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+    def _write_proof(self, entries):
+        with open(os.path.join(self.tmp_dir, 'day1_proof.log'), 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+
+    def _sequential(self, initial, experiences, learning_rate=0.1):
+        """Reference: RLDecisionLayer.update_q_value applied one at a time"""
+        table = copy.deepcopy(initial)
+        for state, action, reward in experiences:
+            old_value = table.setdefault(state, {}).setdefault(action, 0.0)
+            table[state][action] = old_value + learning_rate * (reward - old_value)
+        return table
+
+    def _assert_tables_equal(self, actual, expected):
+        self.assertEqual(set(actual), set(expected))
+        for state, actions in expected.items():
+            self.assertEqual(set(actual[state]), set(actions))
+            for action, value in actions.items():
+                self.assertAlmostEqual(actual[state][action], value, places=9)
+
+    def test_chunked_update_matches_sequential(self):
+        rng = random.Random(3)
+        experiences = [(rng.choice(['crash', 'latency', 'new_state']), rng.choice(['restart', 'noop', 'scale_up']),
+                        rng.uniform(-1, 1)) for _ in range(500)]
+        table = _CellTable(DEFAULT_Q_TABLE)
+        for start in range(0, len(experiences), 37):
+            table.update(experiences[start:start + 37], 0.1)
+        self._assert_tables_equal(table.to_dict(), self._sequential(DEFAULT_Q_TABLE, experiences))
+
+    def test_joins_decisions_to_outcomes(self):
+        self._write_proof([
+            {'event_name': 'RL_DECISION', 'env': 'dev', 'event_type': 'crash', 'decision_str': 'restart'},
+            {'event_name': 'RL_INTAKE_VALIDATED', 'env': 'dev', 'action': 'restart'},
+            {'event_name': 'ORCH_EXEC', 'env': 'dev', 'action': 'restart', 'status': 'executed'},
+            {'event_name': 'RL_DECISION', 'env': 'stage', 'event_type': 'overload', 'decision': 2},
+            {'event_name': 'RL_DECISION', 'env': 'dev', 'event_type': 'latency', 'decision_str': 'scale_up'},
+            {'event_name': 'ORCH_REFUSE', 'env': 'dev', 'action': 'scale_up', 'status': 'refused'},
+            {'event_name': 'RL_DECISION', 'env': 'dev', 'event_type': 'crash', 'decision_str': 'noop'},
+            {'event_name': 'ORCH_EXEC', 'env': 'stage', 'action': 'scale_up', 'status': 'executed'},
+            {'event_name': 'RL_DECISION', 'env': 'dev', 'event_type': 'crash', 'decision_str': 'restart'},
+        ])
+        _, dev_table, stats = train_env(self.tmp_dir, 'dev', {})
+        self.assertEqual(stats['proof_log'], 2)
+        self.assertEqual(stats['unjoined_decisions'], 2)
+        self.assertEqual(dev_table, {'crash': {'restart': 0.1}, 'latency': {'scale_up': -0.1}})
+
+        _, stage_table, _ = train_env(self.tmp_dir, 'stage', {})
+        self.assertEqual(stage_table, {'overload': {'scale_up': 0.1}})
+
+    def test_csv_sources_by_environment(self):
+        self._write_csv('healing_log.csv', ['timestamp', 'app_name', 'failure_type', 'strategy', 'status', 'duration_sec'],
+                        [['t0', 'app-1', 'crash', 'scale_workers', 'success', 20],
+                         ['t1', 'app-2', 'crash', 'restore_previous_version', 'failure', 20],
+                         ['t2', 'app-3', 'crash', 'adjust_thresholds', 'success', 20]])
+        self._write_csv('deployment_log.csv', ['timestamp', 'app_name', 'environment', 'status', 'deploy_time_sec'],
+                        [['t0', 'app-1', 'dev', 'success', 56], ['t1', 'app-2', 'stage', 'failed', 45]])
+        self._write_csv('stage/deployment_log_worker_1.csv',
+                        ['timestamp', 'dataset_changed', 'status', 'response_time_ms', 'action_type', 'environment',
+                         'worker_id', 'app_name', 'build_id'],
+                        [['t2', 'd', 'success', 500, 'scale_up', 'stage', 1, 'app', 'b1']])
+        self._write_csv('stage/performance/throughput_log.csv',
+                        ['timestamp', 'total_workers', 'active_workers', 'queue_size', 'requests_per_second',
+                         'avg_response_time', 'environment'],
+                        [['t3', 3, 3, 0, 1.0, 200, 'stage'], ['t4', 3, 0, 0, 0, 0, 'stage_REFUSED_scale_up']])
+
+        # Strategies map to the actions process_state can return; the rest are dropped
+        _, dev_table, dev_stats = train_env(self.tmp_dir, 'dev', {})
+        self._assert_tables_equal(dev_table, self._sequential({}, [
+            ('crash', 'scale_up', 1.0), ('crash', 'rollback', -1.0)]))
+        self.assertEqual(dev_stats['healing_log'], 3)
+        self.assertEqual(dev_stats['dropped_actions'], 2)  # adjust_thresholds, plain deploy
+        self.assertEqual(dev_stats['experiences'], 2)
+
+        _, stage_table, stage_stats = train_env(self.tmp_dir, 'stage', {})
+        self._assert_tables_equal(stage_table, self._sequential({}, [
+            ('deploy', 'scale_up', 1.0), ('deploy', 'scale_up', -1.0)]))
+        self.assertEqual(stage_stats['performance_log'], 1)
+        self.assertEqual(stage_stats['dropped_actions'], 1)
+
+    def test_non_executable_decisions_dropped(self):
+        self._write_proof([
+            {'event_name': 'RL_DECISION', 'env': 'dev', 'event_type': 'crash', 'decision_str': 'page_oncall'},
+            {'event_name': 'ORCH_EXEC', 'env': 'dev', 'action': 'page_oncall'},
+        ])
+        _, table, stats = train_env(self.tmp_dir, 'dev', {})
+        self.assertEqual(table, {})
+        self.assertEqual(stats['dropped_actions'], 1)
+
+    def test_parallel_training_writes_layer_tables(self):
+        events = []
+        for i in range(200):
+            env = ['dev', 'stage'][i % 2]
+            events.append({'event_name': 'RL_DECISION', 'env': env, 'event_type': 'crash',
+                           'decision_str': ['restart', 'noop'][i % 3 == 0]})
+            events.append({'event_name': ['ORCH_EXEC', 'ORCH_REFUSE'][i % 5 == 0], 'env': env})
+        self._write_proof(events)
+
+        serial = train(self.tmp_dir, ['dev', 'stage', 'prod'], workers=1, chunk_size=16, write=False)
+        parallel = train(self.tmp_dir, ['dev', 'stage', 'prod'], workers=3, chunk_size=16)
+        for env in ('dev', 'stage'):
+            self._assert_tables_equal(parallel[env]['q_table'], serial[env]['q_table'])
+            with open(os.path.join(self.tmp_dir, env, 'rl_q_table.json')) as f:
+                self._assert_tables_equal(json.load(f), serial[env]['q_table'])
+            self.assertEqual(parallel[env]['stats']['proof_log'], 100)
+            self.assertIn('memory_leak', parallel[env]['q_table'])  # defaults kept
+        # No history for prod: nothing written
+        self.assertIsNone(parallel['prod']['path'])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'prod', 'rl_q_table.json')))
+
+    def test_merge_starts_from_saved_table(self):
+        self._write_proof([
+            {'event_name': 'RL_DECISION', 'env': 'dev', 'event_type': 'crash', 'decision_str': 'restart'},
+            {'event_name': 'ORCH_EXEC', 'env': 'dev', 'action': 'restart'},
+        ])
+        os.makedirs(os.path.join(self.tmp_dir, 'dev'))
+        with open(os.path.join(self.tmp_dir, 'dev', 'rl_q_table.json'), 'w') as f:
+            json.dump({'crash': {'restart': 0.5}}, f)
+
+        merged = train(self.tmp_dir, ['dev'], workers=1, merge=True, write=False)
+        self.assertEqual(merged['dev']['q_table'], {'crash': {'restart': 0.55}})
+
+        fresh = train(self.tmp_dir, ['dev'], workers=1, write=False)
+        self.assertAlmostEqual(fresh['dev']['q_table']['crash']['restart'], 0.82)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,7 @@ from core.realtime_bus import RealtimeBus
 
 class TestRealtimeBus(unittest.TestCase):
     def setUp(self):
-        self.bus = RealtimeBus()
+        self.bus = RealtimeBus(sample_interval=0)
     
     def test_create_queue(self):
         self.bus.create_queue("test_topic")
@@ -34,5 +34,28 @@ class TestRealtimeBus(unittest.TestCase):
         self.assertIn("total_messages", stats)
         self.assertGreater(stats["total_messages"], 0)
 
+    def test_get_messages_drains_without_blocking(self):
+        for i in range(5):
+            self.bus.publish("test_topic", {"i": i})
+        
+        self.assertEqual([m["i"] for m in self.bus.get_messages("test_topic", max_n=3)], [0, 1, 2])
+        self.assertEqual([m["i"] for m in self.bus.get_messages("test_topic")], [3, 4])
+        self.assertEqual(self.bus.get_messages("test_topic"), [])
+        self.assertEqual(self.bus.get_messages("missing_topic"), [])
+    
+    def test_overflow_policies(self):
+        bus = RealtimeBus(queue_size=3, sample_interval=0)
+        bus.create_queue("newest", overflow="drop_newest")
+        for i in range(5):
+            bus.publish("oldest", {"i": i})
+            bus.publish("newest", {"i": i})
+        
+        self.assertEqual([m["i"] for m in bus.get_messages("oldest")], [2, 3, 4])
+        self.assertEqual([m["i"] for m in bus.get_messages("newest")], [0, 1, 2])
+        self.assertEqual(bus.get_stats()["dropped_messages"], 4)
+        
+        with self.assertRaises(ValueError):
+            RealtimeBus(overflow="block")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import time
+from core.redis_event_bus import RedisEventBus
+from core.bus_codec import codec_backends
+from security.signing import ENVELOPE_HEADER, sign_payload
+
+def envelope_signature(envelope):
+    return envelope[len(ENVELOPE_HEADER):len(ENVELOPE_HEADER) + 64].decode()
+
+class TestRedisEventBus(unittest.TestCase):
+
+    def _make_bus(self, **kwargs):
+        with patch.object(RedisEventBus, '_connect'):
+            bus = RedisEventBus('dev', **kwargs)
+        bus.redis_client = MagicMock()
+        return bus
+
+    def test_publish_many_uses_single_pipeline(self):
+        bus = self._make_bus()
+        pipe = bus.redis_client.pipeline.return_value
+
+        bus.publish_many([('deploy.success', {'a': 1}), ('deploy.failure', {'b': 2})])
+
+        bus.redis_client.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(pipe.publish.call_count, 2)
+        pipe.execute.assert_called_once()
+        bus.redis_client.publish.assert_not_called()
+
+        stats = bus.get_batch_stats()
+        self.assertEqual(stats['batches_flushed'], 1)
+        self.assertEqual(stats['messages_flushed'], 2)
+        self.assertEqual(len(bus.get_message_history()), 2)
+
+    def test_publish_sends_signed_envelope(self):
+        bus = self._make_bus()
+        bus.publish('deploy.success', {'dataset': 'a.csv'})
+
+        channel, envelope = bus.redis_client.publish.call_args[0]
+        self.assertEqual(channel, 'cicd.deploy.success')
+        self.assertIsInstance(envelope, bytes)
+
+        decoded = bus._decode_message(envelope)
+        self.assertEqual(decoded['data'], {'dataset': 'a.csv'})
+        self.assertEqual(bus.get_message_history()[-1]['signature'], envelope_signature(envelope))
+
+    @unittest.skipIf(codec_backends()['msgpack'] == 'unavailable', "msgpack not installed")
+    def test_binary_codec_publish_round_trip(self):
+        bus = self._make_bus(codec='msgpack')
+        bus.publish('deploy.success', {'dataset': 'a.csv'})
+
+        frame = bus.redis_client.publish.call_args[0][1]
+        self.assertEqual(bus._decode_message(frame)['data'], {'dataset': 'a.csv'})
+
+    def test_tampered_envelope_rejected(self):
+        bus = self._make_bus()
+        bus.publish('deploy.success', {'dataset': 'a.csv'})
+        envelope = bus.redis_client.publish.call_args[0][1]
+
+        self.assertIsNone(bus._decode_message(envelope.replace(b'a.csv', b'b.csv')))
+
+    def test_legacy_signed_message_accepted(self):
+        bus = self._make_bus()
+        legacy = sign_payload({'event_type': 'deploy.success', 'data': {'x': 1}})
+
+        self.assertEqual(bus._decode_message(json.dumps(legacy))['data'], {'x': 1})
+        legacy['data'] = {'x': 2}
+        self.assertIsNone(bus._decode_message(json.dumps(legacy)))
+
+    def test_unsigned_legacy_message_needs_migration_flag(self):
+        unsigned = json.dumps({'event_type': 'deploy.success', 'data': {'x': 1}})
+        self.assertIsNone(self._make_bus()._decode_message(unsigned))
+        self.assertEqual(self._make_bus(allow_unsigned=True)._decode_message(unsigned)['data'], {'x': 1})
+
+    def test_dispatch_matches_exact_prefix_and_wildcard(self):
+        bus = self._make_bus()
+        calls = []
+        everything = lambda e, d: calls.append(('all', e))
+        deploys = lambda e, d: calls.append(('deploy', e))
+        exact = lambda e, d: calls.append(('exact', e))
+        bus.subscribe('*', everything)
+        bus.subscribe('deploy.*', deploys)
+        bus.subscribe('deploy.success', exact)
+
+        for callback in bus._dispatch.match('deploy.success'):
+            callback('deploy.success', {})
+        self.assertEqual(sorted(calls), [('all', 'deploy.success'), ('deploy', 'deploy.success'),
+                                         ('exact', 'deploy.success')])
+        self.assertEqual(bus._dispatch.match('issue.detected'), (everything,))
+
+        bus.unsubscribe('*')
+        self.assertEqual(bus._dispatch.match('issue.detected'), ())
+        self.assertEqual(bus._dispatch.match('deploy.failure'), (deploys,))
+
+        for pattern in ['*', 'deploy*', 'deploy.success', 'issue.detected']:
+            for event_type in ['deploy.success', 'deployment', 'issue.detected', 'heal']:
+                bus.subscribe(pattern, everything)
+                matched = everything in bus._dispatch.match(event_type)
+                self.assertEqual(matched, bus._pattern_matches(pattern, event_type))
+                bus.unsubscribe(pattern, everything)
+        bus.stop()
+
+    def test_auto_batch_coalesces_publishes(self):
+        bus = self._make_bus(auto_batch=True, batch_window_ms=50)
+        pipe = bus.redis_client.pipeline.return_value
+        try:
+            for i in range(5):
+                bus.publish('work.submitted', {'i': i})
+            time.sleep(0.2)
+
+            self.assertEqual(pipe.publish.call_count, 5)
+            stats = bus.get_batch_stats()
+            self.assertEqual(stats['messages_flushed'], 5)
+            self.assertLess(stats['batches_flushed'], 5)
+        finally:
+            bus.stop()
+
+    def test_stop_flushes_pending(self):
+        bus = self._make_bus(auto_batch=True, batch_window_ms=10000)
+        pipe = bus.redis_client.pipeline.return_value
+        bus.publish('work.submitted', {'i': 1})
+        bus.stop()
+
+        self.assertEqual(pipe.publish.call_count, 1)
+        self.assertEqual(bus.get_batch_stats()['pending'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import shutil
+import tempfile
+from security.replay_filter import BloomFilter, RotatingBloomFilter
+from security.nonce_store import NonceStore, TimingWheelNonceBackend, RedisNonceBackend, InMemoryRedisStandIn
+
+class FakeClock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f'n{i}')
+        self.assertTrue(all(f'n{i}' in bloom for i in range(1000)))
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(5000, 0.01)
+        for i in range(5000):
+            bloom.add(f'seen{i}')
+        false_positives = sum(f'unseen{i}' in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.03)
+
+    def test_rejects_bad_parameters(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+class TestRotatingBloomFilter(unittest.TestCase):
+
+    def test_check_and_add(self):
+        bloom = RotatingBloomFilter(1000, rotation_seconds=60, clock=FakeClock())
+        self.assertFalse(bloom.check_and_add('a'))
+        self.assertTrue(bloom.check_and_add('a'))
+        self.assertEqual(bloom.get_stats()['definitely_new'], 1)
+        self.assertEqual(bloom.get_stats()['maybe_seen'], 1)
+
+    def test_nonce_retained_for_one_rotation_then_dropped(self):
+        clock = FakeClock()
+        bloom = RotatingBloomFilter(1000, rotation_seconds=60, clock=clock)
+        bloom.check_and_add('a')
+        clock.now += 61
+        self.assertTrue(bloom.might_contain('a'))
+        clock.now += 60
+        self.assertFalse(bloom.might_contain('a'))
+        self.assertEqual(bloom.rotations, 2)
+
+    def test_long_idle_clears_all_generations(self):
+        clock = FakeClock()
+        bloom = RotatingBloomFilter(1000, rotation_seconds=60, clock=clock)
+        bloom.check_and_add('a')
+        clock.now += 3600
+        self.assertFalse(bloom.might_contain('a'))
+
+class TestNonceStoreWithPrefilter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.clock = FakeClock()
+
+    def _make_store(self):
+        backend = TimingWheelNonceBackend(os.path.join(self.tmp_dir, 'nonce_store.log'), ttl=60,
+                                          clock=self.clock)
+        self.addCleanup(backend.close)
+        prefilter = RotatingBloomFilter(1000, rotation_seconds=60, clock=self.clock)
+        return NonceStore(ttl=60, backend=backend, prefilter=prefilter), prefilter
+
+    def test_replay_detected_through_filter(self):
+        store, prefilter = self._make_store()
+        self.assertTrue(store.check_and_store('n1'))
+        self.assertFalse(store.check_and_store('n1'))
+        self.assertFalse(store.is_valid('n1'))
+        self.assertTrue(store.is_valid('n2'))
+        self.assertEqual(prefilter.get_stats()['definitely_new'], 1)
+
+    def test_filter_seeded_from_backend_after_restart(self):
+        store, _ = self._make_store()
+        self.assertTrue(store.check_and_store('n1'))
+        store.close()
+
+        self.clock.now += 30
+        restarted, prefilter = self._make_store()
+        self.assertTrue(prefilter.might_contain('n1'))
+        self.assertFalse(restarted.check_and_store('n1'))
+        self.assertEqual(prefilter.get_stats()['checks'], 1)
+
+    def test_shared_backend_rejected(self):
+        backend = RedisNonceBackend(InMemoryRedisStandIn(self.clock), ttl=60)
+        with self.assertRaises(ValueError):
+            NonceStore(ttl=60, backend=backend, prefilter=RotatingBloomFilter(1000, rotation_seconds=60))
+
+class TestRedisNonceBackend(unittest.TestCase):
+
+    def test_recorded_nonces_written_in_batches(self):
+        backend = RedisNonceBackend(InMemoryRedisStandIn(FakeClock()), ttl=60, write_batch=10)
+        for i in range(25):
+            backend.record(f'n{i}')
+        self.assertEqual(len(backend._pending), 5)
+        self.assertTrue(backend.client.exists('nonce:n0'))
+        self.assertTrue(backend.contains('n24'))
+
+if __name__ == '__main__':
+    unittest.main()
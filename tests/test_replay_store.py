@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import numpy as np
+from rl.replay_store import ReplayStore, fcntl
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestReplayStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.path = os.path.join(self.tmp_dir, 'replay')
+
+    def test_ring_overwrites_oldest(self):
+        store = ReplayStore(self.path, capacity=4, actions=['a', 'b'])
+        for i in range(6):
+            store.append(f's{i}', 'b', float(i), 'done', timestamp=100.0 + i)
+        self.assertEqual(len(store), 4)
+        self.assertEqual(store.total_appended, 6)
+        records = store.records()
+        self.assertEqual(records['reward'].tolist(), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual([store.states[i] for i in records['state']], ['s2', 's3', 's4', 's5'])
+        self.assertEqual(records['timestamp'][-1], 105.0)
+
+    def test_reopen_keeps_records_and_names(self):
+        store = ReplayStore(self.path, capacity=4, actions=['a', 'b'])
+        store.append('s0', 'a', 1.0, 's1')
+        store.flush()
+        del store
+
+        reopened = ReplayStore(self.path, capacity=999)
+        self.assertEqual(reopened.capacity, 4)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.states, ['s0', 's1'])
+        reopened.append('s1', 'b', -1.0, 's0')
+        self.assertEqual(reopened.records()['reward'].tolist(), [1.0, -1.0])
+
+    @unittest.skipIf(fcntl is None, "needs fcntl")
+    def test_single_writer_per_directory(self):
+        store = ReplayStore(self.path, capacity=4, actions=['a'])
+        with self.assertRaises(RuntimeError):
+            ReplayStore(self.path, capacity=4, actions=['b'])
+        reader = ReplayStore(self.path, readonly=True)
+        self.assertEqual(reader.actions, ['a'])
+
+        store.close()
+        reopened = ReplayStore(self.path, actions=['b'])
+        self.assertEqual(reopened.actions, ['a', 'b'])
+        reopened.close()
+
+    def test_uniform_sample_shapes(self):
+        store = ReplayStore(capacity=16, actions=['a'])
+        with self.assertRaises(ValueError):
+            store.sample(4)
+        for i in range(10):
+            store.append(f's{i}', 'a', float(i), 'done')
+        batch = store.sample(32, rng=np.random.default_rng(0))
+        self.assertEqual(batch['state'].shape, (32,))
+        self.assertTrue((batch['slots'] < 10).all())
+        self.assertNotIn('weights', batch)
+
+    def test_prioritized_sampling_follows_priorities(self):
+        store = ReplayStore(capacity=16, actions=['a'])
+        for i in range(10):
+            store.append(f's{i}', 'a', 0.0, 'done')
+        priorities = np.full(10, 0.01)
+        priorities[3] = 10.0
+        store.update_priorities(np.arange(10), priorities)
+
+        batch = store.sample(200, rng=np.random.default_rng(0), prioritized=True, alpha=1.0)
+        self.assertGreater((batch['slots'] == 3).mean(), 0.9)
+        self.assertEqual(batch['weights'].max(), 1.0)
+        self.assertLess(batch['weights'][batch['slots'] == 3].max(), 1.0)
+
+        # New experience enters at the highest priority seen
+        slot = store.append('fresh', 'a', 0.0, 'done')
+        self.assertAlmostEqual(float(store._data['priority'][slot]), 10.001, places=3)
+
+    def test_readonly_reader_in_other_process(self):
+        store = ReplayStore(self.path, capacity=8, actions=['a'])
+        store.append('s0', 'a', 1.5, 's1')
+        store.flush()
+
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1])\n"
+            "from rl.replay_store import ReplayStore\n"
+            "reader = ReplayStore(sys.argv[2], readonly=True)\n"
+            "print(len(reader), reader.states, float(reader.sample(1)['reward'][0]))\n"
+        )
+        output = subprocess.run([sys.executable, '-c', script, REPO_ROOT, self.path],
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "1 ['s0', 's1'] 1.5")
+
+        reader = ReplayStore(self.path, readonly=True)
+        store.append('s2', 'a', 0.0, 's0')
+        self.assertEqual(len(reader), 2)
+        reader.refresh()
+        self.assertEqual(reader.states, ['s0', 's1', 's2'])
+        with self.assertRaises(PermissionError):
+            reader.append('s0', 'a', 0.0, 's0')
+
+if __name__ == '__main__':
+    unittest.main()
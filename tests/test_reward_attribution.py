@@ -0,0 +1,177 @@
+import unittest
+import os
+import time
+from unittest.mock import patch
+from core.reward_attribution import (
+    RewardAttributionEngine, get_reward_engine, register_reward_engine, health_score
+)
+
+class _Learner:
+    def __init__(self):
+        self.batches = []
+
+    def update_q_values(self, experiences):
+        self.batches.append(list(experiences))
+
+    @property
+    def rewards(self):
+        return [exp for batch in self.batches for exp in batch]
+
+class _Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestRewardAttributionEngine(unittest.TestCase):
+
+    def _engine(self, **kwargs):
+        self.learner = _Learner()
+        self.clock = _Clock()
+        kwargs.setdefault('flush_interval', None)
+        return RewardAttributionEngine(self.learner, clock=self.clock, **kwargs)
+
+    def test_health_score(self):
+        self.assertEqual(health_score('running'), 1.0)
+        self.assertEqual(health_score('DOWN'), 0.0)
+        self.assertEqual(health_score(1.7), 1.0)
+        self.assertIsNone(health_score('unknown'))
+
+    def test_joins_observations_inside_horizon(self):
+        engine = self._engine(horizon=10)
+        engine.record_observation('app-1', 'crashed', timestamp=99)
+        engine.record_action('app-1', 'crash', 'restart', timestamp=100)
+        engine.record_observation('app-1', 'running', timestamp=105)
+        engine.record_observation('app-1', 'degraded', timestamp=110)
+        engine.record_observation('app-1', 'crashed', timestamp=111)  # after the horizon
+
+        # The horizon has not passed in either timeline yet
+        self.clock.now = 105
+        engine.record_action('app-2', 'crash', 'noop', timestamp=105)
+        self.assertEqual(engine.flush(), 1)
+        # app-1's own observations reached 111, so its action is due
+        self.assertEqual(self.learner.rewards, [('crash', 'restart', 0.5)])
+        self.assertEqual(engine.get_stats()['pending_actions'], 1)
+
+        # app-2 never reported health: no reward for its action
+        self.clock.now = 200
+        self.assertEqual(engine.flush(), 0)
+        stats = engine.get_stats()
+        self.assertEqual(stats['unobserved'], 1)
+        self.assertEqual(stats['tracked_apps'], 0)
+
+    def test_out_of_order_events_are_sorted(self):
+        engine = self._engine(horizon=10)
+        engine.record_action('app', 'latency', 'scale_up', timestamp=20)
+        engine.record_observation('app', 'stopped', timestamp=25)
+        engine.record_action('app', 'crash', 'restart', timestamp=0)
+        engine.record_observation('app', 'running', timestamp=5)
+        engine.record_observation('app', 'running', timestamp=3)
+        self.clock.now = 100
+        engine.flush()
+        self.assertEqual(self.learner.rewards, [('crash', 'restart', 1.0), ('latency', 'scale_up', -1.0)])
+
+    def test_rewards_fed_in_batches(self):
+        engine = self._engine(horizon=1, batch_size=4)
+        for i in range(10):
+            engine.record_action('app', 'crash', 'restart', timestamp=i)
+            engine.record_observation('app', 'running', timestamp=i + 0.5)
+        self.clock.now = 100
+        self.assertEqual(engine.flush(), 10)
+        self.assertEqual([len(batch) for batch in self.learner.batches], [4, 4, 2])
+
+    def test_memory_is_bounded(self):
+        engine = self._engine(horizon=1000, max_queue=5, max_actions_per_app=3,
+                              max_observations_per_app=4, max_apps=2)
+        for i in range(8):
+            engine.record_action('app', 'crash', 'restart', timestamp=i)
+        self.assertEqual(engine.get_stats()['queued'], 5)
+        engine.flush()
+        stats = engine.get_stats()
+        self.assertEqual(stats['pending_actions'], 3)
+        self.assertEqual(stats['dropped'], 3 + 2)
+
+        for i in range(10):
+            engine.record_observation('app', 'running', timestamp=10 + i)
+            engine.flush()
+        engine.record_observation('other', 'running', timestamp=10)
+        engine.record_observation('third', 'running', timestamp=10)
+        engine.flush()
+        stats = engine.get_stats()
+        self.assertEqual(stats['observations_held'], 5)  # 4 for 'app', 1 for 'other'
+        self.assertEqual(stats['tracked_apps'], 2)
+
+        # Observations no pending action can use are discarded
+        self.clock.now = 5000
+        engine.flush()
+        self.assertEqual(engine.get_stats()['observations_held'], 0)
+
+    def test_background_thread_feeds_learner(self):
+        self.learner = _Learner()
+        engine = RewardAttributionEngine(self.learner, horizon=0.01, flush_interval=0.01)
+        self.addCleanup(engine.close)
+        now = time.time()
+        engine.record_action('app', 'crash', 'restart', timestamp=now - 1)
+        engine.record_observation('app', 'running', timestamp=now - 0.995)
+        deadline = time.monotonic() + 5
+        while not self.learner.rewards and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.learner.rewards, [('crash', 'restart', 1.0)])
+
+    def test_learner_errors_are_counted(self):
+        engine = self._engine(horizon=1)
+        engine.learner.update_q_values = lambda batch: 1 / 0
+        engine.record_action('app', 'crash', 'restart', timestamp=0)
+        engine.record_observation('app', 'running', timestamp=0.5)
+        self.clock.now = 10
+        engine.flush()
+        self.assertEqual(engine.get_stats()['learner_errors'], 1)
+
+class TestRewardEngineRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        register_reward_engine('dev', None)
+
+    def test_disabled_without_horizon(self):
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('RL_REWARD_HORIZON', None)
+            self.assertIsNone(get_reward_engine('dev'))
+
+    def test_registered_engine_is_shared(self):
+        engine = RewardAttributionEngine(_Learner(), flush_interval=None)
+        register_reward_engine('dev', engine)
+        self.assertIs(get_reward_engine('dev'), engine)
+
+    def test_horizon_env_creates_decision_layer_engine(self):
+        with patch.dict(os.environ, {'RL_REWARD_HORIZON': '45'}), \
+             patch('core.rl_decision_layer.RLDecisionLayer') as layer:
+            engine = get_reward_engine('dev')
+            self.assertEqual(engine.horizon, 45.0)
+            self.assertIs(engine.learner, layer.return_value)
+            self.assertIs(get_reward_engine('dev'), engine)
+
+    def test_safe_orchestrator_records_executed_actions(self):
+        from core.rl_orchestrator_safe import SafeOrchestrator
+        learner = _Learner()
+        clock = _Clock(1000.0)
+        engine = RewardAttributionEngine(learner, horizon=1, flush_interval=None, clock=clock)
+        register_reward_engine('dev', engine)
+        orchestrator = SafeOrchestrator('dev')
+        orchestrator.demo_mode = False
+        # Context built the way agent_runtime builds it
+        context = {'app_name': 'app-1', 'event_type': 'crash', 'trigger_metrics': {}}
+        with patch('core.proof_logger.write_proof'):
+            result = orchestrator.validate_and_execute(1, context, source='rl_decision_layer')
+        self.assertTrue(result['success'])
+        self.assertEqual(result['action_executed'], 'restart')
+
+        for offset in (0.2, 0.4, 0.6):
+            engine.record_observation('app-1', 'running', timestamp=1000.0 + offset)
+        clock.now = 1010.0
+        engine.flush()
+        self.assertEqual(learner.rewards, [('crash', 'restart', 1.0)])
+        self.assertEqual(engine.get_stats()['unobserved'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import threading
+from unittest.mock import patch
+from core.rl_decision_cache import RLDecisionCache, CACHE_HIT, CACHE_STALE, CACHE_MISS, CACHE_BYPASS
+
+def _request(latency_ms=812.0, state='healthy'):
+    return {'app': 'app-a', 'env': 'dev', 'event_type': 'tick', 'state': state,
+            'latency_ms': latency_ms, 'errors_last_min': 0, 'workers': 3}
+
+class _Brain:
+    def __init__(self):
+        self.calls = 0
+        self.action = 'noop'
+
+    def decide(self, rl_request):
+        self.calls += 1
+        return {'action': self.action, 'confidence': 0.9}
+
+class TestRLDecisionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        self.brain = _Brain()
+        self.cache = RLDecisionCache(max_size=4, ttl=30, stale_ttl=60, clock=lambda: self.now)
+
+    def _get(self, request=None):
+        return self.cache.get_or_compute(request or _request(), self.brain.decide)
+
+    def test_repeat_state_is_a_hit(self):
+        self.assertEqual(self._get()[1], CACHE_MISS)
+        self.assertEqual(self._get(_request(latency_ms=838.0))[1], CACHE_HIT)
+        self.assertEqual(self._get(_request(latency_ms=900.0))[1], CACHE_MISS)
+        self.assertEqual(self._get(_request(state='degraded'))[1], CACHE_MISS)
+        self.assertEqual(self.brain.calls, 3)
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 3))
+        self.assertEqual(stats['hit_ratio'], 0.25)
+
+    def test_callers_cannot_mutate_entries(self):
+        response, _ = self._get()
+        response['action'] = 'restart'
+        response, status = self._get()
+        self.assertEqual((status, response['action']), (CACHE_HIT, 'noop'))
+        response['cache_status'] = status
+
+        self.now += 40
+        response, status = self._get()
+        self.assertEqual(status, CACHE_STALE)
+        self.assertNotIn('cache_status', response)
+        response['action'] = 'rollback'
+        self.cache.wait_for_refreshes(timeout=5)
+        self.assertEqual(self._get()[0]['action'], 'noop')
+
+    def test_stale_entry_served_then_refreshed_in_background(self):
+        self._get()
+        self.brain.action = 'scale_up'
+        self.now += 40
+
+        response, status = self._get()
+        self.assertEqual(status, CACHE_STALE)
+        self.assertEqual(response['action'], 'noop')
+        self.cache.wait_for_refreshes(timeout=5)
+
+        response, status = self._get()
+        self.assertEqual(status, CACHE_HIT)
+        self.assertEqual(response['action'], 'scale_up')
+        self.assertEqual(self.cache.get_stats()['refreshes'], 1)
+
+    def test_one_refresh_per_key(self):
+        self._get()
+        self.now += 40
+        release = threading.Event()
+
+        def slow_decide(rl_request):
+            release.wait(5)
+            return self.brain.decide(rl_request)
+
+        for _ in range(5):
+            self.assertEqual(self.cache.get_or_compute(_request(), slow_decide)[1], CACHE_STALE)
+        release.set()
+        self.cache.wait_for_refreshes(timeout=5)
+        self.assertEqual(self.brain.calls, 2)
+
+    def test_expired_entry_is_recomputed(self):
+        self._get()
+        self.now += 91
+        self.assertEqual(self._get()[1], CACHE_MISS)
+
+    def test_uncacheable_responses_are_not_stored(self):
+        cache = RLDecisionCache(should_cache=lambda r: r.get('source') != 'fallback', clock=lambda: self.now)
+        fallback = lambda rl_request: {'action': 'noop', 'source': 'fallback'}
+        cache.get_or_compute(_request(), fallback)
+        self.assertEqual(cache.get_or_compute(_request(), fallback)[1], CACHE_MISS)
+        self.assertEqual(cache.get_stats()['size'], 0)
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        cache = RLDecisionCache(ttl=30, stale_ttl=60, should_cache=lambda r: 'error' not in r,
+                                clock=lambda: self.now)
+        cache.get_or_compute(_request(), self.brain.decide)
+        self.now += 40
+        cache.get_or_compute(_request(), lambda rl_request: {'error': 'timeout'})
+        cache.wait_for_refreshes(timeout=5)
+
+        response, status = cache.get_or_compute(_request(), self.brain.decide)
+        self.assertEqual(status, CACHE_STALE)
+        self.assertEqual(response['action'], 'noop')
+        self.assertEqual(cache.get_stats()['refresh_failures'], 1)
+
+    def test_lru_eviction(self):
+        for i in range(5):
+            self._get(_request(latency_ms=i * 100.0))
+        self.assertEqual(self.cache.get_stats()['size'], 4)
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+        self.assertEqual(self._get(_request(latency_ms=0.0))[1], CACHE_MISS)
+
+    def test_zero_size_bypasses(self):
+        cache = RLDecisionCache(max_size=0)
+        self.assertEqual(cache.get_or_compute(_request(), self.brain.decide)[1], CACHE_BYPASS)
+
+class TestRuntimeRLPipeCache(unittest.TestCase):
+
+    def test_pipe_does_not_cache_fallbacks(self):
+        from core.runtime_rl_pipe import RuntimeRLPipe
+        pipe = RuntimeRLPipe(env='dev')
+        fallback = pipe.rl_brain._fallback_response('down')
+        with patch.object(pipe.rl_brain, 'decide', return_value=fallback) as decide:
+            pipe._decide(_request())
+            pipe._decide(_request())
+        self.assertEqual(decide.call_count, 2)
+
+        with patch.object(pipe.rl_brain, 'decide', return_value={'action': 'noop', 'confidence': 0.9}) as decide:
+            pipe._decide(_request())
+            _, status = pipe._decide(_request())
+        self.assertEqual(decide.call_count, 1)
+        self.assertEqual(status, CACHE_HIT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+from core.rl_decision_layer import RLDecisionLayer
+
+class TestRLDecisionLayerCheckpointing(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.path = os.path.join(self.tmp_dir, 'dev', 'rl_q_table.json')
+
+    def _layer(self, **kwargs):
+        layer = RLDecisionLayer(env='dev', **kwargs)
+        layer.q_table_path = self.path
+        self.addCleanup(layer.close)
+        return layer
+
+    def _wait_for_checkpoints(self, layer, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while layer.checkpoints_written < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return layer.checkpoints_written
+
+    def _saved(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_updates_stay_in_memory_until_close(self):
+        layer = self._layer(checkpoint_every=1000, checkpoint_interval=60)
+        for _ in range(500):
+            layer.update_q_value('crash', 'restart', 1.0)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(layer.get_checkpoint_stats()['dirty_updates'], 500)
+
+        layer.close()
+        self.assertEqual(layer.checkpoints_written, 1)
+        self.assertAlmostEqual(self._saved()['crash']['restart'], layer.q_table['crash']['restart'])
+
+    def test_checkpoint_after_n_updates(self):
+        layer = self._layer(checkpoint_every=10, checkpoint_interval=60)
+        for _ in range(10):
+            layer.update_q_value('overload', 'scale_up', 1.0)
+        self.assertEqual(self._wait_for_checkpoints(layer, 1), 1)
+        self.assertEqual(layer.get_checkpoint_stats()['dirty_updates'], 0)
+
+    def test_checkpoint_after_interval(self):
+        layer = self._layer(checkpoint_every=1000, checkpoint_interval=0.05)
+        layer.update_q_value('latency', 'restart', 0.0)
+        self.assertEqual(self._wait_for_checkpoints(layer, 1), 1)
+        self.assertEqual(self._saved()['latency']['restart'], layer.q_table['latency']['restart'])
+
+    def test_failed_write_keeps_previous_table(self):
+        layer = self._layer(checkpoint_every=1000, checkpoint_interval=60)
+        layer.update_q_value('crash', 'restart', 1.0)
+        layer.save_q_table()
+        before = self._saved()
+
+        layer.update_q_value('crash', 'restart', -1.0)
+        with patch('core.rl_decision_layer.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                layer.save_q_table()
+        self.assertEqual(self._saved(), before)
+
+    def test_update_after_close_is_persisted(self):
+        layer = self._layer()
+        layer.close()
+        layer.update_q_value('memory_leak', 'restart', 0.0)
+        self.assertEqual(self._saved()['memory_leak']['restart'], layer.q_table['memory_leak']['restart'])
+
+    def test_batch_update_matches_single_updates(self):
+        batch = [('crash', 'restart', 1.0), ('crash', 'restart', -1.0), ('new_state', 'noop', 0.5)]
+        single = self._layer(checkpoint_every=1000, checkpoint_interval=60)
+        for state, action, reward in batch:
+            single.update_q_value(state, action, reward)
+        batched = self._layer(checkpoint_every=1000, checkpoint_interval=60)
+        batched.update_q_values(batch)
+        self.assertEqual(batched.q_table, single.q_table)
+        self.assertEqual(batched.get_checkpoint_stats()['dirty_updates'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,7 +47,7 @@ class TestAgentRuntimeIntegration(unittest.TestCase):
         
         # Use the synchronous handler (it manages state transitions internally)
         # Mock the remote client to return a valid scale_up response
-        with patch('core.rl_remote_client.requests.post') as mock_post:
+        with patch('core.rl_remote_client.requests.Session.post') as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -81,7 +81,7 @@ class TestAgentRuntimeIntegration(unittest.TestCase):
         
         # Mock requests to timeout
         import requests
-        with patch('core.rl_remote_client.requests.post', side_effect=requests.exceptions.Timeout):
+        with patch('core.rl_remote_client.requests.Session.post', side_effect=requests.exceptions.Timeout):
             result = self.agent.handle_external_event(event_data)
             
         print(f"Fallback Result: {result.get('conclusion')}")
@@ -105,7 +105,7 @@ class TestAgentRuntimeIntegration(unittest.TestCase):
         }
         
         # Mock remote RL to return low confidence
-        with patch('core.rl_remote_client.requests.post') as mock_post:
+        with patch('core.rl_remote_client.requests.Session.post') as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
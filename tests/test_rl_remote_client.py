@@ -0,0 +1,237 @@
+import unittest
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import patch
+from core.rl_remote_client import RLRemoteClient, LOCAL_CONFIDENCE
+
+try:
+    import uvicorn
+    from fastapi import FastAPI
+    SERVER_AVAILABLE = True
+except ImportError:
+    SERVER_AVAILABLE = False
+
+AGENT_SERVICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'antigravity', 'services', 'agent', 'main.py')
+
+def _load_agent_app():
+    spec = importlib.util.spec_from_file_location('agent_service_main', AGENT_SERVICE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.logger.setLevel(logging.WARNING)
+    return module.app
+
+def _single_only_app(delay: float = 0.0):
+    """Stand-in for a brain without the batch endpoint, answering after delay seconds."""
+    app = FastAPI()
+
+    @app.post("/decide")
+    async def decide(payload: dict):
+        if delay:
+            await asyncio.sleep(delay)
+        return {"action": "noop", "confidence": 0.5, "app": payload.get("app")}
+
+    return app
+
+class _Server:
+    """Run an ASGI app with uvicorn on an ephemeral local port."""
+
+    def __init__(self, app):
+        config = uvicorn.Config(app, host='127.0.0.1', port=0, log_level='error')
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.time() + 10
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError("stand-in server did not start")
+            time.sleep(0.01)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+def _state(i, state='healthy'):
+    return {'event_type': 'tick', 'app': f'app-{i}', 'env': 'dev', 'state': state,
+            'metrics': {'latency_ms': 100}}
+
+@unittest.skipUnless(SERVER_AVAILABLE, "fastapi/uvicorn not installed")
+class TestRLRemoteClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.agent_app = _load_agent_app()
+
+    def test_session_reuses_connection(self):
+        with _Server(self.agent_app) as url:
+            client = RLRemoteClient(url=url)
+            for i in range(20):
+                self.assertEqual(client.decide(_state(i))['decision'], 'noop')
+            metrics = client.get_metrics()
+            client.close()
+
+        self.assertEqual(metrics['requests'], 20)
+        self.assertEqual(metrics['connections_opened'], 1)
+        self.assertEqual(metrics['connection_reuse_ratio'], 0.95)
+        self.assertIn('p95', metrics['latency_ms'])
+
+    def test_decide_many_uses_batch_endpoint(self):
+        with _Server(self.agent_app) as url:
+            client = RLRemoteClient(url=url + '/decide')
+            results = client.decide_many([_state(0), _state(1, 'critical'), {'app': 'bad'}])
+            metrics = client.get_metrics()
+            client.close()
+
+        self.assertTrue(client.batch_supported)
+        self.assertEqual([r['decision'] for r in results], ['noop', 'restart', 'noop'])
+        self.assertTrue(results[2]['reason'].startswith('invalid_input'))
+        self.assertEqual(metrics['requests'], 1)
+        self.assertEqual(metrics['batch_requests'], 1)
+
+    def test_decide_many_falls_back_to_concurrent_calls(self):
+        with _Server(_single_only_app()) as url:
+            client = RLRemoteClient(url=url, pool_size=4)
+            results = client.decide_many([_state(i) for i in range(8)])
+            again = client.decide_many([_state(i) for i in range(4)])
+            metrics = client.get_metrics()
+            client.close()
+
+        self.assertFalse(client.batch_supported)
+        self.assertEqual([r['app'] for r in results], [f'app-{i}' for i in range(8)])
+        self.assertEqual(len(again), 4)
+        # One probe of the batch endpoint, then only single calls
+        self.assertEqual(metrics['requests'], 1 + 8 + 4)
+        self.assertLessEqual(metrics['connections_opened'], 4)
+
+    def test_unreachable_service_falls_back_and_trips_breaker(self):
+        client = RLRemoteClient(url='http://127.0.0.1:9', timeout=0.5)
+        results = client.decide_many([_state(0), _state(1)])
+        self.assertEqual([r['action'] for r in results], ['noop', 'noop'])
+        client.decide(_state(0))
+        client.decide(_state(0))
+
+        result = client.decide(_state(0))
+        self.assertIn('Circuit breaker', result['reason'])
+        self.assertEqual(result['decision_path'], 'fallback')
+        self.assertEqual(client.get_metrics()['requests'], 3)
+
+@unittest.skipUnless(SERVER_AVAILABLE, "fastapi/uvicorn not installed")
+class TestHedgedDecisions(unittest.TestCase):
+
+    def _hedged_state(self):
+        return {'app': 'app-a', 'env': 'dev', 'event_type': 'high_cpu', 'state': 'degraded',
+                'latency_ms': 900.0, 'errors_last_min': 0, 'workers': 3}
+
+    def test_fast_remote_answers(self):
+        with _Server(_single_only_app()) as url:
+            client = RLRemoteClient(url=url, hedge_delay=1.0)
+            result = client.decide(self._hedged_state())
+            client.close()
+        self.assertEqual(result['decision_path'], 'remote')
+        self.assertEqual(client.get_metrics()['decision_paths']['remote'], 1)
+
+    def test_slow_remote_is_hedged_by_local_brain(self):
+        with _Server(_single_only_app(delay=1.0)) as url:
+            client = RLRemoteClient(url=url, hedge_delay=0.05)
+            started = time.perf_counter()
+            result = client.decide(self._hedged_state())
+            elapsed = time.perf_counter() - started
+            client.close()
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(result['decision_path'], 'local')
+        self.assertEqual(result['hedge_reason'], 'remote_slow')
+        self.assertEqual(result['action'], 'scale_up')
+        self.assertEqual(result['source'], 'local_rl_brain')
+        self.assertEqual(result['confidence'], LOCAL_CONFIDENCE)
+
+    def test_open_circuit_uses_local_brain_instead_of_noop(self):
+        client = RLRemoteClient(url='http://127.0.0.1:9', timeout=0.5, hedge_delay=0.2)
+        results = [client.decide(self._hedged_state()) for _ in range(5)]
+        self.assertEqual({r['decision_path'] for r in results}, {'local'})
+        self.assertEqual(results[-1]['hedge_reason'], 'circuit_breaker_active')
+        self.assertEqual(client.get_metrics()['requests'], 3)
+
+    def test_budget_bounds_decision_without_local_brain(self):
+        class BrokenBrain:
+            def decide(self, request):
+                raise RuntimeError("unavailable")
+
+        with _Server(_single_only_app(delay=1.0)) as url:
+            client = RLRemoteClient(url=url, hedge_delay=0.05, latency_budget=0.2,
+                                    local_brain=BrokenBrain())
+            started = time.perf_counter()
+            result = client.decide(self._hedged_state())
+            elapsed = time.perf_counter() - started
+            client.close()
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(result['decision_path'], 'fallback')
+        self.assertIn('p99', client.get_metrics()['decision_latency_ms'])
+
+class TestHedgePool(unittest.TestCase):
+
+    def test_saturated_pool_skips_remote_call(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_remote(state_dict):
+            calls.append(state_dict)
+            release.wait(5)
+            return {'action': 'noop', 'confidence': 0.9}
+
+        class LocalBrain:
+            def decide(self, request):
+                return {'action': 'restart', 'confidence': 0.99}
+
+        client = RLRemoteClient(url='http://127.0.0.1:9', pool_size=2, hedge_delay=0.01,
+                                local_brain=LocalBrain())
+        self.addCleanup(client.close)
+        with patch.object(client, '_decide_remote', slow_remote):
+            results = [client.decide({'env': 'dev'}) for _ in range(6)]
+            self.assertEqual(len(calls), 2)
+            self.assertEqual([r['hedge_reason'] for r in results],
+                             ['remote_slow'] * 2 + ['hedge_saturated'] * 4)
+            self.assertEqual({r['confidence'] for r in results}, {LOCAL_CONFIDENCE})
+
+            # Finished remote calls free their slots
+            release.set()
+            client._hedge_executor.shutdown(wait=True)
+            client._hedge_executor = None
+            client.decide({'env': 'dev'})
+            self.assertEqual(len(calls), 3)
+
+    def test_queued_remote_call_cancelled_after_local_answer(self):
+        class LocalBrain:
+            def decide(self, request):
+                return {'action': 'restart'}
+
+        client = RLRemoteClient(url='http://127.0.0.1:9', pool_size=1, hedge_delay=0.01,
+                                local_brain=LocalBrain())
+        self.addCleanup(client.close)
+        with patch('core.rl_remote_client.ThreadPoolExecutor') as executor_class:
+            # A worker-less executor: submitted calls stay queued
+            futures = []
+
+            def submit(fn, *args):
+                futures.append(Future())
+                return futures[-1]
+
+            executor_class.return_value.submit.side_effect = submit
+            result = client.decide({'env': 'dev'})
+        self.assertEqual(result['decision_path'], 'local')
+        self.assertTrue(futures[0].cancelled())
+        # The cancelled call gave its slot back
+        self.assertTrue(client._hedge_slots.acquire(blocking=False))
+
+if __name__ == '__main__':
+    unittest.main()
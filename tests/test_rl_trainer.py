@@ -0,0 +1,153 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from rl.q_table import QTable
+from rl.rl_trainer import RLTrainer
+
+class TestQTable(unittest.TestCase):
+
+    def test_grows_by_doubling(self):
+        table = QTable(['a', 'b'], ['s0'], initial_capacity=2)
+        table.set('s0', 'b', 1.5)
+        for i in range(1, 5):
+            table.index(f's{i}')
+        self.assertEqual(table.shape, (5, 2))
+        self.assertEqual(table._values.shape[0], 8)
+        self.assertEqual(table.get('s0', 'b'), 1.5)
+        self.assertEqual(table.best_action('s0'), 'b')
+
+        # Growth triggered by the state being read or written
+        table.set('s5', 'a', 2.0)
+        self.assertEqual(table.get('s6', 'a'), 0.0)
+        self.assertEqual(table.row('s5').tolist(), [2.0, 0.0])
+
+    def test_csv_round_trip_matches_dataframe_layout(self):
+        import pandas as pd
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, True)
+        path = os.path.join(tmp_dir, 'q.csv')
+
+        pd.DataFrame({'a': [1.0, 2.0], 'stale': [9.0, 9.0]}, index=['s0', 'learned']).to_csv(path)
+        table = QTable.load_csv(path, ['s0', 's1'], ['a', 'b'])
+        self.assertEqual(table.states, ['s0', 's1', 'learned'])
+        self.assertEqual(table.get('learned', 'a'), 2.0)
+        self.assertEqual(table.get('s1', 'b'), 0.0)
+
+        table.save_csv(path)
+        frame = pd.read_csv(path, index_col=0)
+        self.assertEqual(list(frame.columns), ['a', 'b'])
+        self.assertEqual(frame.loc['learned', 'a'], 2.0)
+
+class TestRLTrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        patcher = patch('rl.rl_trainer.bus')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _trainer(self, algorithm='q_learning', **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return RLTrainer(os.path.join(self.tmp_dir, 'q.csv'), os.path.join(self.tmp_dir, 'perf.csv'),
+                             algorithm=algorithm, **kwargs)
+
+    def test_learn_persists_only_at_checkpoint(self):
+        trainer = self._trainer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            trainer.learn('latency_issue', 'adjust_thresholds', 1, 'accepted')
+            trainer.learn('brand_new_state', 'retry_deployment', -1)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'q.csv')))
+        with open(os.path.join(self.tmp_dir, 'perf.csv')) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            trainer.checkpoint()
+        trainer.close()
+        with open(os.path.join(self.tmp_dir, 'perf.csv')) as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        reloaded = self._trainer()
+        self.assertAlmostEqual(reloaded.q_table.get('latency_issue', 'adjust_thresholds'), 0.2)
+        self.assertIn('brand_new_state', reloaded.q_table)
+
+    def test_performance_rows_flushed_in_batches(self):
+        trainer = self._trainer(performance_flush_rows=3, performance_flush_interval=3600)
+        perf = os.path.join(self.tmp_dir, 'perf.csv')
+        for i in range(4):
+            trainer._log_performance('latency_issue', 'retry_deployment', i)
+        with open(perf) as f:
+            self.assertEqual(len(f.readlines()), 1 + 3)
+        self.assertEqual(len(trainer._pending_performance), 1)
+
+        # A row arriving after the interval flushes the backlog
+        trainer.performance_flush_interval = 0
+        trainer._log_performance('latency_issue', 'retry_deployment', 4)
+        with open(perf) as f:
+            self.assertEqual(len(f.readlines()), 1 + 5)
+        self.assertEqual(trainer._pending_performance, [])
+
+    def test_experience_ring_buffer(self):
+        trainer = self._trainer(buffer_size=8)
+        for i in range(trainer.buffer_size + 3):
+            trainer._add_experience('latency_issue', 'retry_deployment', i, 'no_failure')
+        buffer = trainer.experience_buffer
+        self.assertEqual(len(buffer), trainer.buffer_size)
+        self.assertEqual(buffer[0][2], 3.0)
+        self.assertEqual(buffer[-1][2], trainer.buffer_size + 2)
+
+    def test_experience_survives_restart(self):
+        trainer = self._trainer(buffer_size=8)
+        trainer._add_experience('unseen_state', 'adjust_thresholds', 1.0, 'no_failure')
+        trainer.close()
+
+        restarted = self._trainer(buffer_size=8)
+        self.assertEqual(restarted.experience_buffer,
+                         [('unseen_state', 'adjust_thresholds', 1.0, 'no_failure')])
+        restarted.learn_batch(4, rng=np.random.default_rng(0))
+        self.assertAlmostEqual(restarted.q_table.get('unseen_state', 'adjust_thresholds'), 0.4, places=6)
+
+    def test_prioritized_batch_learning(self):
+        trainer = self._trainer(prioritized_replay=True)
+        for _ in range(20):
+            trainer._add_experience('latency_issue', 'adjust_thresholds', 1.0, 'no_failure')
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            trainer.learn_batch(8, rng=rng)
+        self.assertAlmostEqual(trainer.q_table.get('latency_issue', 'adjust_thresholds'), 1.0, places=2)
+
+    def test_batch_q_learning_converges(self):
+        trainer = self._trainer()
+        # Terminal-like next state: Q(latency_issue, adjust_thresholds) -> 1
+        for _ in range(20):
+            trainer._add_experience('latency_issue', 'adjust_thresholds', 1.0, 'no_failure')
+            trainer._add_experience('latency_issue', 'retry_deployment', -1.0, 'no_failure')
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            trainer.learn_batch(8, rng=rng)
+        self.assertAlmostEqual(trainer.q_table.get('latency_issue', 'adjust_thresholds'), 1.0, places=3)
+        self.assertAlmostEqual(trainer.q_table.get('latency_issue', 'retry_deployment'), -1.0, places=3)
+        self.assertEqual(trainer.q_table.best_action('latency_issue'), 'adjust_thresholds')
+
+    def test_double_dqn_uses_target_table(self):
+        trainer = self._trainer('double_dqn')
+        trainer.target_sync_interval = 1000
+        trainer._add_experience('anomaly_score', 'retry_deployment', 0.0, 'latency_issue')
+        trainer.learn_batch(1, rng=np.random.default_rng(0))
+
+        # Online values change after the target was synced; targets still read the snapshot
+        trainer.q_table.set('latency_issue', 'adjust_thresholds', 10.0)
+        trainer.learn_batch(1, rng=np.random.default_rng(0))
+        self.assertEqual(trainer.q_table.get('anomaly_score', 'retry_deployment'), 0.0)
+
+        trainer._batch_updates = 0
+        trainer.learn_batch(1, rng=np.random.default_rng(0))
+        self.assertAlmostEqual(trainer.q_table.get('anomaly_score', 'retry_deployment'), 0.95)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import time
+import jwt
 from security.auth import TokenAuth, get_auth, verify_token, require_auth
 
 class TestSecurityAuth(unittest.TestCase):
@@ -41,5 +42,57 @@ class TestSecurityAuth(unittest.TestCase):
         result = protected_func(token=token)
         self.assertEqual(result, "success")
 
+    def test_verified_token_is_cached(self):
+        token = self.auth.generate_token('test_user')
+        with patch('security.auth.jwt.decode', wraps=jwt.decode) as decode:
+            for _ in range(5):
+                self.assertTrue(self.auth.verify_token(token)['valid'])
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(self.auth.cache.get_stats()['hits'], 4)
+
+    def test_invalid_token_is_negatively_cached(self):
+        with patch('security.auth.jwt.decode', wraps=jwt.decode) as decode:
+            self.assertFalse(self.auth.verify_token('not-a-token')['valid'])
+            self.assertFalse(self.auth.verify_token('not-a-token')['valid'])
+        self.assertEqual(decode.call_count, 1)
+
+    def test_cache_entry_expires_with_token(self):
+        now = time.time()
+        token = self.auth.generate_token('test_user', expires_in=10)
+        self.assertTrue(self.auth.verify_token(token)['valid'])
+
+        with patch('time.time', return_value=now + 11):
+            self.assertIsNone(self.auth.cache.get(token))
+
+    def test_secret_rotation_invalidates_cache(self):
+        token = self.auth.generate_token('test_user')
+        self.assertTrue(self.auth.verify_token(token)['valid'])
+
+        self.auth.secret_key = 'rotated-secret'
+        self.assertFalse(self.auth.verify_token(token)['valid'])
+
+    def test_rotation_during_decode_is_not_cached(self):
+        token = self.auth.generate_token('test_user')
+        decode = jwt.decode
+
+        def decode_then_rotate(*args, **kwargs):
+            # Old-key verification completes after the key has rotated
+            payload = decode(*args, **kwargs)
+            self.auth.secret_key = 'rotated-secret'
+            return payload
+
+        with patch('security.auth.jwt.decode', side_effect=decode_then_rotate):
+            self.assertTrue(self.auth.verify_token(token)['valid'])
+        self.assertIsNone(self.auth.cache.get(token))
+        self.assertFalse(self.auth.verify_token(token)['valid'])
+
+    def test_cache_is_bounded(self):
+        auth = TokenAuth(secret_key='test-secret-key', cache_size=2)
+        tokens = [auth.generate_token(f'user{i}') for i in range(3)]
+        for token in tokens:
+            auth.verify_token(token)
+        self.assertEqual(auth.cache.get_stats()['size'], 2)
+        self.assertIsNone(auth.cache.get(tokens[0]))
+
 if __name__ == '__main__':
     unittest.main()
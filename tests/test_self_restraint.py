@@ -0,0 +1,38 @@
+import unittest
+from core.self_restraint import SelfRestraint, BlockReason
+
+class TestSelfRestraintBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.restraint = SelfRestraint(min_confidence=0.6)
+        self.candidates = [('a', 'restart', 0.9), ('b', 'scale_up', 0.4), ('c', 'noop')]
+
+    def test_check_many_per_candidate_confidence(self):
+        batch = self.restraint.check_many(self.candidates, memory_signals={'instability_score': 10})
+        self.assertEqual(batch.blocked, [False, True, False])
+        self.assertEqual(batch.reasons[1], BlockReason.LOW_CONFIDENCE.value)
+        self.assertEqual(batch.details(1), {'confidence': 0.4, 'threshold': 0.6})
+        self.assertIsNone(batch.details(0))
+
+    def test_check_many_shared_signal_blocks_all(self):
+        batch = self.restraint.check_many(self.candidates, health_signals={'cpu_high': True, 'cpu_low': True})
+        self.assertEqual(batch.blocked, [True, True, True])
+        self.assertEqual(set(batch.reasons), {BlockReason.CONFLICTING_SIGNALS.value})
+        self.assertEqual(batch.decision(2).details['conflicts'], ['cpu: both high and low'])
+
+    def test_check_many_matches_evaluate_block(self):
+        signals = [
+            ({'instability_score': 90}, None),
+            ({'recent_failures': 9}, {'memory_high': False}),
+            (None, None)
+        ]
+        for memory_signals, health_signals in signals:
+            batch = self.restraint.check_many(self.candidates, memory_signals, health_signals)
+            for i, candidate in enumerate(self.candidates):
+                confidence = candidate[2] if len(candidate) > 2 else 1.0
+                single = self.restraint.evaluate_block({'confidence': confidence}, memory_signals, health_signals)
+                self.assertEqual(batch.reasons[i], single.reason)
+                self.assertEqual(batch.details(i), single.details)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import time
+from core.shm_bus import SharedMemoryBus, SharedMemoryRing, RingOverrunError, _POS, _RESERVE_POS_OFFSET
+
+class TestSharedMemoryBus(unittest.TestCase):
+
+    def setUp(self):
+        self.name = f"test_bus_{os.getpid()}_{id(self)}"
+        self.producer = SharedMemoryBus(self.name, capacity=1024, create=True)
+        self.consumer = SharedMemoryBus(self.name, listen=False)
+
+    def tearDown(self):
+        self.consumer.stop()
+        self.producer.stop()
+
+    def test_frames_round_trip_across_wraps(self):
+        received = []
+        self.consumer.subscribe('deploy.*', lambda event_type, data: received.append(data['i']))
+
+        for i in range(100):
+            self.producer.publish('deploy.success', {'i': i})
+            self.producer.publish('issue.detected', {'i': i})
+            self.consumer.poll()
+
+        self.assertEqual(received, list(range(100)))
+        self.assertGreater(self.producer.ring.write_pos, self.producer.ring.capacity)
+
+    def test_lapped_consumer_skips_ahead(self):
+        reader = self.consumer.ring.reader()
+        for i in range(100):
+            self.producer.publish('deploy.success', {'i': i})
+
+        self.assertEqual(list(reader.read()), [])
+        self.assertEqual(reader.overruns, 1)
+        self.producer.publish('deploy.success', {'i': 'latest'})
+        frames = [bytes(frame) for frame in reader.read()]
+        self.assertEqual(len(frames), 1)
+        self.assertIn(b'latest', frames[0])
+
+    def test_frame_rejected_while_producer_overwrites_it(self):
+        ring = self.producer.ring
+        reader = self.consumer.ring.reader()
+        self.producer.publish('deploy.success', {'i': 0})
+        frame_pos = reader.cursor
+        frames = reader.read()
+        frame = next(frames)
+        self.assertTrue(reader.frame_valid())
+
+        # Producer has reserved the region holding the frame but not yet
+        # committed write_pos: the bytes under the view may already be torn
+        _POS.pack_into(ring.buf, _RESERVE_POS_OFFSET, frame_pos + ring.capacity + 1)
+        self.assertLessEqual(ring.write_pos - frame_pos, ring.capacity)
+        self.assertFalse(reader.frame_valid())
+        frame.release()
+        frames.close()
+
+    def test_reserve_position_tracks_commits(self):
+        ring = self.producer.ring
+        for i in range(50):
+            self.producer.publish('deploy.success', {'i': i})
+            self.assertEqual(ring.reserve_pos, ring.write_pos)
+
+    def test_listener_thread_delivers(self):
+        listener = SharedMemoryBus(self.name)
+        received = []
+        listener.subscribe('*', lambda event_type, data: received.append(event_type))
+        try:
+            self.producer.publish('heal.completed', {})
+            deadline = time.time() + 2
+            while not received and time.time() < deadline:
+                time.sleep(0.001)
+            self.assertEqual(received, ['heal.completed'])
+        finally:
+            listener.stop()
+
+    def test_oversized_frame_rejected(self):
+        with self.assertRaises(RingOverrunError):
+            self.producer.ring.write(b'x' * 2048)
+
+    def test_attach_requires_existing_ring(self):
+        with self.assertRaises(FileNotFoundError):
+            SharedMemoryRing(self.name + '_missing')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from core.sovereign_bus import SovereignBus, fcntl
+
+def _publish_many(log_dir, writer, count):
+    bus = SovereignBus(log_dir=log_dir, segment_max_bytes=4096, max_segments=1000)
+    bus.event_bus = MagicMock()
+    for i in range(count):
+        bus.publish("load.test", {"writer": writer, "i": i})
+    bus.close()
+
+class TestSovereignBus(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def _make_bus(self, **kwargs):
+        bus = SovereignBus(log_dir=self.log_dir, **kwargs)
+        bus.event_bus = MagicMock()
+        return bus
+
+    def test_publish_appends_and_serves_from_memory(self):
+        bus = self._make_bus()
+        received = []
+        bus.subscribe("deploy.success", received.append)
+
+        bus.publish("deploy.success", {"app": "a"})
+        bus.publish("issue.detected", {"app": "b"})
+        bus.close()
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual([m["event_type"] for m in bus.get_messages()], ["deploy.success", "issue.detected"])
+        self.assertEqual(bus.get_messages("issue.detected")[0]["data"], {"app": "b"})
+        with open(bus.active_segment_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_segments_roll_over_and_are_pruned(self):
+        bus = self._make_bus(segment_max_bytes=200, max_segments=2, history_size=1000)
+        for i in range(50):
+            bus.publish("rl.learned", {"i": i})
+        bus.close()
+
+        segments = [name for name in os.listdir(self.log_dir) if name.endswith(".jsonl")]
+        self.assertEqual(len(segments), 2)
+        for name in segments:
+            self.assertLessEqual(os.path.getsize(os.path.join(self.log_dir, name)), 200)
+
+    def test_history_reloaded_and_bounded(self):
+        bus = self._make_bus(history_size=10, history_per_type=3)
+        for i in range(20):
+            bus.publish("deploy.success" if i % 2 else "issue.detected", {"i": i})
+        bus.close()
+
+        reloaded = self._make_bus(history_size=10, history_per_type=3)
+        self.assertEqual(len(reloaded.get_messages()), 10)
+        self.assertEqual([m["data"]["i"] for m in reloaded.get_messages("deploy.success")], [15, 17, 19])
+
+    def test_picks_up_messages_from_other_writer(self):
+        reader = self._make_bus()
+        writer = self._make_bus()
+        writer.publish("external.alert", {"level": "high"})
+        writer.close()
+
+        self.assertEqual(reader.get_messages("external.alert", limit=1)[0]["data"], {"level": "high"})
+
+    @unittest.skipIf(fcntl is None, "needs fcntl")
+    def test_concurrent_writer_processes(self):
+        context = multiprocessing.get_context('fork')
+        writers = [context.Process(target=_publish_many, args=(self.log_dir, w, 300)) for w in range(3)]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+
+        lines = []
+        for name in sorted(os.listdir(self.log_dir)):
+            if name.endswith(".jsonl"):
+                path = os.path.join(self.log_dir, name)
+                self.assertLessEqual(os.path.getsize(path), 4096)
+                with open(path) as f:
+                    lines.extend(json.loads(line)["data"] for line in f)
+        self.assertEqual(len(lines), 900)
+        for w in range(3):
+            self.assertEqual([d["i"] for d in lines if d["writer"] == w], list(range(300)))
+
+    def test_global_bus_created_on_first_use(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import os, core.sovereign_bus as m; "
+                  "print(m._bus is None, os.path.exists(os.path.join('logs', 'bus')))")
+        output = subprocess.run([sys.executable, '-c', script], cwd=self.log_dir, capture_output=True,
+                                text=True, env=dict(os.environ, PYTHONPATH=root), timeout=60).stdout
+        self.assertEqual(output.split()[-2:], ['True', 'False'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,13 @@
 import sys
 import os
 import unittest
+from unittest.mock import patch
+import numpy as np
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.state_adapter import StateAdapter
+from core.state_adapter import StateAdapter, FEATURE_NAMES
 
 class TestStateAdapter(unittest.TestCase):
     def setUp(self):
@@ -60,5 +62,53 @@ class TestStateAdapter(unittest.TestCase):
         # Expect [0.5, 0.6, 0.1]
         self.assertEqual(vector, [0.5, 0.6, 0.1])
 
+class TestBatchFeaturization(unittest.TestCase):
+    def setUp(self):
+        self.adapter = StateAdapter(env='stage')
+        patcher = patch('core.proof_logger.write_proof')
+        self.write_proof = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matrix_schema(self):
+        events = [
+            {'event_type': 'high_cpu', 'app_id': 'a', 'metrics': {'latency_ms': 120, 'workers': 4}},
+            {'event_type': 'brand_new_type', 'data': {'metrics': {'errors_last_min': 7}}},
+        ]
+        memory = [{'recent_failures': 2, 'instability_score': 45.5}, None]
+        matrix = self.adapter.featurize_batch(events, ['deciding', 'sleeping'], memory)
+
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertEqual(matrix.shape, (2, len(FEATURE_NAMES)))
+        row = dict(zip(FEATURE_NAMES, matrix[0]))
+        self.assertEqual(row['latency_ms'], 120)
+        self.assertEqual(row['workers'], 4)
+        self.assertEqual(row['instability_score'], 45.5)
+        self.assertEqual(row['env=stage'], 1)
+        self.assertEqual(row['event_type=high_cpu'], 1)
+        self.assertEqual(row['state=deciding'], 1)
+
+        row = dict(zip(FEATURE_NAMES, matrix[1]))
+        self.assertEqual(row['errors_last_min'], 7)
+        self.assertEqual(row['recent_failures'], 0)
+        self.assertEqual(row['event_type=<unk>'], 1)
+        self.assertEqual(row['state=<unk>'], 1)
+        # Exactly one hot column per categorical field (env, event_type, state)
+        categorical = [i for i, name in enumerate(FEATURE_NAMES) if '=' in name]
+        self.assertEqual(matrix[:, categorical].sum(axis=1).tolist(), [3, 3])
+
+    def test_batch_matches_single_adaptation_with_one_proof_entry(self):
+        events = [{'event_type': 'crash', 'app_id': f'app-{i}', 'latency_ms': i * 10} for i in range(50)]
+        batch = self.adapter.adapt_states(events, 'idle')
+        self.assertEqual(self.write_proof.call_count, 1)
+        self.assertEqual(self.write_proof.call_args[0][1]['batch_size'], 50)
+
+        single = [self.adapter.adapt_state(event, 'IDLE', {}) for event in events]
+        self.assertEqual(batch, single)
+
+    def test_empty_batch(self):
+        matrix = self.adapter.featurize_batch([], 'idle')
+        self.assertEqual(matrix.shape, (0, len(FEATURE_NAMES)))
+        self.write_proof.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
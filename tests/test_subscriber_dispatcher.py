@@ -0,0 +1,102 @@
+import unittest
+import threading
+import time
+from core.subscriber_dispatcher import SubscriberDispatcher
+
+class TestSubscriberDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatcher = SubscriberDispatcher(workers=2, queue_size=10)
+
+    def tearDown(self):
+        self.dispatcher.stop()
+
+    def _wait_for(self, condition, timeout=2.0):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_per_subscriber_order_preserved(self):
+        received = []
+        def callback(event_type, data):
+            received.append(data)
+        self.dispatcher.register(callback, queue_size=500)
+
+        for i in range(200):
+            self.dispatcher.submit(callback, 'deploy.success', i)
+
+        self.assertTrue(self._wait_for(lambda: len(received) == 200))
+        self.assertEqual(received, list(range(200)))
+
+    def test_slow_subscriber_does_not_stall_others(self):
+        release = threading.Event()
+        fast_received = []
+        def slow(event_type, data):
+            release.wait(2)
+        def fast(event_type, data):
+            fast_received.append(data)
+        self.dispatcher.register(slow)
+        self.dispatcher.register(fast)
+
+        for i in range(5):
+            self.dispatcher.submit(slow, 'runtime.all', i)
+            self.dispatcher.submit(fast, 'runtime.all', i)
+
+        self.assertTrue(self._wait_for(lambda: len(fast_received) == 5))
+        release.set()
+
+    def test_drop_policies_count_drops(self):
+        release = threading.Event()
+        newest, oldest = [], []
+        def keep_newest(event_type, data):
+            release.wait(2)
+            newest.append(data)
+        def keep_oldest(event_type, data):
+            release.wait(2)
+            oldest.append(data)
+        self.dispatcher.register(keep_newest, queue_size=3, overflow='drop_oldest')
+        self.dispatcher.register(keep_oldest, queue_size=3, overflow='drop_newest')
+
+        self.dispatcher.submit(keep_newest, 'e', 0)
+        self.dispatcher.submit(keep_oldest, 'e', 0)
+        # Wait until both workers hold their first message
+        self._wait_for(lambda: all(m['depth'] == 0 for m in self.dispatcher.get_metrics()))
+        for i in range(1, 6):
+            self.dispatcher.submit(keep_newest, 'e', i)
+            self.dispatcher.submit(keep_oldest, 'e', i)
+        release.set()
+
+        self.assertTrue(self._wait_for(lambda: len(newest) == 4 and len(oldest) == 4))
+        self.assertEqual(newest, [0, 3, 4, 5])
+        self.assertEqual(oldest, [0, 1, 2, 3])
+        metrics = {m['subscriber']: m for m in self.dispatcher.get_metrics()}
+        self.assertEqual(metrics[keep_newest.__qualname__]['dropped'], 2)
+        self.assertEqual(metrics[keep_oldest.__qualname__]['dropped'], 2)
+
+    def test_bound_method_unregisters(self):
+        class Handler:
+            def __init__(self):
+                self.calls = []
+
+            def cb(self, value):
+                self.calls.append(value)
+
+        handler = Handler()
+        # Each attribute access creates a new bound-method object
+        self.dispatcher.register(handler.cb)
+        self.dispatcher.register(handler.cb)
+        self.assertEqual(len(self.dispatcher.get_metrics()), 1)
+        self.assertTrue(self.dispatcher.submit(handler.cb, 1))
+        self.assertTrue(self._wait_for(lambda: handler.calls == [1]))
+
+        self.dispatcher.unregister(handler.cb)
+        self.assertEqual(self.dispatcher.get_metrics(), [])
+        self.assertFalse(self.dispatcher.submit(handler.cb, 2))
+
+    def test_unknown_overflow_policy_rejected(self):
+        with self.assertRaises(ValueError):
+            SubscriberDispatcher(overflow='spill')
+
+if __name__ == '__main__':
+    unittest.main()